@@ -0,0 +1,135 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+
+CATALOG_VERSION_KEY = "books:catalog-version"
+
+
+def get_catalog_version():
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        # Start from a fresh timestamp so an evicted counter never reuses
+        # a version that may still have cached bodies.
+        cache.add(CATALOG_VERSION_KEY, time.time_ns())
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+async def aget_catalog_version():
+    version = await cache.aget(CATALOG_VERSION_KEY)
+    if version is None:
+        await cache.aadd(CATALOG_VERSION_KEY, time.time_ns())
+        version = await cache.aget(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.add(CATALOG_VERSION_KEY, time.time_ns())
+
+
+def catalog_changed():
+    """
+    Invalidate cached catalog responses. The version is bumped right away
+    and again on commit, so a reader that cached uncommitted state in
+    between cannot keep serving it.
+    """
+    bump_catalog_version()
+    transaction.on_commit(bump_catalog_version)
+
+
+class CatalogCacheMixin:
+    """
+    Serve list/retrieve from a response cache keyed on the catalog version.
+
+    Bodies are stored already rendered together with their ETag and any
+    ``cached_headers``, so a cache hit, or a 304 for a matching
+    ``If-None-Match``, never touches the database.
+    """
+
+    cache_key_prefix = "books:response"
+    cached_headers = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.acached_response(super().alist, request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.acached_response(super().aretrieve, request, *args, **kwargs)
+
+    def use_response_cache(self, request):
+        return bool(
+            settings.BOOK_CATALOG_CACHE_TIMEOUT
+            and request.accepted_renderer.format == "json"
+        )
+
+    def get_response_cache_key(self, request, version):
+        path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+        return (
+            f"{self.cache_key_prefix}:{version}:"
+            f"{request.accepted_media_type}:{path}"
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if not self.use_response_cache(request):
+            return handler(request, *args, **kwargs)
+
+        key = self.get_response_cache_key(request, get_catalog_version())
+        cached = cache.get(key)
+        if cached is not None:
+            return self.get_cached_response(request, cached)
+        return self.store_response(key, handler(request, *args, **kwargs))
+
+    async def acached_response(self, handler, request, *args, **kwargs):
+        """cached_response() for the async read path."""
+        if not self.use_response_cache(request):
+            return await handler(request, *args, **kwargs)
+
+        key = self.get_response_cache_key(request, await aget_catalog_version())
+        cached = await cache.aget(key)
+        if cached is not None:
+            return self.get_cached_response(request, cached)
+        return self.store_response(key, await handler(request, *args, **kwargs))
+
+    def get_cached_response(self, request, cached):
+        etag, content_type, content, *headers = cached
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(content, content_type=content_type)
+        response["ETag"] = etag
+        for header, value in headers[0] if headers else ():
+            response[header] = value
+        return response
+
+    def store_response(self, key, response):
+        if response.status_code == 200:
+
+            def store(rendered):
+                etag = f'"{hashlib.md5(rendered.content).hexdigest()}"'
+                rendered["ETag"] = etag
+                headers = tuple(
+                    (header, rendered[header])
+                    for header in self.cached_headers
+                    if rendered.has_header(header)
+                )
+                cache.set(
+                    key,
+                    (etag, rendered["Content-Type"], rendered.content, headers),
+                    settings.BOOK_CATALOG_CACHE_TIMEOUT,
+                )
+
+            response.add_post_render_callback(store)
+        return response
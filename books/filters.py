@@ -0,0 +1,182 @@
+from functools import lru_cache
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Q
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from books.models import Book
+from books.search import ranked_search
+
+
+class BookSearchFilter(BaseFilterBackend):
+    """
+    Ranked full-text search over title and author with ``?search=``.
+
+    Results come best first and stop at ``BOOK_SEARCH_MAX_RESULTS``; the
+    ``Search-Truncated`` response header says whether matches were left
+    out. Keyset pages cannot follow a rank, so ``search`` together with
+    ``page_size`` or ``cursor`` is a 400.
+    """
+
+    search_param = "search"
+    truncated_header = "Search-Truncated"
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "")
+        if not query:
+            return queryset
+        self.check_not_paginated(request, view)
+        queryset, truncated = ranked_search(queryset, query)
+        request.search_truncated = truncated
+        return queryset
+
+    async def afilter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "")
+        if not query:
+            return queryset
+        return await sync_to_async(self.filter_queryset)(request, queryset, view)
+
+    def check_not_paginated(self, request, view):
+        paginator = getattr(view, "paginator", None)
+        params = (
+            getattr(paginator, "page_size_query_param", None),
+            getattr(paginator, "cursor_query_param", None),
+        )
+        if any(param in request.query_params for param in params if param):
+            raise ValidationError(
+                {
+                    self.search_param: [
+                        "Search results are ranked and cannot be paginated; "
+                        f"they hold the {settings.BOOK_SEARCH_MAX_RESULTS} "
+                        "best matches."
+                    ]
+                }
+            )
+
+    @classmethod
+    def add_truncated_header(cls, request, response):
+        truncated = getattr(request, "search_truncated", None)
+        if truncated is not None:
+            response[cls.truncated_header] = "true" if truncated else "false"
+
+
+def fee_field():
+    return serializers.DecimalField(max_digits=6, decimal_places=2, min_value=0)
+
+
+# Query parameter: (serializer field parsing the value, value -> condition).
+# Every condition is served by one of Book.Meta.indexes.
+BOOK_FILTERS = {
+    "cover": (
+        serializers.ChoiceField(choices=Book.CoverChoices.choices),
+        lambda cover: Q(cover=cover),
+    ),
+    "author": (serializers.CharField(), lambda author: Q(author=author)),
+    "inventory__gt": (
+        serializers.IntegerField(min_value=0),
+        lambda inventory: Q(inventory__gt=inventory),
+    ),
+    "available": (
+        serializers.BooleanField(),
+        lambda available: Q(inventory__gt=0) if available else Q(inventory=0),
+    ),
+    **{
+        f"daily_fee__{lookup}": (
+            fee_field(),
+            lambda fee, lookup=lookup: Q(**{f"daily_fee__{lookup}": fee}),
+        )
+        for lookup in ("gt", "gte", "lt", "lte")
+    },
+}
+
+
+class BookFilter(BaseFilterBackend):
+    """
+    Exact and range filters from ``BOOK_FILTERS``, e.g.
+    ``?cover=HARD&available=true&daily_fee__lte=1.50``. Invalid values are
+    a 400, never silently ignored.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        conditions, errors = [], {}
+        for param, (field, condition) in BOOK_FILTERS.items():
+            if param not in request.query_params:
+                continue
+            try:
+                value = field.run_validation(request.query_params[param])
+            except ValidationError as exc:
+                errors[param] = exc.detail
+                continue
+            conditions.append(condition(value))
+        if errors:
+            raise ValidationError(errors)
+        return queryset.filter(*conditions) if conditions else queryset
+
+    async def afilter_queryset(self, request, queryset, view):
+        # Builds the queryset only; no query runs here.
+        return self.filter_queryset(request, queryset, view)
+
+
+@lru_cache
+def keyset_indexed_fields(model):
+    """
+    The primary key and every field with an unconditional index on
+    ``(field, pk, ...)``: the indexes that return rows in keyset order.
+    """
+    pk = model._meta.pk.name
+    fields = {pk}
+    for index in model._meta.indexes:
+        if index.condition is None and index.fields[1:2] == [pk]:
+            fields.add(index.fields[0])
+    return frozenset(fields)
+
+
+class IndexedOrderingFilter(BaseFilterBackend):
+    """
+    ``?ordering=field`` or ``?ordering=-field`` over the view's
+    ``ordering_fields``, ties broken by id in the same direction. Every
+    ordering field needs an index on ``(field, id)``, so a page is an index
+    range read: anything else is a 400 rather than a sort of the table.
+    """
+
+    ordering_param = "ordering"
+
+    def get_ordering_fields(self, view):
+        model = view.get_queryset().model
+        unindexed = set(view.ordering_fields) - keyset_indexed_fields(model)
+        if unindexed:
+            raise ImproperlyConfigured(
+                f"{type(view).__name__}.ordering_fields has unindexed fields: "
+                f"{', '.join(sorted(unindexed))}"
+            )
+        return view.ordering_fields
+
+    def get_keyset_ordering(self, request, view):
+        value = request.query_params.get(self.ordering_param)
+        if not value:
+            return None
+        field = value.removeprefix("-")
+        allowed = self.get_ordering_fields(view)
+        if field not in allowed:
+            raise ValidationError(
+                {
+                    self.ordering_param: [
+                        f"Cannot order by {value!r}. Choose one of: "
+                        f"{', '.join(allowed)}, optionally prefixed with '-'."
+                    ]
+                }
+            )
+        if field == "id":
+            return (value,)
+        return (value, "-id" if value.startswith("-") else "id")
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_keyset_ordering(request, view)
+        return queryset.order_by(*ordering) if ordering else queryset
+
+    async def afilter_queryset(self, request, queryset, view):
+        return self.filter_queryset(request, queryset, view)
@@ -0,0 +1,177 @@
+import codecs
+import csv
+import json
+import time
+
+from django.core.management.color import no_style
+from django.db import DatabaseError, connection, transaction
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+
+from books.cache import catalog_changed
+from books.models import Book
+from books.serializers import BookSerializer
+
+MAX_REPORTED_ERRORS = 100
+
+
+def read_csv(lines):
+    yield from csv.DictReader(lines)
+
+
+def read_jsonl(lines):
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as exc:
+            yield serializers.ValidationError({"non_field_errors": [str(exc)]})
+
+
+READERS = {
+    "csv": read_csv,
+    "jsonl": read_jsonl,
+}
+
+
+def decode_lines(stream, encoding="utf-8"):
+    """
+    Lazily split a binary stream into text lines. Bytes that do not decode
+    raise ParseError (a 400) naming the line.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    number = 0
+    try:
+        for number, line in enumerate(iter(stream.readline, b""), start=1):
+            yield decoder.decode(line)
+        tail = decoder.decode(b"", final=True)
+    except UnicodeDecodeError as exc:
+        raise ParseError(f"Line {number} is not valid {encoding}: {exc.reason}.")
+    if tail:
+        yield tail
+
+
+class ImportResult:
+    def __init__(self):
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+        self.started = time.perf_counter()
+        self.elapsed = 0
+
+    def fail(self, row, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "errors": errors})
+
+    @property
+    def rows_per_second(self):
+        total = self.imported + self.failed
+        return round(total / self.elapsed) if self.elapsed else 0
+
+    def as_dict(self):
+        return {
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+            "elapsed": round(self.elapsed, 3),
+            "rows_per_second": self.rows_per_second,
+        }
+
+
+def import_books(rows, batch_size=1000):
+    """
+    Validate ``rows`` (dicts) with the BookSerializer rules and write them in
+    batches of ``batch_size``, one transaction per batch. Rows carrying an
+    ``id`` update that book in place, other rows create new books.
+
+    ``rows`` is consumed lazily, so only one batch is held in memory.
+    """
+    result = ImportResult()
+    validator = BookSerializer()
+    fields = [name for name in validator.fields if name != "id"]
+    batch = []
+
+    for number, row in enumerate(rows, start=1):
+        try:
+            if isinstance(row, serializers.ValidationError):
+                raise row
+            if not isinstance(row, dict):
+                raise serializers.ValidationError(
+                    {"non_field_errors": ["Expected an object."]}
+                )
+            book = Book(**validator.run_validation(row))
+            if row.get("id"):
+                book.pk = parse_id(row["id"])
+        except serializers.ValidationError as exc:
+            result.fail(number, exc.detail)
+            continue
+
+        batch.append((number, book))
+
+        if len(batch) >= batch_size:
+            write_batch(batch, fields, result)
+            batch = []
+
+    if batch:
+        write_batch(batch, fields, result)
+
+    result.elapsed = time.perf_counter() - result.started
+    return result
+
+
+def parse_id(value):
+    """
+    An explicit book id: a JSON integer or a string of digits within the
+    column's range. ``1.5`` or ``"1e3"`` is an error, never a truncated id.
+    """
+    if isinstance(value, str) and value.isascii() and value.isdigit():
+        value = int(value)
+    _, high = connection.ops.integer_field_range(Book._meta.pk.get_internal_type())
+    if (
+        isinstance(value, bool)
+        or not isinstance(value, int)
+        or value < 1
+        or (high is not None and value > high)
+    ):
+        raise serializers.ValidationError({"id": ["A valid integer is required."]})
+    return value
+
+
+def reset_id_sequence():
+    """
+    Move the id sequence past the largest id, which explicit ids may have
+    overtaken. Without it the next plain insert reuses an imported id on
+    PostgreSQL.
+    """
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), [Book]):
+            cursor.execute(sql)
+
+
+def write_batch(batch, fields, result):
+    new = [book for _, book in batch if book.pk is None]
+    # The last row for an id wins; earlier ones are neither written nor counted.
+    existing = list(
+        {book.pk: book for _, book in batch if book.pk is not None}.values()
+    )
+
+    try:
+        with transaction.atomic():
+            Book.objects.bulk_create(new)
+            Book.objects.bulk_create(
+                existing,
+                update_conflicts=True,
+                unique_fields=["id"],
+                update_fields=fields,
+            )
+            if existing:
+                reset_id_sequence()
+            catalog_changed()
+    except (DatabaseError, OverflowError) as exc:
+        # OverflowError: SQLite's driver rejects integers past 64 bits.
+        for number, _ in batch:
+            result.fail(number, {"non_field_errors": [str(exc)]})
+    else:
+        result.imported += len(new) + len(existing)
@@ -0,0 +1,87 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from books.models import Book
+from books.search import search_books
+from library_service.seeding import fake_author, fake_title
+
+
+class Command(BaseCommand):
+    help = (
+        "Time ranked full-text book search against a LIKE scan. "
+        "Seeded books are rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--books", type=int, default=1_000_000)
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+
+        with transaction.atomic():
+            titles = self.seed(rng, options["books"], options["batch_size"])
+            queries = self.sample_queries(rng, titles, options["queries"])
+
+            self.report("full-text", queries, self.full_text)
+            self.report("prefix", [q.split()[0][:3] for q in queries], self.full_text)
+            self.report("LIKE scan", queries[:5], self.like_scan)
+
+            transaction.set_rollback(True)
+
+    def seed(self, rng, count, batch_size):
+        started = time.perf_counter()
+        titles = []
+        for offset in range(0, count, batch_size):
+            books = Book.objects.bulk_create(
+                Book(
+                    title=fake_title(rng),
+                    author=fake_author(rng),
+                    cover=rng.choice(Book.CoverChoices.values),
+                    inventory=rng.randint(0, 10),
+                    daily_fee="1.00",
+                )
+                for _ in range(min(batch_size, count - offset))
+            )
+            titles.append(rng.choice(books).title)
+        self.stdout.write(
+            f"Seeded {count} books in {time.perf_counter() - started:.1f}s"
+        )
+        return titles
+
+    def sample_queries(self, rng, titles, count):
+        """Two words of an existing title, as a reader would type them."""
+        queries = []
+        for _ in range(count):
+            words = rng.choice(titles).lower().split()
+            queries.append(" ".join(rng.sample(words, 2)))
+        return queries
+
+    def full_text(self, query):
+        return list(search_books(Book.objects.all(), query)[:20])
+
+    def like_scan(self, query):
+        condition = Q()
+        for term in query.split():
+            condition &= Q(title__icontains=term) | Q(author__icontains=term)
+        return list(Book.objects.filter(condition).order_by("title")[:20])
+
+    def report(self, name, queries, run):
+        timings = []
+        for query in queries:
+            started = time.perf_counter()
+            run(query)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1] if len(timings) > 1 else timings[0]
+        self.stdout.write(
+            f"{name}: {len(timings)} queries, "
+            f"p50 {statistics.median(timings):.2f} ms, p95 {p95:.2f} ms"
+        )
@@ -0,0 +1,39 @@
+import sys
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from books.importers import READERS, import_books
+
+
+class Command(BaseCommand):
+    help = "Stream books from a CSV or JSONL file ('-' for stdin) into the catalog."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=sorted(READERS))
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or Path(path).suffix.lstrip(".").lower()
+        if file_format not in READERS:
+            raise CommandError("Cannot infer the format, pass --format.")
+
+        if path == "-":
+            result = self.run(sys.stdin, file_format, options["batch_size"])
+        else:
+            with open(path, newline="", encoding="utf-8") as lines:
+                result = self.run(lines, file_format, options["batch_size"])
+
+        for error in result.errors:
+            self.stderr.write(f"row {error['row']}: {error['errors']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result.imported} books, {result.failed} failed, "
+                f"in {result.elapsed:.2f}s ({result.rows_per_second} rows/s)"
+            )
+        )
+
+    def run(self, lines, file_format, batch_size):
+        return import_books(READERS[file_format](lines), batch_size=batch_size)
@@ -0,0 +1,85 @@
+from django.db import migrations
+
+# SQLite: an external-content FTS5 table kept in sync by triggers, so every
+# write path (ORM, bulk_create, queryset.update(), raw SQL) stays indexed.
+# Django rebuilds SQLite tables on some schema changes (AlterField,
+# AddConstraint, ...), which drops these triggers: such migrations on
+# books_book must recreate them.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE books_book_fts USING fts5(
+        title, author,
+        content='books_book', content_rowid='id',
+        prefix='2 3', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER books_book_fts_insert AFTER INSERT ON books_book BEGIN
+        INSERT INTO books_book_fts(rowid, title, author)
+        VALUES (new.id, new.title, new.author);
+    END
+    """,
+    """
+    CREATE TRIGGER books_book_fts_delete AFTER DELETE ON books_book BEGIN
+        INSERT INTO books_book_fts(books_book_fts, rowid, title, author)
+        VALUES ('delete', old.id, old.title, old.author);
+    END
+    """,
+    """
+    CREATE TRIGGER books_book_fts_update AFTER UPDATE OF title, author
+    ON books_book BEGIN
+        INSERT INTO books_book_fts(books_book_fts, rowid, title, author)
+        VALUES ('delete', old.id, old.title, old.author);
+        INSERT INTO books_book_fts(rowid, title, author)
+        VALUES (new.id, new.title, new.author);
+    END
+    """,
+    # Rank title matches above author matches, like the PostgreSQL weights.
+    "INSERT INTO books_book_fts(books_book_fts, rank) VALUES ('rank', 'bm25(2.0, 1.0)')",
+    "INSERT INTO books_book_fts(books_book_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS books_book_fts_update",
+    "DROP TRIGGER IF EXISTS books_book_fts_delete",
+    "DROP TRIGGER IF EXISTS books_book_fts_insert",
+    "DROP TABLE IF EXISTS books_book_fts",
+]
+
+# PostgreSQL: an expression GIN index, always in sync with the table.
+# The expression must match books.search.POSTGRES_SEARCH_VECTOR.
+POSTGRES_FORWARD = [
+    """
+    CREATE INDEX books_book_search_idx ON books_book USING gin (
+        (setweight(to_tsvector('simple', title), 'A') ||
+         setweight(to_tsvector('simple', author), 'B'))
+    )
+    """,
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS books_book_search_idx",
+]
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        for sql in statements.get(vendor, []):
+            schema_editor.execute(sql)
+
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0002_book_inventory_non_negative"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({"sqlite": SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD}),
+            run({"sqlite": SQLITE_BACKWARD, "postgresql": POSTGRES_BACKWARD}),
+        ),
+    ]
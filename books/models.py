@@ -12,5 +12,29 @@ class Book(models.Model):
     inventory = models.PositiveIntegerField()
     daily_fee = models.DecimalField(max_digits=6, decimal_places=2)
 
+    class Meta:
+        # One index per catalog filter and ordering (see books.filters),
+        # each ending in id so keyset pages read it in order.
+        indexes = [
+            models.Index(fields=["author", "id"], name="book_author_idx"),
+            models.Index(
+                fields=["cover", "daily_fee", "id"], name="book_cover_fee_idx"
+            ),
+            models.Index(fields=["daily_fee", "id"], name="book_daily_fee_idx"),
+            models.Index(fields=["inventory", "id"], name="book_inventory_idx"),
+            models.Index(fields=["title", "id"], name="book_title_idx"),
+            models.Index(
+                fields=["id"],
+                condition=models.Q(inventory__gt=0),
+                name="book_available_idx",
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(inventory__gte=0),
+                name="book_inventory_non_negative",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.title} by {self.author}"
@@ -0,0 +1,123 @@
+import re
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+MAX_TERMS = 10
+
+# A lone term this short matches a large share of the catalog; ranking all of
+# those matches would cost far more than the prefix lookup itself.
+PREFIX_FAST_PATH_LENGTH = 3
+
+# Kept in sync with the expression index created in
+# books/migrations/0003_book_search_index.py, so PostgreSQL can use it.
+POSTGRES_SEARCH_VECTOR = (
+    "(setweight(to_tsvector('simple', title), 'A') || "
+    "setweight(to_tsvector('simple', author), 'B'))"
+)
+
+
+def search_terms(query):
+    return re.findall(r"\w+", query.lower())[:MAX_TERMS]
+
+
+def sqlite_match(terms):
+    """All terms must match; the last one is a prefix, for search-as-you-type."""
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def postgres_tsquery(terms):
+    return " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+
+
+def is_short_prefix(terms):
+    return len(terms) == 1 and len(terms[0]) <= PREFIX_FAST_PATH_LENGTH
+
+
+def ranked_book_ids(terms, using="default", limit=None):
+    """
+    Ids of the best matching books, best first, read from the full-text
+    index only. Returns None when the backend has no full-text index.
+
+    A single short prefix skips ranking and stops at the first ``limit``
+    matches, which the prefix index serves directly.
+    """
+    limit = limit or settings.BOOK_SEARCH_MAX_RESULTS
+    connection = connections[using]
+    ranked = not is_short_prefix(terms)
+
+    if connection.vendor == "sqlite":
+        order_by = "ORDER BY rank " if ranked else ""
+        sql = (
+            f"SELECT rowid FROM books_book_fts WHERE books_book_fts MATCH %s "
+            f"{order_by}LIMIT %s"
+        )
+        params = [sqlite_match(terms), limit]
+    elif connection.vendor == "postgresql":
+        tsquery = postgres_tsquery(terms)
+        params = [tsquery]
+        order_by = ""
+        if ranked:
+            order_by = (
+                f"ORDER BY ts_rank({POSTGRES_SEARCH_VECTOR}, "
+                f"to_tsquery('simple', %s)) DESC, id "
+            )
+            params.append(tsquery)
+        sql = (
+            f"SELECT id FROM books_book "
+            f"WHERE {POSTGRES_SEARCH_VECTOR} @@ to_tsquery('simple', %s) "
+            f"{order_by}LIMIT %s"
+        )
+        params.append(limit)
+    else:
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search_books(queryset, query):
+    """Filter ``queryset`` down to books matching ``query``, best match first."""
+    return ranked_search(queryset, query)[0]
+
+
+def ranked_search(queryset, query):
+    """
+    search_books() that also tells whether matches were dropped: returns
+    ``(queryset, truncated)``. Ranked results stop at the
+    ``BOOK_SEARCH_MAX_RESULTS`` best matches.
+    """
+    terms = search_terms(query)
+    if not terms:
+        # A blank query searches nothing; "!!!" searches for nothing.
+        return (queryset.none() if query.strip() else queryset), False
+
+    limit = settings.BOOK_SEARCH_MAX_RESULTS
+    ids = ranked_book_ids(terms, using=queryset.db, limit=limit + 1)
+    if ids is None:
+        condition = Q()
+        for term in terms:
+            condition &= Q(title__icontains=term) | Q(author__icontains=term)
+        return queryset.filter(condition), False
+
+    if not ids:
+        return queryset.none(), False
+    truncated = len(ids) > limit
+    ids = ids[:limit]
+
+    # A plain CASE keeps the rank order; building it from When() objects
+    # costs more ORM time than the full-text query itself.
+    quote_name = connections[queryset.db].ops.quote_name
+    opts = queryset.model._meta
+    column = f"{quote_name(opts.db_table)}.{quote_name(opts.pk.column)}"
+    whens = " ".join("WHEN %s THEN %s" for _ in ids)
+    params = [value for position, pk in enumerate(ids) for value in (pk, position)]
+    queryset = queryset.filter(pk__in=ids).order_by(
+        RawSQL(f"CASE {column} {whens} END", params)
+    )
+    return queryset, truncated
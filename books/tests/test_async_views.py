@@ -0,0 +1,166 @@
+from datetime import date, timedelta
+
+from asgiref.sync import iscoroutinefunction
+from django.test import override_settings
+from django.urls import include, path
+from rest_framework import status
+
+from books.models import Book
+from books.tests.base import AuthenticatedAPITestCase
+from books.views import BookViewSet
+from borrowings.models import Borrowing
+from borrowings.views import BorrowingViewSet
+from payments.models import Payment
+from payments.views import PaymentDetailView, PaymentListView
+
+
+class AsyncBookViewSet(BookViewSet):
+    async_read = True
+
+
+class AsyncBorrowingViewSet(BorrowingViewSet):
+    async_read = True
+
+
+class AsyncPaymentListView(PaymentListView):
+    async_read = True
+
+
+class AsyncPaymentDetailView(PaymentDetailView):
+    async_read = True
+
+
+book_list = AsyncBookViewSet.as_view({"get": "list", "post": "create"})
+
+urlpatterns = [
+    path("", include("library_service.urls")),
+    path("async/books/", book_list),
+    path("async/books/<int:pk>/", AsyncBookViewSet.as_view({"get": "retrieve"})),
+    path("async/borrowings/", AsyncBorrowingViewSet.as_view({"get": "list"})),
+    path("async/payments/", AsyncPaymentListView.as_view()),
+    path("async/payments/<int:pk>/", AsyncPaymentDetailView.as_view()),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncReadViewTests(AuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.get_normal_user()
+        self.other = self.get_staff_user()
+        self.books = [
+            Book.objects.create(
+                title=f"Async Book {i}",
+                author="Author",
+                cover="HARD",
+                inventory=3,
+                daily_fee="1.50",
+            )
+            for i in range(3)
+        ]
+        self.borrowings = [
+            Borrowing.objects.create(
+                user=user,
+                book=book,
+                expected_return_date=date.today() + timedelta(days=3),
+            )
+            for user, book in zip([self.user, self.user, self.other], self.books)
+        ]
+        self.payment = Payment.objects.create(
+            status=Payment.Status.PENDING,
+            type=Payment.Type.PAYMENT,
+            borrowing=self.borrowings[0],
+            session_url="https://example.com/session",
+            session_id="session-1",
+            money_to_pay="4.50",
+        )
+
+    def assertSameAsSync(self, url):
+        sync = self.client.get(f"/api{url}")
+        native = self.client.get(f"/async{url}")
+
+        self.assertEqual(native.status_code, sync.status_code)
+        # Pagination links point back at the requested path.
+        self.assertEqual(native.content.replace(b"/async/", b"/api/"), sync.content)
+        return native
+
+    def test_views_are_coroutines_only_when_enabled(self):
+        self.assertTrue(iscoroutinefunction(book_list))
+        self.assertFalse(iscoroutinefunction(BookViewSet.as_view({"get": "list"})))
+
+    def test_list_and_retrieve_match_sync_views(self):
+        self.authenticate_normal_user()
+
+        for url in [
+            "/books/",
+            "/books/?page_size=2",
+            f"/books/{self.books[1].pk}/",
+            "/books/?search=async",
+            "/borrowings/",
+            "/borrowings/?page_size=1",
+            "/payments/",
+            f"/payments/{self.payment.pk}/",
+        ]:
+            with self.subTest(url=url):
+                response = self.assertSameAsSync(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(BOOK_CATALOG_CACHE_TIMEOUT=0)
+    def test_list_without_response_cache_matches_sync_view(self):
+        self.assertSameAsSync("/books/")
+
+    def test_missing_objects_return_404(self):
+        self.authenticate_normal_user()
+
+        self.assertEqual(
+            self.client.get("/async/books/999999/").status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+        other_payment = Payment.objects.create(
+            status=Payment.Status.PENDING,
+            type=Payment.Type.PAYMENT,
+            borrowing=self.borrowings[2],
+            session_url="https://example.com/other",
+            session_id="session-2",
+            money_to_pay="1.00",
+        )
+        self.assertEqual(
+            self.client.get(f"/async/payments/{other_payment.pk}/").status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+
+    def test_unauthenticated_requests_are_rejected(self):
+        response = self.client.get("/async/borrowings/")
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("WWW-Authenticate", response)
+
+    def test_cached_book_list_honours_etag(self):
+        first = self.client.get("/async/books/")
+        second = self.client.get("/async/books/", HTTP_IF_NONE_MATCH=first["ETag"])
+
+        self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_writes_fall_back_to_sync_view(self):
+        self.authenticate_staff_user()
+
+        response = self.client.post(
+            "/async/books/",
+            {
+                "title": "Written Async",
+                "author": "Author",
+                "cover": "SOFT",
+                "inventory": 1,
+                "daily_fee": "1.00",
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Book.objects.filter(title="Written Async").exists())
+
+    async def test_served_through_async_client(self):
+        response = await self.async_client.get("/async/books/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()), 3)
@@ -0,0 +1,80 @@
+from datetime import date, timedelta
+
+from django.urls import reverse
+from rest_framework import status
+
+from books.models import Book
+from books.tests.base import AuthenticatedAPITestCase
+
+BOOKS_URL = reverse("books:book-list")
+CHECKOUT_URL = reverse("borrowings:borrowing-checkout")
+
+
+def detail_url(book_id):
+    return reverse("books:book-detail", args=[book_id])
+
+
+class CatalogCacheTests(AuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.book = Book.objects.create(
+            title="Cached Book",
+            author="Author",
+            cover="HARD",
+            inventory=2,
+            daily_fee="1.00",
+        )
+
+    def test_repeated_list_is_served_without_queries(self):
+        first = self.client.get(BOOKS_URL)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(BOOKS_URL)
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_matching_etag_returns_304(self):
+        first = self.client.get(detail_url(self.book.id))
+
+        with self.assertNumQueries(0):
+            res = self.client.get(
+                detail_url(self.book.id), HTTP_IF_NONE_MATCH=first["ETag"]
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_book_update_invalidates_cache(self):
+        self.client.get(detail_url(self.book.id))
+
+        self.authenticate_staff_user()
+        self.client.patch(detail_url(self.book.id), {"inventory": 7}, format="json")
+        res = self.client.get(detail_url(self.book.id))
+
+        self.assertEqual(res.json()["inventory"], 7)
+
+    def test_checkout_invalidates_cache(self):
+        self.client.get(detail_url(self.book.id))
+
+        self.authenticate_normal_user()
+        self.client.post(
+            CHECKOUT_URL,
+            [
+                {
+                    "book": self.book.id,
+                    "expected_return_date": date.today() + timedelta(days=3),
+                }
+            ],
+            format="json",
+        )
+        res = self.client.get(detail_url(self.book.id))
+
+        self.assertEqual(res.json()["inventory"], 1)
+
+    def test_browsable_api_is_not_cached(self):
+        self.client.get(BOOKS_URL, HTTP_ACCEPT="text/html")
+        res = self.client.get(BOOKS_URL, HTTP_ACCEPT="text/html")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn("ETag", res)
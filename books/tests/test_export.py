@@ -0,0 +1,110 @@
+import csv
+import json
+from io import StringIO
+
+from asgiref.sync import sync_to_async
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from books.models import Book
+from books.tests.base import AuthenticatedAPITestCase
+
+EXPORT_URL = reverse("books:book-export")
+
+
+class BookExportTests(AuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.books = [
+            Book.objects.create(
+                title=f"Export Book {i}",
+                author="Author",
+                cover="HARD",
+                inventory=i,
+                daily_fee="1.50",
+            )
+            for i in range(3)
+        ]
+
+    def read(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_ndjson_export_streams_all_rows(self):
+        self.authenticate_staff_user()
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in self.read(res).splitlines()]
+        self.assertEqual([row["id"] for row in rows], [b.id for b in self.books])
+        self.assertEqual(rows[0]["daily_fee"], "1.50")
+
+    def test_csv_export_with_since_id_watermark(self):
+        self.authenticate_staff_user()
+
+        res = self.client.get(
+            EXPORT_URL, {"output": "csv", "since_id": self.books[0].id}
+        )
+
+        rows = list(csv.DictReader(StringIO(self.read(res))))
+        self.assertEqual(
+            [int(row["id"]) for row in rows], [b.id for b in self.books[1:]]
+        )
+        self.assertEqual(rows[0]["title"], "Export Book 1")
+
+    def test_invalid_parameters_are_rejected(self):
+        self.authenticate_staff_user()
+
+        for params in [
+            {"output": "xml"},
+            {"since_id": "x"},
+            {"updated_since": "1"},
+            {"updated_since": "2024-13-01T00:00:00"},
+        ]:
+            res = self.client.get(EXPORT_URL, params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_export_streams_asynchronously_under_asgi(self):
+        user = await sync_to_async(self.get_staff_user)()
+        token = AccessToken.for_user(user)
+
+        res = await self.async_client.get(
+            EXPORT_URL, {"output": "csv"}, headers={"Authorize": f"Bearer {token}"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.is_async)
+        lines = [chunk async for chunk in res.streaming_content]
+        self.assertEqual(lines[0], b"id,title,author,cover,inventory,daily_fee\r\n")
+        self.assertEqual(len(lines), 4)
+
+    def test_non_staff_cannot_export(self):
+        self.authenticate_normal_user()
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_command(self):
+        out = StringIO()
+
+        call_command("export_data", "books", output="csv", stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], "id,title,author,cover,inventory,daily_fee")
+        self.assertEqual(len(lines), 4)
+
+    def test_export_command_rejects_invalid_watermark(self):
+        for value in ("yesterday", "2024-13-01T00:00:00"):
+            with self.subTest(value=value):
+                with self.assertRaisesMessage(CommandError, "not a valid datetime"):
+                    call_command(
+                        "export_data",
+                        "payments",
+                        f"--updated-since={value}",
+                        stdout=StringIO(),
+                    )
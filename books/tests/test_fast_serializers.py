@@ -0,0 +1,48 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+
+from books.models import Book
+from books.serializers import BookSerializer
+from books.tests.base import AuthenticatedAPITestCase
+from library_service.serializers import ValuesSerializer
+
+BOOKS_URL = reverse("books:book-list")
+
+
+@override_settings(BOOK_CATALOG_CACHE_TIMEOUT=0)
+class BookValuesSerializerTests(AuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        for index, fee in enumerate(["1.50", "10.00", "0.05", "9999.99"]):
+            Book.objects.create(
+                title=f"Fast Book «{index}»",
+                author="Author",
+                cover="HARD" if index % 2 else "SOFT",
+                inventory=index,
+                daily_fee=fee,
+            )
+
+    def test_output_is_byte_identical_to_book_serializer(self):
+        serializer = ValuesSerializer.for_serializer(BookSerializer)
+        queryset = Book.objects.order_by("id")
+
+        fast = serializer.to_representation(queryset.values(*serializer.paths))
+        regular = BookSerializer(queryset, many=True).data
+
+        self.assertEqual(JSONRenderer().render(fast), JSONRenderer().render(regular))
+
+    def test_list_endpoint_is_byte_identical_in_fast_mode(self):
+        regular = self.client.get(BOOKS_URL)
+        with override_settings(FAST_READ_SERIALIZERS=True):
+            fast = self.client.get(BOOKS_URL)
+
+        self.assertEqual(fast.status_code, 200)
+        self.assertEqual(fast.content, regular.content)
+
+    def test_paginated_list_is_byte_identical_in_fast_mode(self):
+        regular = self.client.get(BOOKS_URL + "?page_size=3")
+        with override_settings(FAST_READ_SERIALIZERS=True):
+            fast = self.client.get(BOOKS_URL + "?page_size=3")
+
+        self.assertEqual(fast.content, regular.content)
@@ -0,0 +1,132 @@
+from types import SimpleNamespace
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from books.filters import IndexedOrderingFilter
+from books.models import Book
+from books.tests.base import AuthenticatedAPITestCase
+from library_service.tests.base import QueryPlanAssertionsMixin
+
+BOOKS_URL = reverse("books:book-list")
+
+SORT_PATTERNS = {
+    "sqlite": "USE TEMP B-TREE FOR",
+    "postgresql": "Sort Key",
+}
+
+
+class BookFilterTests(QueryPlanAssertionsMixin, AuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        rows = [
+            ("Hard Cheap", "Ann", "HARD", 3, "0.50"),
+            ("Hard Pricey", "Ann", "HARD", 1, "2.00"),
+            ("Hard Gone", "Bob", "HARD", 0, "0.75"),
+            ("Soft Cheap", "Bob", "SOFT", 5, "0.50"),
+            ("Soft Pricey", "Cid", "SOFT", 2, "1.50"),
+        ]
+        self.books = {
+            title: Book.objects.create(
+                title=title,
+                author=author,
+                cover=cover,
+                inventory=inventory,
+                daily_fee=daily_fee,
+            )
+            for title, author, cover, inventory, daily_fee in rows
+        }
+
+    def titles(self, query):
+        res = self.client.get(BOOKS_URL, query)
+        self.assertEqual(res.status_code, status.HTTP_200_OK, res.data)
+        books = res.data["results"] if "results" in res.data else res.data
+        return [book["title"] for book in books]
+
+    def test_filters(self):
+        cases = [
+            ({"cover": "SOFT"}, ["Soft Cheap", "Soft Pricey"]),
+            ({"author": "Bob"}, ["Hard Gone", "Soft Cheap"]),
+            ({"inventory__gt": 2}, ["Hard Cheap", "Soft Cheap"]),
+            ({"available": "false"}, ["Hard Gone"]),
+            ({"daily_fee__gte": "1.50"}, ["Hard Pricey", "Soft Pricey"]),
+            (
+                {"daily_fee__gt": "0.50", "daily_fee__lt": "2"},
+                ["Hard Gone", "Soft Pricey"],
+            ),
+            (
+                {"cover": "HARD", "available": "true", "daily_fee__lte": "1.00"},
+                ["Hard Cheap"],
+            ),
+        ]
+        for query, expected in cases:
+            with self.subTest(query=query):
+                self.assertEqual(sorted(self.titles(query)), expected)
+
+    def test_invalid_filters_are_rejected(self):
+        res = self.client.get(
+            BOOKS_URL, {"cover": "PAPER", "daily_fee__lte": "cheap", "available": "x"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(res.data), {"cover", "daily_fee__lte", "available"})
+
+    def test_ordering(self):
+        self.assertEqual(
+            self.titles({"ordering": "-daily_fee"}),
+            ["Hard Pricey", "Soft Pricey", "Hard Gone", "Soft Cheap", "Hard Cheap"],
+        )
+        self.assertEqual(
+            self.titles({"ordering": "title", "cover": "SOFT"}),
+            ["Soft Cheap", "Soft Pricey"],
+        )
+
+    def test_keyset_pages_follow_the_ordering(self):
+        expected = self.titles({"ordering": "-daily_fee"})
+        titles = []
+        url = f"{BOOKS_URL}?ordering=-daily_fee&page_size=2"
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            titles.extend(book["title"] for book in res.data["results"])
+            url = res.data["next"]
+
+        self.assertEqual(titles, expected)
+
+    def test_unindexed_orderings_are_rejected(self):
+        for ordering in ("cover", "-cover", "borrowings", "--title"):
+            with self.subTest(ordering=ordering):
+                res = self.client.get(BOOKS_URL, {"ordering": ordering})
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn("ordering", res.data)
+
+    def test_ordering_fields_must_be_indexed(self):
+        view = SimpleNamespace(
+            get_queryset=Book.objects.all, ordering_fields=("title", "cover")
+        )
+
+        with self.assertRaisesMessage(ImproperlyConfigured, "cover"):
+            IndexedOrderingFilter().get_ordering_fields(view)
+
+    def test_filters_use_indexes(self):
+        for query in (
+            "cover=HARD",
+            "author=Ann",
+            "inventory__gt=1",
+            "available=false",
+            "daily_fee__lte=1.00",
+            "cover=HARD&available=true&daily_fee__lte=1.00",
+        ):
+            with self.subTest(query=query):
+                self.assertRequestUsesIndexes(f"{BOOKS_URL}?{query}", Book)
+
+    def test_orderings_do_not_sort(self):
+        for ordering in ("id", "-title", "author", "-daily_fee", "inventory"):
+            with self.subTest(ordering=ordering):
+                with CaptureQueriesContext(connection) as queries:
+                    self.client.get(BOOKS_URL, {"ordering": ordering, "page_size": 2})
+                plan = self.explain(queries[-1]["sql"])
+                self.assertNotIn(SORT_PATTERNS[connection.vendor], plan)
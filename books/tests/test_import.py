@@ -0,0 +1,176 @@
+import json
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from books.models import Book
+from books.tests.base import AuthenticatedAPITestCase
+
+IMPORT_URL = reverse("books:book-import-books")
+
+CSV_BODY = (
+    "title,author,cover,inventory,daily_fee\n"
+    "Dune,Frank Herbert,HARD,3,1.50\n"
+    "Emma,Jane Austen,SOFT,2,0.99\n"
+    "Broken,Nobody,PAPER,-1,abc\n"
+    "Ulysses,James Joyce,SOFT,1,2.00\n"
+)
+
+
+class BookImportTests(AuthenticatedAPITestCase):
+    def post(self, body, content_type, query=""):
+        return self.client.generic(
+            "POST", IMPORT_URL + query, body.encode(), content_type=content_type
+        )
+
+    def test_csv_import_reports_row_errors(self):
+        self.authenticate_staff_user()
+
+        res = self.post(CSV_BODY, "text/csv", "?batch_size=2")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["imported"], 3)
+        self.assertEqual(res.data["failed"], 1)
+        self.assertEqual(res.data["errors"][0]["row"], 3)
+        self.assertIn("cover", res.data["errors"][0]["errors"])
+        self.assertEqual(
+            sorted(Book.objects.values_list("title", flat=True)),
+            ["Dune", "Emma", "Ulysses"],
+        )
+
+    def test_jsonl_import_upserts_rows_with_id(self):
+        book = Book.objects.create(
+            title="Old Title",
+            author="Author",
+            cover="HARD",
+            inventory=1,
+            daily_fee="1.00",
+        )
+        self.authenticate_staff_user()
+        rows = [
+            {
+                "id": book.id,
+                "title": "New Title",
+                "author": "Author",
+                "cover": "HARD",
+                "inventory": 4,
+                "daily_fee": "1.25",
+            },
+            {
+                "title": "Fresh Book",
+                "author": "Author",
+                "cover": "SOFT",
+                "inventory": 1,
+                "daily_fee": "0.50",
+            },
+        ]
+        body = "\n".join(json.dumps(row) for row in rows) + "\n{not json}\n"
+
+        res = self.post(body, "application/x-ndjson")
+
+        self.assertEqual(res.data["imported"], 2)
+        self.assertEqual(res.data["failed"], 1)
+        book.refresh_from_db()
+        self.assertEqual(book.title, "New Title")
+        self.assertEqual(book.inventory, 4)
+        self.assertEqual(Book.objects.count(), 2)
+
+    def test_new_books_follow_imported_ids(self):
+        self.authenticate_staff_user()
+        row = {
+            "id": 500,
+            "title": "Imported",
+            "author": "Author",
+            "cover": "HARD",
+            "inventory": 1,
+            "daily_fee": "1.00",
+        }
+        self.post(json.dumps(row), "application/x-ndjson")
+
+        res = self.client.post(
+            reverse("books:book-list"), {**row, "title": "Created"}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertGreater(res.data["id"], 500)
+
+    def test_repeated_id_in_a_batch_counts_once(self):
+        book = Book.objects.create(
+            title="Old", author="Author", cover="HARD", inventory=1, daily_fee="1.00"
+        )
+        self.authenticate_staff_user()
+        row = {"id": book.id, "author": "Author", "cover": "HARD", "daily_fee": "1"}
+        body = "\n".join(
+            json.dumps({**row, "title": title, "inventory": inventory})
+            for title, inventory in (("First", 2), ("Second", 3))
+        )
+
+        res = self.post(body, "application/x-ndjson")
+
+        self.assertEqual(res.data["imported"], 1)
+        book.refresh_from_db()
+        self.assertEqual((book.title, book.inventory), ("Second", 3))
+
+    def test_invalid_ids_are_row_errors(self):
+        book = Book.objects.create(
+            title="Kept", author="Author", cover="HARD", inventory=1, daily_fee="1.00"
+        )
+        self.authenticate_staff_user()
+        ids = [book.id + 0.5, str(book.id + 0.5), "1e3", True, -book.id, 2**70]
+        row = {"title": "Bad", "author": "A", "cover": "SOFT", "inventory": 1}
+        body = "\n".join(
+            json.dumps({**row, "id": id, "daily_fee": "1.00"}) for id in ids
+        )
+
+        res = self.post(body, "application/x-ndjson")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["imported"], 0)
+        self.assertEqual(res.data["failed"], len(ids))
+        self.assertTrue(all("id" in error["errors"] for error in res.data["errors"]))
+        book.refresh_from_db()
+        self.assertEqual(book.title, "Kept")
+        self.assertEqual(Book.objects.count(), 1)
+
+    def test_undecodable_body_is_rejected(self):
+        self.authenticate_staff_user()
+        body = "title,author,cover,inventory,daily_fee\nCaf\xe9,A,SOFT,1,1.00\n"
+
+        res = self.client.generic(
+            "POST", IMPORT_URL, body.encode("latin-1"), content_type="text/csv"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Line 2", res.data["detail"])
+        self.assertFalse(Book.objects.exists())
+
+    def test_unsupported_media_type(self):
+        self.authenticate_staff_user()
+
+        res = self.post("{}", "application/json")
+
+        self.assertEqual(res.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+    def test_non_staff_cannot_import(self):
+        self.authenticate_normal_user()
+
+        res = self.post(CSV_BODY, "text/csv")
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Book.objects.exists())
+
+    def test_import_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as source:
+            source.write(CSV_BODY)
+            source.flush()
+            out, err = StringIO(), StringIO()
+            call_command(
+                "import_books", source.name, batch_size=2, stdout=out, stderr=err
+            )
+
+        self.assertIn("Imported 3 books, 1 failed", out.getvalue())
+        self.assertIn("row 3", err.getvalue())
+        self.assertEqual(Book.objects.count(), 3)
@@ -0,0 +1,101 @@
+from base64 import b64encode
+import json
+from urllib.parse import parse_qs, urlparse
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from books.models import Book
+from books.tests.base import AuthenticatedAPITestCase
+
+BOOKS_URL = reverse("books:book-list")
+
+
+class BookPaginationTests(AuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.books = [
+            Book.objects.create(
+                title=f"Book {i}",
+                author="Author",
+                cover="SOFT",
+                inventory=1,
+                daily_fee="1.00",
+            )
+            for i in range(5)
+        ]
+
+    def test_list_is_not_paginated_by_default(self):
+        res = self.client.get(BOOKS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(res.data, list)
+        self.assertEqual(len(res.data), 5)
+
+    def test_walk_all_pages(self):
+        ids = []
+        url = BOOKS_URL + "?page_size=2"
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            ids.extend(book["id"] for book in res.data["results"])
+            url = res.data["next"]
+
+        self.assertEqual(ids, [book.id for book in self.books])
+
+    def test_page_size_is_capped(self):
+        with self.settings(KEYSET_PAGINATION={"PAGE_SIZE": 2, "MAX_PAGE_SIZE": 3}):
+            res = self.client.get(BOOKS_URL + "?page_size=1000")
+
+        self.assertEqual(len(res.data["results"]), 3)
+        self.assertIsNotNone(res.data["next"])
+
+    def test_pages_use_keyset_filter_without_offset_or_count(self):
+        first = self.client.get(BOOKS_URL + "?page_size=2")
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(first.data["next"])
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 1)
+        sql = queries[0]["sql"].upper()
+        self.assertNotIn("OFFSET", sql)
+        self.assertNotIn("COUNT(", sql)
+        self.assertIn('"ID" >', sql)
+
+    def test_invalid_cursor_returns_404(self):
+        res = self.client.get(BOOKS_URL + "?cursor=not-a-cursor")
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_malformed_cursors_return_404(self):
+        def cursor(payload):
+            return b64encode(json.dumps(payload).encode()).decode()
+
+        id_ordering = ["id"]
+        title_ordering = ["title", "id"]
+        for payload in (
+            ["abc"],
+            [{}],
+            [None],
+            {"ordering": id_ordering, "position": ["abc"]},
+            {"ordering": id_ordering, "position": [{}]},
+            {"ordering": id_ordering, "position": [None]},
+            {"ordering": id_ordering, "position": [True]},
+            {"ordering": id_ordering, "position": [1, 2]},
+            {"ordering": title_ordering, "position": ["Book 1", 2]},
+            {"ordering": id_ordering},
+        ):
+            with self.subTest(payload=payload):
+                res = self.client.get(BOOKS_URL, {"cursor": cursor(payload)})
+                self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_is_tied_to_its_ordering(self):
+        first = self.client.get(BOOKS_URL, {"ordering": "-daily_fee", "page_size": 2})
+        cursor = parse_qs(urlparse(first.data["next"]).query)["cursor"][0]
+
+        res = self.client.get(BOOKS_URL, {"ordering": "title", "cursor": cursor})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
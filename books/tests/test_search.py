@@ -0,0 +1,105 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from books.models import Book
+from books.tests.base import AuthenticatedAPITestCase
+
+BOOKS_URL = reverse("books:book-list")
+
+
+@override_settings(BOOK_CATALOG_CACHE_TIMEOUT=0)
+class BookSearchTests(AuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.gatsby = self.create_book("The Great Gatsby", "F. Scott Fitzgerald")
+        self.orwell = self.create_book("Nineteen Eighty-Four", "George Orwell")
+        self.farm = self.create_book("Animal Farm", "George Orwell")
+        self.biography = self.create_book("Orwell: A Life", "Bernard Crick")
+
+    def create_book(self, title, author):
+        return Book.objects.create(
+            title=title, author=author, cover="SOFT", inventory=1, daily_fee="1.00"
+        )
+
+    def search(self, query):
+        res = self.client.get(BOOKS_URL, {"search": query})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [book["id"] for book in res.data]
+
+    def test_search_by_title_and_author(self):
+        self.assertEqual(self.search("gatsby"), [self.gatsby.id])
+        self.assertEqual(
+            sorted(self.search("george orwell")), [self.orwell.id, self.farm.id]
+        )
+
+    def test_all_terms_must_match(self):
+        self.assertEqual(self.search("orwell farm"), [self.farm.id])
+
+    def test_last_term_matches_as_prefix(self):
+        self.assertEqual(self.search("gat"), [self.gatsby.id])
+        self.assertEqual(self.search("animal fa"), [self.farm.id])
+
+    def test_title_matches_rank_first(self):
+        self.assertEqual(self.search("orwell")[0], self.biography.id)
+
+    def test_no_match_returns_empty_list(self):
+        self.assertEqual(self.search("tolstoy"), [])
+
+    def test_blank_search_returns_everything(self):
+        self.assertEqual(len(self.search("  ")), 4)
+
+    def test_query_without_words_matches_nothing(self):
+        for query in ("!!!", "*", '"-"'):
+            with self.subTest(query=query):
+                self.assertEqual(self.search(query), [])
+
+    def test_index_follows_writes(self):
+        Book.objects.filter(pk=self.gatsby.pk).update(title="Tender Is the Night")
+        self.farm.delete()
+        Book.objects.bulk_create(
+            [
+                Book(
+                    title="Homage to Catalonia",
+                    author="George Orwell",
+                    cover="HARD",
+                    inventory=1,
+                    daily_fee="1.00",
+                )
+            ]
+        )
+
+        self.assertEqual(self.search("gatsby"), [])
+        self.assertEqual(len(self.search("tender night")), 1)
+        self.assertEqual(self.search("animal"), [])
+        self.assertEqual(len(self.search("catalonia")), 1)
+
+    def test_inventory_updates_keep_search_results(self):
+        Book.objects.filter(pk=self.gatsby.pk).update(inventory=5)
+
+        self.assertEqual(self.search("gatsby"), [self.gatsby.id])
+
+    def test_search_cannot_be_paginated(self):
+        for params in ({"page_size": 2}, {"cursor": "abc"}):
+            with self.subTest(params=params):
+                res = self.client.get(BOOKS_URL, {"search": "orwell", **params})
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn("search", res.data)
+
+    def test_truncated_results_are_reported(self):
+        res = self.client.get(BOOKS_URL, {"search": "orwell"})
+        self.assertEqual(res["Search-Truncated"], "false")
+        self.assertFalse(self.client.get(BOOKS_URL).has_header("Search-Truncated"))
+
+        with override_settings(BOOK_SEARCH_MAX_RESULTS=2):
+            res = self.client.get(BOOKS_URL, {"search": "orwell"})
+
+        self.assertEqual(len(res.data), 2)
+        self.assertEqual(res["Search-Truncated"], "true")
+
+    @override_settings(BOOK_CATALOG_CACHE_TIMEOUT=60, BOOK_SEARCH_MAX_RESULTS=1)
+    def test_truncated_header_is_cached(self):
+        for _ in range(2):
+            res = self.client.get(BOOKS_URL, {"search": "george orwell"})
+            self.assertEqual(res["Search-Truncated"], "true")
+            self.assertEqual(len(res.json()), 1)
@@ -1,12 +1,69 @@
 from django.shortcuts import render
-from rest_framework import viewsets
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import UnsupportedMediaType
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
 
+from books.cache import CatalogCacheMixin
+from books.filters import BookFilter, BookSearchFilter, IndexedOrderingFilter
+from books.importers import READERS, decode_lines, import_books
 from books.models import Book
 from books.permissions import IsAdminOrReadOnly
 from books.serializers import BookSerializer
+from library_service.exports import export_response
+from library_service.mixins import AsyncReadMixin, ValuesListMixin
+from library_service.pagination import KeysetPagination
+from library_service.timing import ServerTimingMixin
 
+IMPORT_MEDIA_TYPES = {
+    "text/csv": "csv",
+    "application/jsonl": "jsonl",
+    "application/x-ndjson": "jsonl",
+}
 
-class BookViewSet(viewsets.ModelViewSet):
+
+class BookViewSet(
+    ServerTimingMixin,
+    CatalogCacheMixin,
+    AsyncReadMixin,
+    ValuesListMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [IsAdminOrReadOnly]
+    pagination_class = KeysetPagination
+    filter_backends = [BookFilter, BookSearchFilter, IndexedOrderingFilter]
+    ordering_fields = ("id", "title", "author", "daily_fee", "inventory")
+    cached_headers = (BookSearchFilter.truncated_header,)
+    # Search adds one full-text lookup before the page query.
+    query_budget = {"list": 3, "retrieve": 2}
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        BookSearchFilter.add_truncated_header(request, response)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    @action(detail=False, methods=["post"], url_path="import")
+    def import_books(self, request):
+        """
+        Stream a CSV or JSON Lines body into the catalog. The body is read
+        line by line from the request stream and never buffered whole.
+        """
+        media_type = request.content_type.split(";")[0].strip()
+        if media_type not in IMPORT_MEDIA_TYPES:
+            raise UnsupportedMediaType(media_type)
+
+        reader = READERS[IMPORT_MEDIA_TYPES[media_type]]
+        lines = decode_lines(request.stream) if request.stream else []
+        try:
+            batch_size = max(int(request.query_params.get("batch_size", 1000)), 1)
+        except ValueError:
+            batch_size = 1000
+        result = import_books(reader(lines), batch_size=batch_size)
+
+        return Response(result.as_dict(), status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"], permission_classes=[IsAdminUser])
+    def export(self, request):
+        return export_response(request, "books")
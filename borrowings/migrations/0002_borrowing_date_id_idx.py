@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-18 17:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("borrowings", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="borrowing",
+            index=models.Index(
+                fields=["borrow_date", "id"], name="borrowing_date_id_idx"
+            ),
+        ),
+    ]
@@ -14,6 +14,26 @@ class Borrowing(models.Model):
     expected_return_date = models.DateField()
     actual_return_date = models.DateField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["borrow_date", "id"], name="borrowing_date_id_idx"),
+            models.Index(
+                fields=["user", "borrow_date", "id"],
+                condition=models.Q(actual_return_date__isnull=True),
+                name="borrowing_user_active_idx",
+            ),
+            models.Index(
+                fields=["book"],
+                condition=models.Q(actual_return_date__isnull=True),
+                name="borrowing_book_active_idx",
+            ),
+            models.Index(
+                fields=["expected_return_date"],
+                condition=models.Q(actual_return_date__isnull=True),
+                name="borrowing_overdue_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.user.email} borrowed {self.book.title}"
 
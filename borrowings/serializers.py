@@ -1,9 +1,36 @@
+from collections import Counter, defaultdict
 from datetime import date
 
+from django.db.models import Case, F, IntegerField, Value, When
 from rest_framework import serializers
 
+from books.cache import catalog_changed
+from books.models import Book
 from books.serializers import BookSerializer
 from borrowings.models import Borrowing
+from library_service import metrics
+from library_service.db import write_atomic
+
+MAX_CHECKOUT_ITEMS = 20
+MAX_RETURN_ITEMS = 5000
+
+
+def inventory_change(counts):
+    """
+    Build a ``CASE`` expression mapping each book id to its count, grouping
+    books that share a count so the statement stays short for large batches.
+    """
+    books_by_count = defaultdict(list)
+    for book_id, count in counts.items():
+        books_by_count[count].append(book_id)
+
+    return Case(
+        *[
+            When(pk__in=book_ids, then=Value(count))
+            for count, book_ids in books_by_count.items()
+        ],
+        output_field=IntegerField(),
+    )
 
 
 class BorrowingReadSerializer(serializers.ModelSerializer):
@@ -42,7 +69,128 @@ class BorrowingCreateSerializer(serializers.ModelSerializer):
         user = self.context["request"].user
         book = validated_data["book"]
 
-        book.inventory -= 1
-        book.save()
+        with write_atomic():
+            # A single conditional UPDATE: concurrent checkouts can never
+            # push inventory below zero, and no other Book column is rewritten.
+            reserved = Book.objects.filter(pk=book.pk, inventory__gt=0).update(
+                inventory=F("inventory") - 1
+            )
+            if not reserved:
+                raise serializers.ValidationError(
+                    "Book is not available for borrowing."
+                )
+            catalog_changed()
+            metrics.borrowings_created()
+
+            return Borrowing.objects.create(user=user, **validated_data)
+
+
+class BorrowingCheckoutListSerializer(serializers.ListSerializer):
+    def to_internal_value(self, data):
+        items = super().to_internal_value(data)
+
+        counts = Counter(item["book"] for item in items)
+        books = Book.objects.in_bulk(list(counts))
+
+        errors = []
+        for item in items:
+            book = books.get(item["book"])
+            if book is None:
+                errors.append(
+                    {"book": [f'Invalid pk "{item["book"]}" - object does not exist.']}
+                )
+            elif book.inventory < counts[book.pk]:
+                errors.append({"book": ["Book is not available for borrowing."]})
+            else:
+                errors.append({})
+                item["book"] = book
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+        return items
+
+    def create(self, validated_data):
+        user = self.context["request"].user
+        counts = Counter(item["book"].pk for item in validated_data)
+        change = inventory_change(counts)
+
+        with write_atomic():
+            reserved = Book.objects.filter(
+                pk__in=list(counts), inventory__gte=change
+            ).update(inventory=F("inventory") - change)
+            if reserved != len(counts):
+                raise serializers.ValidationError(
+                    "Some books are no longer available for borrowing."
+                )
+            catalog_changed()
+
+            borrowings = Borrowing.objects.bulk_create(
+                [Borrowing(user=user, **item) for item in validated_data]
+            )
+            metrics.borrowings_created(len(borrowings))
+
+        for book in {item["book"] for item in validated_data}:
+            book.inventory -= counts[book.pk]
+
+        return borrowings
+
+
+class BorrowingCheckoutSerializer(serializers.Serializer):
+    book = serializers.IntegerField(min_value=1)
+    expected_return_date = serializers.DateField()
+
+    class Meta:
+        list_serializer_class = BorrowingCheckoutListSerializer
+
+    def validate_expected_return_date(self, value):
+        if value < date.today():
+            raise serializers.ValidationError(
+                "Expected return date cannot be in the past."
+            )
+        return value
+
+
+class BorrowingBulkReturnSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_RETURN_ITEMS,
+    )
+
+    def create(self, validated_data):
+        ids = set(validated_data["ids"])
+        queryset = validated_data["queryset"]
+
+        returned, already_returned, found = [], [], set()
+        counts = Counter()
+
+        with write_atomic():
+            rows = (
+                queryset.select_for_update(of=("self",))
+                .filter(pk__in=ids)
+                .values_list("id", "book_id", "actual_return_date")
+            )
+            for borrowing_id, book_id, actual_return_date in rows:
+                found.add(borrowing_id)
+                if actual_return_date:
+                    already_returned.append(borrowing_id)
+                else:
+                    returned.append(borrowing_id)
+                    counts[book_id] += 1
+
+            if returned:
+                Borrowing.objects.filter(pk__in=returned).update(
+                    actual_return_date=date.today()
+                )
+                Book.objects.filter(pk__in=list(counts)).update(
+                    inventory=F("inventory") + inventory_change(counts)
+                )
+                catalog_changed()
+                metrics.borrowings_returned(len(returned))
 
-        return Borrowing.objects.create(user=user, **validated_data)
+        return {
+            "returned": sorted(returned),
+            "already_returned": sorted(already_returned),
+            "not_found": sorted(ids - found),
+        }
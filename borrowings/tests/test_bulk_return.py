@@ -0,0 +1,120 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from books.models import Book
+from books.tests.base import AuthenticatedAPITestCase
+from borrowings.models import Borrowing
+
+BULK_RETURN_URL = reverse("borrowings:borrowing-bulk-return")
+
+
+class BulkReturnTests(AuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.authenticate_normal_user()
+        self.user = self.get_normal_user()
+        self.book = Book.objects.create(
+            title="Drop Box Book",
+            author="Author",
+            cover="HARD",
+            inventory=1,
+            daily_fee="1.00",
+        )
+        self.other_book = Book.objects.create(
+            title="Other Drop Box Book",
+            author="Author",
+            cover="SOFT",
+            inventory=0,
+            daily_fee="1.00",
+        )
+        self.borrowings = [
+            Borrowing.objects.create(
+                user=self.user,
+                book=book,
+                expected_return_date=date.today() + timedelta(days=3),
+            )
+            for book in [self.book, self.book, self.other_book]
+        ]
+
+    def ids(self, borrowings):
+        return [borrowing.id for borrowing in borrowings]
+
+    def test_bulk_return_marks_borrowings_and_restocks_books(self):
+        res = self.client.post(
+            BULK_RETURN_URL, {"ids": self.ids(self.borrowings)}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["returned"], sorted(self.ids(self.borrowings)))
+        self.assertEqual(res.data["already_returned"], [])
+        self.assertFalse(
+            Borrowing.objects.filter(actual_return_date__isnull=True).exists()
+        )
+        self.book.refresh_from_db()
+        self.other_book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 3)
+        self.assertEqual(self.other_book.inventory, 1)
+
+    def test_bulk_return_reports_already_returned(self):
+        self.client.post(
+            BULK_RETURN_URL, {"ids": self.ids(self.borrowings[:1])}, format="json"
+        )
+
+        res = self.client.post(
+            BULK_RETURN_URL, {"ids": self.ids(self.borrowings[:2])}, format="json"
+        )
+
+        self.assertEqual(res.data["returned"], [self.borrowings[1].id])
+        self.assertEqual(res.data["already_returned"], [self.borrowings[0].id])
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 3)
+
+    def test_bulk_return_ignores_other_users_borrowings(self):
+        other_user = get_user_model().objects.create_user(
+            email="other@example.com", password="otherpass"
+        )
+        other_borrowing = Borrowing.objects.create(
+            user=other_user,
+            book=self.book,
+            expected_return_date=date.today() + timedelta(days=3),
+        )
+
+        res = self.client.post(
+            BULK_RETURN_URL, {"ids": [other_borrowing.id]}, format="json"
+        )
+
+        self.assertEqual(res.data["returned"], [])
+        self.assertEqual(res.data["not_found"], [other_borrowing.id])
+        other_borrowing.refresh_from_db()
+        self.assertIsNone(other_borrowing.actual_return_date)
+
+    def test_bulk_return_requires_ids(self):
+        res = self.client.post(BULK_RETURN_URL, {"ids": []}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        extra = [
+            Borrowing.objects.create(
+                user=self.user,
+                book=self.other_book,
+                expected_return_date=date.today() + timedelta(days=3),
+            )
+            for _ in range(5)
+        ]
+        # Warm the authenticated user cache so both requests start equal.
+        self.client.post(BULK_RETURN_URL, {"ids": []}, format="json")
+
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(
+                BULK_RETURN_URL, {"ids": self.ids(self.borrowings)}, format="json"
+            )
+        with CaptureQueriesContext(connection) as large:
+            self.client.post(BULK_RETURN_URL, {"ids": self.ids(extra)}, format="json")
+
+        self.assertEqual(len(small), len(large))
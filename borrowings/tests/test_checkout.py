@@ -0,0 +1,110 @@
+from datetime import date, timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from books.models import Book
+from books.tests.base import AuthenticatedAPITestCase
+from borrowings.models import Borrowing
+
+CHECKOUT_URL = reverse("borrowings:borrowing-checkout")
+
+
+class BorrowingCheckoutTests(AuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.authenticate_normal_user()
+        self.return_date = (date.today() + timedelta(days=7)).isoformat()
+        self.books = [
+            Book.objects.create(
+                title=f"Cart Book {i}",
+                author="Author",
+                cover="SOFT",
+                inventory=2,
+                daily_fee="1.00",
+            )
+            for i in range(6)
+        ]
+
+    def cart(self, books):
+        return [
+            {"book": book.id, "expected_return_date": self.return_date}
+            for book in books
+        ]
+
+    def test_checkout_creates_all_borrowings(self):
+        res = self.client.post(
+            CHECKOUT_URL, self.cart(self.books[:3] + [self.books[0]]), format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 4)
+        self.assertEqual(
+            [item["book"]["id"] for item in res.data],
+            [self.books[0].id, self.books[1].id, self.books[2].id, self.books[0].id],
+        )
+        self.assertEqual(
+            Borrowing.objects.filter(user=self.get_normal_user()).count(), 4
+        )
+        self.books[0].refresh_from_db()
+        self.books[1].refresh_from_db()
+        self.assertEqual(self.books[0].inventory, 0)
+        self.assertEqual(self.books[1].inventory, 1)
+
+    def test_checkout_is_all_or_nothing(self):
+        self.books[1].inventory = 0
+        self.books[1].save()
+
+        res = self.client.post(CHECKOUT_URL, self.cart(self.books[:3]), format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn("Book is not available", str(res.data[1]))
+        self.assertEqual(res.data[2], {})
+        self.assertFalse(Borrowing.objects.exists())
+        self.books[0].refresh_from_db()
+        self.assertEqual(self.books[0].inventory, 2)
+
+    def test_checkout_rejects_more_copies_than_inventory(self):
+        res = self.client.post(
+            CHECKOUT_URL, self.cart([self.books[0]] * 3), format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Borrowing.objects.exists())
+
+    def test_checkout_reports_unknown_books(self):
+        cart = self.cart(self.books[:1])
+        cart.append({"book": 999999, "expected_return_date": self.return_date})
+
+        res = self.client.post(CHECKOUT_URL, cart, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("object does not exist", str(res.data[1]))
+
+    def test_checkout_rejects_past_return_date(self):
+        cart = self.cart(self.books[:1])
+        cart[0]["expected_return_date"] = (date.today() - timedelta(days=1)).isoformat()
+
+        res = self.client.post(CHECKOUT_URL, cart, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("cannot be in the past", str(res.data[0]))
+
+    def test_checkout_rejects_empty_cart(self):
+        res = self.client.post(CHECKOUT_URL, [], format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_query_count_does_not_grow_with_cart_size(self):
+        # Warm the authenticated user cache so both requests start equal.
+        self.client.post(CHECKOUT_URL, [], format="json")
+
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(CHECKOUT_URL, self.cart(self.books[:2]), format="json")
+        with CaptureQueriesContext(connection) as large:
+            self.client.post(CHECKOUT_URL, self.cart(self.books[2:]), format="json")
+
+        self.assertEqual(len(small), len(large))
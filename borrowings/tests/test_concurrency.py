@@ -0,0 +1,98 @@
+import logging
+import threading
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, OperationalError, connection
+from django.test import TransactionTestCase
+from rest_framework import serializers
+
+from books.models import Book
+from borrowings.models import Borrowing
+from borrowings.serializers import BorrowingCreateSerializer
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+
+class ConcurrentCheckoutTests(TransactionTestCase):
+    threads = 8
+    attempts_per_thread = 10
+    inventory = 25
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="stress@example.com", password="stresspass"
+        )
+        self.book = Book.objects.create(
+            title="Popular Book",
+            author="Author",
+            cover="HARD",
+            inventory=self.inventory,
+            daily_fee="1.00",
+        )
+
+    def checkout(self, results, start):
+        payload = {
+            "book": self.book.id,
+            "expected_return_date": date.today() + timedelta(days=7),
+        }
+        context = {"request": SimpleNamespace(user=self.user)}
+        start.wait()
+        try:
+            for _ in range(self.attempts_per_thread):
+                while True:
+                    serializer = BorrowingCreateSerializer(
+                        data=payload, context=context
+                    )
+                    try:
+                        if serializer.is_valid():
+                            serializer.save()
+                            results.append("ok")
+                        else:
+                            results.append("rejected")
+                        break
+                    except serializers.ValidationError:
+                        results.append("rejected")
+                        break
+                    except OperationalError:
+                        # SQLite reports lock contention instead of waiting.
+                        time.sleep(0.001)
+        finally:
+            connection.close()
+
+    def test_concurrent_checkouts_never_oversell(self):
+        results = []
+        start = threading.Barrier(self.threads)
+        workers = [
+            threading.Thread(target=self.checkout, args=(results, start))
+            for _ in range(self.threads)
+        ]
+
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 0)
+        self.assertEqual(results.count("ok"), self.inventory)
+        self.assertEqual(
+            Borrowing.objects.filter(book=self.book).count(), self.inventory
+        )
+        self.assertEqual(len(results), self.threads * self.attempts_per_thread)
+        logger.info(
+            "%d checkout attempts in %.3fs (%.0f/s)",
+            len(results),
+            elapsed,
+            len(results) / elapsed,
+        )
+
+    def test_inventory_cannot_go_negative(self):
+        with self.assertRaises(IntegrityError):
+            Book.objects.filter(pk=self.book.pk).update(inventory=-1)
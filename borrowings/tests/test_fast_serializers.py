@@ -0,0 +1,53 @@
+from datetime import date, timedelta
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+
+from books.models import Book
+from books.tests.base import AuthenticatedAPITestCase
+from borrowings.models import Borrowing
+from borrowings.serializers import BorrowingReadSerializer
+from library_service.serializers import ValuesSerializer
+
+BORROWINGS_URL = reverse("borrowings:borrowing-list")
+
+
+class BorrowingValuesSerializerTests(AuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.get_normal_user()
+        self.book = Book.objects.create(
+            title="Fast Borrowing Book",
+            author="Author",
+            cover="HARD",
+            inventory=5,
+            daily_fee="2.10",
+        )
+        for days in range(1, 4):
+            Borrowing.objects.create(
+                user=self.user,
+                book=self.book,
+                expected_return_date=date.today() + timedelta(days=days),
+                actual_return_date=date.today() if days % 2 else None,
+            )
+
+    def test_output_is_byte_identical_to_read_serializer(self):
+        serializer = ValuesSerializer.for_serializer(BorrowingReadSerializer)
+        queryset = Borrowing.objects.select_related("book").order_by("id")
+
+        fast = serializer.to_representation(queryset.values(*serializer.paths))
+        regular = BorrowingReadSerializer(queryset, many=True).data
+
+        self.assertEqual(JSONRenderer().render(fast), JSONRenderer().render(regular))
+
+    def test_list_endpoint_is_byte_identical_in_fast_mode(self):
+        self.authenticate_normal_user()
+
+        for query in ["", "?is_active=true", "?page_size=2"]:
+            regular = self.client.get(BORROWINGS_URL + query)
+            with override_settings(FAST_READ_SERIALIZERS=True):
+                fast = self.client.get(BORROWINGS_URL + query)
+
+            self.assertEqual(fast.status_code, 200)
+            self.assertEqual(fast.content, regular.content)
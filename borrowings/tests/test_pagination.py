@@ -0,0 +1,65 @@
+from datetime import date, timedelta
+
+from django.urls import reverse
+from rest_framework import status
+
+from books.models import Book
+from books.tests.base import AuthenticatedAPITestCase
+from borrowings.models import Borrowing
+
+BORROWINGS_URL = reverse("borrowings:borrowing-list")
+
+
+class BorrowingPaginationTests(AuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.get_normal_user()
+        self.book = Book.objects.create(
+            title="Paged Book",
+            author="Author",
+            cover="HARD",
+            inventory=10,
+            daily_fee="1.00",
+        )
+        self.borrowings = [
+            Borrowing.objects.create(
+                user=self.user,
+                book=self.book,
+                expected_return_date=date.today() + timedelta(days=3),
+            )
+            for _ in range(5)
+        ]
+        # Spread borrow dates so the (borrow_date, id) ordering differs from id.
+        for days_ago, borrowing in zip([1, 3, 1, 2, 3], self.borrowings):
+            Borrowing.objects.filter(pk=borrowing.pk).update(
+                borrow_date=date.today() - timedelta(days=days_ago)
+            )
+
+    def test_pages_follow_borrow_date_then_id(self):
+        self.authenticate_normal_user()
+
+        ids = []
+        url = BORROWINGS_URL + "?page_size=2"
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            ids.extend(borrowing["id"] for borrowing in res.data["results"])
+            url = res.data["next"]
+
+        expected = list(
+            Borrowing.objects.order_by("borrow_date", "id").values_list(
+                "id", flat=True
+            )
+        )
+        self.assertEqual(ids, expected)
+
+    def test_filters_apply_to_paginated_list(self):
+        Borrowing.objects.filter(pk=self.borrowings[0].pk).update(
+            actual_return_date=date.today()
+        )
+        self.authenticate_normal_user()
+
+        res = self.client.get(BORROWINGS_URL + "?is_active=true&page_size=10")
+
+        self.assertEqual(len(res.data["results"]), 4)
+        self.assertIsNone(res.data["next"])
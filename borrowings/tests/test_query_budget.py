@@ -0,0 +1,72 @@
+from datetime import date, timedelta
+
+from django.urls import reverse
+
+from books.models import Book
+from books.tests.base import AuthenticatedAPITestCase
+from borrowings.models import Borrowing
+from library_service.tests.base import QueryBudgetAssertionsMixin
+
+BORROWINGS_URL = reverse("borrowings:borrowing-list")
+
+
+class BorrowingQueryBudgetTests(QueryBudgetAssertionsMixin, AuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.authenticate_normal_user()
+        self.user = self.get_normal_user()
+        self.books = [
+            Book.objects.create(
+                title=f"Budget Book {i}",
+                author="Author",
+                cover="SOFT",
+                inventory=5,
+                daily_fee="1.00",
+            )
+            for i in range(5)
+        ]
+        self.borrowings = [
+            Borrowing.objects.create(
+                user=self.user,
+                book=book,
+                expected_return_date=date.today() + timedelta(days=5),
+            )
+            for book in self.books
+        ]
+        self.expected_return_date = str(date.today() + timedelta(days=7))
+
+    def test_reads_stay_within_budget_for_many_rows(self):
+        self.assertWithinQueryBudget("GET", BORROWINGS_URL)
+        self.assertWithinQueryBudget("GET", f"{BORROWINGS_URL}?page_size=3")
+        self.assertWithinQueryBudget(
+            "GET", reverse("borrowings:borrowing-detail", args=[self.borrowings[0].id])
+        )
+
+    def test_writes_stay_within_budget(self):
+        self.assertWithinQueryBudget(
+            "POST",
+            BORROWINGS_URL,
+            {
+                "book": self.books[0].id,
+                "expected_return_date": self.expected_return_date,
+            },
+        )
+        self.assertWithinQueryBudget(
+            "POST",
+            reverse(
+                "borrowings:borrowing-return-borrowing", args=[self.borrowings[0].id]
+            ),
+        )
+        self.assertWithinQueryBudget(
+            "POST",
+            reverse("borrowings:borrowing-checkout"),
+            [
+                {"book": book.id, "expected_return_date": self.expected_return_date}
+                for book in self.books
+            ],
+        )
+        self.assertWithinQueryBudget(
+            "POST",
+            reverse("borrowings:borrowing-bulk-return"),
+            {"ids": [borrowing.id for borrowing in self.borrowings[1:]]},
+        )
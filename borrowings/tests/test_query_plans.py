@@ -0,0 +1,95 @@
+import random
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.urls import reverse
+
+from books.models import Book
+from books.tests.base import AuthenticatedAPITestCase
+from borrowings.models import Borrowing
+from library_service.tests.base import QueryPlanAssertionsMixin
+
+BORROWINGS_URL = reverse("borrowings:borrowing-list")
+User = get_user_model()
+
+
+class BorrowingQueryPlanTests(QueryPlanAssertionsMixin, AuthenticatedAPITestCase):
+    users_count = 50
+    books_count = 40
+    borrowings_count = 5000
+
+    def setUp(self):
+        super().setUp()
+        self.normal_user = self.get_normal_user()
+        self.staff_user = self.get_staff_user()
+        users = [self.normal_user] + User.objects.bulk_create(
+            User(email=f"reader{i}@example.com") for i in range(self.users_count)
+        )
+        books = Book.objects.bulk_create(
+            Book(
+                title=f"Book {i}",
+                author=f"Author {i % 7}",
+                cover="HARD",
+                inventory=5,
+                daily_fee="1.00",
+            )
+            for i in range(self.books_count)
+        )
+
+        rng = random.Random(0)
+        today = date.today()
+        borrowings = []
+        for _ in range(self.borrowings_count):
+            expected = today + timedelta(days=rng.randint(-60, 30))
+            returned = rng.random() < 0.9
+            borrowings.append(
+                Borrowing(
+                    user=rng.choice(users),
+                    book=rng.choice(books),
+                    expected_return_date=expected,
+                    actual_return_date=expected if returned else None,
+                )
+            )
+        Borrowing.objects.bulk_create(borrowings)
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def test_own_borrowings_list_uses_index(self):
+        self.authenticate_normal_user()
+        self.assertRequestUsesIndexes(BORROWINGS_URL, Borrowing)
+
+    def test_own_active_borrowings_list_uses_index(self):
+        self.authenticate_normal_user()
+        self.assertRequestUsesIndexes(BORROWINGS_URL + "?is_active=true", Borrowing)
+
+    def test_own_active_borrowings_page_uses_index(self):
+        self.authenticate_normal_user()
+        self.assertRequestUsesIndexes(
+            BORROWINGS_URL + "?is_active=true&page_size=20", Borrowing
+        )
+
+    def test_staff_filter_by_user_uses_index(self):
+        self.authenticate_staff_user()
+        self.assertRequestUsesIndexes(
+            BORROWINGS_URL + f"?user_id={self.normal_user.id}&is_active=true",
+            Borrowing,
+        )
+        self.assertRequestUsesIndexes(
+            BORROWINGS_URL + f"?user_id={self.normal_user.id}", Borrowing
+        )
+
+    def test_active_borrowings_per_book_use_index(self):
+        book = Book.objects.first()
+        self.assertQuerysetUsesIndex(
+            Borrowing.objects.filter(book=book, actual_return_date__isnull=True)
+        )
+
+    def test_overdue_borrowings_use_index(self):
+        self.assertQuerysetUsesIndex(
+            Borrowing.objects.filter(
+                actual_return_date__isnull=True,
+                expected_return_date__lt=date.today(),
+            )
+        )
@@ -1,9 +1,12 @@
 from datetime import date, timedelta
+from unittest import mock
 
 from django.contrib.auth import get_user_model
+from django.db.models import F
 from django.urls import reverse
 from rest_framework import status
 from borrowings.models import Borrowing
+from borrowings.views import BorrowingViewSet
 from books.models import Book
 
 from books.tests.base import AuthenticatedAPITestCase
@@ -81,3 +84,19 @@ class ReturnBorrowingTest(AuthenticatedAPITestCase):
         res = self.client.post(url)
 
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_return_keeps_concurrent_inventory_changes(self):
+        get_object = BorrowingViewSet.get_object
+
+        def checkout_meanwhile(view):
+            borrowing = get_object(view)
+            # Another request checks out a copy after the book was loaded.
+            Book.objects.filter(pk=self.book.pk).update(inventory=F("inventory") - 1)
+            return borrowing
+
+        with mock.patch.object(BorrowingViewSet, "get_object", checkout_meanwhile):
+            res = self.client.post(return_url(self.borrowing.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 3)
@@ -0,0 +1,67 @@
+from unittest import skipUnless
+
+from django.conf import settings
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from library_service.db import tune_sqlite, write_atomic
+
+TUNED = {**settings.SQLITE_TUNING, "ENABLED": True}
+UNTUNED = {**settings.SQLITE_TUNING, "ENABLED": False}
+
+
+@skipUnless(connection.vendor == "sqlite", "SQLite profile")
+class SQLiteTuningTests(TransactionTestCase):
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def begins(self, queries):
+        return [query["sql"] for query in queries if query["sql"].startswith("BEGIN")]
+
+    @override_settings(SQLITE_TUNING=TUNED)
+    def test_pragmas_are_applied_to_new_connections(self):
+        defaults = {
+            name: self.pragma(name)
+            for name in ("synchronous", "busy_timeout", "temp_store")
+        }
+        try:
+            tune_sqlite(sender=connection.__class__, connection=connection)
+
+            self.assertEqual(self.pragma("synchronous"), 1)  # NORMAL
+            self.assertEqual(self.pragma("busy_timeout"), 5000)
+            self.assertEqual(self.pragma("temp_store"), 2)  # MEMORY
+        finally:
+            with connection.cursor() as cursor:
+                for name, value in defaults.items():
+                    cursor.execute(f"PRAGMA {name} = {value}")
+
+    @override_settings(SQLITE_TUNING=UNTUNED)
+    def test_untuned_connections_are_left_alone(self):
+        synchronous = self.pragma("synchronous")
+
+        tune_sqlite(sender=connection.__class__, connection=connection)
+
+        self.assertEqual(self.pragma("synchronous"), synchronous)
+
+    @override_settings(SQLITE_TUNING=TUNED)
+    def test_write_atomic_begins_immediate_transaction(self):
+        with CaptureQueriesContext(connection) as queries:
+            with write_atomic():
+                with write_atomic():
+                    pass
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+
+        self.assertEqual(self.begins(queries), ["BEGIN IMMEDIATE"])
+        self.assertIsNone(connection.transaction_mode)
+
+    @override_settings(SQLITE_TUNING=UNTUNED)
+    def test_write_atomic_is_plain_atomic_without_profile(self):
+        with CaptureQueriesContext(connection) as queries:
+            with write_atomic():
+                pass
+
+        self.assertEqual(self.begins(queries), ["BEGIN"])
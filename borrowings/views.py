@@ -1,27 +1,60 @@
 from datetime import date
 
-from django.db import transaction
+from django.db.models import F
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
+from books.cache import catalog_changed
+from books.models import Book
 from borrowings.models import Borrowing
-from borrowings.serializers import BorrowingReadSerializer, BorrowingCreateSerializer
+from borrowings.pagination import BorrowingPagination
+from borrowings.serializers import (
+    BorrowingReadSerializer,
+    BorrowingCreateSerializer,
+    BorrowingCheckoutSerializer,
+    BorrowingBulkReturnSerializer,
+    MAX_CHECKOUT_ITEMS,
+)
+from library_service import metrics
+from library_service.db import write_atomic
+from library_service.exports import export_response
+from library_service.mixins import AsyncReadMixin, QueryPlanMixin, ValuesListMixin
+from library_service.timing import ServerTimingMixin
 
 
-class BorrowingViewSet(viewsets.ModelViewSet):
+class BorrowingViewSet(
+    ServerTimingMixin,
+    AsyncReadMixin,
+    ValuesListMixin,
+    QueryPlanMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Borrowing.objects.all()
     permission_classes = [IsAuthenticated]
+    pagination_class = BorrowingPagination
+    query_budget = {
+        "list": 2,
+        "retrieve": 2,
+        "create": 8,
+        "return_borrowing": 8,
+        "checkout": 6,
+        "bulk_return": 6,
+    }
 
     def get_serializer_class(self):
         if self.action == "create":
             return BorrowingCreateSerializer
+        if self.action == "checkout":
+            return BorrowingCheckoutSerializer
+        if self.action == "bulk_return":
+            return BorrowingBulkReturnSerializer
         return BorrowingReadSerializer
 
     def get_queryset(self):
         user = self.request.user
-        queryset = Borrowing.objects.select_related("book", "user")
+        queryset = super().get_queryset()
 
         if not user.is_staff:
             queryset = queryset.filter(user=user)
@@ -40,22 +73,57 @@ class BorrowingViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    @action(detail=False, methods=["post"])
+    def checkout(self, request):
+        serializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=MAX_CHECKOUT_ITEMS,
+        )
+        serializer.is_valid(raise_exception=True)
+        borrowings = serializer.save()
+
+        return Response(
+            BorrowingReadSerializer(borrowings, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(detail=False, methods=["post"], url_path="return")
+    def bulk_return(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = serializer.save(queryset=self.get_queryset())
+
+        return Response(result, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"], permission_classes=[IsAdminUser])
+    def export(self, request):
+        return export_response(request, "borrowings")
+
     @action(detail=True, methods=["post"], url_path="return")
     def return_borrowing(self, request, pk=None):
         borrowing = self.get_object()
 
-        if borrowing.actual_return_date:
+        # Conditional UPDATEs inside the transaction: the book loaded by
+        # get_object() may already be stale, and a second return must not
+        # restock twice.
+        with write_atomic():
+            returned = Borrowing.objects.filter(
+                pk=borrowing.pk, actual_return_date__isnull=True
+            ).update(actual_return_date=date.today())
+            if returned:
+                Book.objects.filter(pk=borrowing.book_id).update(
+                    inventory=F("inventory") + 1
+                )
+                catalog_changed()
+                metrics.borrowings_returned()
+
+        if not returned:
             return Response(
                 {"detail": "This borrowing has already been returned."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-
-        with transaction.atomic():
-            borrowing.actual_return_date = date.today()
-            borrowing.book.inventory += 1
-            borrowing.book.save()
-            borrowing.save()
-
         return Response(
             {"detail": "Book returned successfully."},
             status=status.HTTP_200_OK,
@@ -0,0 +1,48 @@
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+def sqlite_tuned(connection):
+    return connection.vendor == "sqlite" and settings.SQLITE_TUNING["ENABLED"]
+
+
+@receiver(connection_created)
+def tune_sqlite(sender, connection, **kwargs):
+    """Apply the SQLITE_TUNING pragmas to every new SQLite connection."""
+    if not sqlite_tuned(connection):
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in settings.SQLITE_TUNING["PRAGMAS"].items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+
+
+@contextmanager
+def write_atomic(using=None):
+    """
+    ``transaction.atomic()`` for write paths.
+
+    Under the tuned SQLite profile the outermost block starts with
+    ``BEGIN IMMEDIATE``: the write lock is taken up front, so concurrent
+    writers queue on ``busy_timeout`` instead of failing with "database is
+    locked" when a deferred transaction cannot upgrade its read lock.
+    Everywhere else this is a plain ``atomic()``.
+    """
+    connection = transaction.get_connection(using)
+    if not sqlite_tuned(connection) or connection.in_atomic_block:
+        with transaction.atomic(using=using):
+            yield
+        return
+
+    connection.ensure_connection()
+    transaction_mode = connection.transaction_mode
+    connection.transaction_mode = "IMMEDIATE"
+    try:
+        with transaction.atomic(using=using):
+            connection.transaction_mode = transaction_mode
+            yield
+    finally:
+        connection.transaction_mode = transaction_mode
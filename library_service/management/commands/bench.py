@@ -0,0 +1,330 @@
+import json
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+
+from library_service.seeding import SEED_EMAIL_DOMAIN, SEED_PASSWORD, seed_email
+
+DB_QUERIES = re.compile(r'\bdb;[^,]*desc="(\d+) quer')
+PERCENTILES = (50, 95, 99)
+
+
+class ClientTransport:
+    """In-process requests through Django's test client, one per thread."""
+
+    name = "client"
+
+    def __init__(self):
+        self.local = threading.local()
+        # What the test runner allows, so the command also runs from tests.
+        self.settings = override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]
+        )
+
+    def __enter__(self):
+        self.settings.enable()
+
+    def __exit__(self, *exc_info):
+        self.settings.disable()
+
+    def request(self, method, path, body=None, token=None):
+        client = getattr(self.local, "client", None)
+        if client is None:
+            client = self.local.client = Client(raise_request_exception=False)
+        extra = {"HTTP_AUTHORIZE": f"Bearer {token}"} if token else {}
+        response = client.generic(
+            method,
+            path,
+            json.dumps(body) if body is not None else "",
+            content_type="application/json",
+            **extra,
+        )
+        content = b"".join(response) if response.streaming else response.content
+        return response.status_code, response.headers, content
+
+
+class HttpTransport:
+    """Requests against a running server."""
+
+    name = "http"
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def request(self, method, path, body=None, token=None):
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=json.dumps(body).encode() if body is not None else None,
+            method=method,
+            headers={"Content-Type": "application/json"},
+        )
+        if token:
+            request.add_header("Authorize", f"Bearer {token}")
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                return response.status, response.headers, response.read()
+        except urllib.error.HTTPError as exc:
+            return exc.code, exc.headers, exc.read()
+
+
+def percentile(values, percent):
+    """Nearest-rank percentile of sorted ``values``."""
+    rank = max(1, round(percent / 100 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)
+
+    def add(self, name, elapsed, status, headers):
+        match = DB_QUERIES.search(headers.get("Server-Timing", ""))
+        queries = int(match.group(1)) if match else None
+        with self.lock:
+            self.samples[name].append((elapsed, status, queries))
+
+    def summary(self):
+        report = {}
+        for name, samples in self.samples.items():
+            latencies = sorted(elapsed * 1000 for elapsed, _, _ in samples)
+            queries = [count for _, _, count in samples if count is not None]
+            report[name] = {
+                "requests": len(samples),
+                "errors": sum(status >= 400 for _, status, _ in samples),
+                **{
+                    f"p{percent}_ms": round(percentile(latencies, percent), 2)
+                    for percent in PERCENTILES
+                },
+                "mean_ms": round(sum(latencies) / len(latencies), 2),
+                "queries_per_request": (
+                    round(sum(queries) / len(queries), 2) if queries else None
+                ),
+            }
+        return report
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the /api/ endpoints through the test client (or a server at "
+        "--url) at a chosen concurrency and print per-endpoint p50/p95/p99 "
+        "latency, errors and SQL queries per request as JSON. Expects the "
+        "data created by seed_library. Borrowings created are returned again; "
+        "endpoints that create users or import data are not driven."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", help="Base URL of a running server.")
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Requests per endpoint."
+        )
+        parser.add_argument("--email", default=seed_email(0))
+        parser.add_argument("--admin-email", default=f"admin@{SEED_EMAIL_DOMAIN}")
+        parser.add_argument("--password", default=SEED_PASSWORD)
+        parser.add_argument(
+            "--endpoints", nargs="+", help="Only run the named scenarios."
+        )
+        parser.add_argument("--output", help="Also write the report to this file.")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        if options["url"]:
+            self.transport = HttpTransport(options["url"])
+        else:
+            self.transport = ClientTransport()
+        self.recorder = Recorder()
+        self.rng = random.Random(options["seed"])
+        self.credentials = {"email": options["email"], "password": options["password"]}
+
+        with self.transport:
+            self.token = self.login(options["email"], options["password"])
+            self.admin_token = self.login(options["admin_email"], options["password"])
+            self.sample()
+
+            scenarios = self.scenarios()
+            names = options["endpoints"] or list(scenarios)
+            unknown = sorted(set(names) - set(scenarios))
+            if unknown:
+                raise CommandError(f"Unknown endpoints: {', '.join(unknown)}.")
+
+            for name in names:
+                self.run(scenarios[name], options["requests"], options["concurrency"])
+
+        report = json.dumps(
+            {
+                "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "transport": self.transport.name,
+                "concurrency": options["concurrency"],
+                "requests_per_endpoint": options["requests"],
+                "endpoints": self.recorder.summary(),
+            },
+            indent=2,
+        )
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                file.write(report + "\n")
+        self.stdout.write(report)
+
+    def request(self, name, method, path, body=None, token=None):
+        started = time.perf_counter()
+        status, headers, content = self.transport.request(method, path, body, token)
+        self.recorder.add(name, time.perf_counter() - started, status, headers)
+        return status, content
+
+    def login(self, email, password):
+        status, _, content = self.transport.request(
+            "POST", "/api/users/token/", {"email": email, "password": password}
+        )
+        if status != 200:
+            raise CommandError(
+                f"Cannot log in as {email} ({status}), run seed_library first "
+                "or pass the credentials to use."
+            )
+        return json.loads(content)["access"]
+
+    def fetch(self, path, token):
+        status, _, content = self.transport.request("GET", path, token=token)
+        if status != 200:
+            raise CommandError(f"GET {path} returned {status}.")
+        data = json.loads(content)
+        return data["results"] if isinstance(data, dict) else data
+
+    def sample(self):
+        """Pick the ids and search words the scenarios request."""
+        books = self.fetch("/api/books/?page_size=100", None)
+        borrowings = self.fetch("/api/borrowings/?page_size=100", self.token)
+        payments = self.fetch("/api/payments/", self.token)
+        if not (books and borrowings and payments):
+            raise CommandError("Nothing to request, run seed_library first.")
+        self.books = [book["id"] for book in books if book["inventory"] > 0]
+        self.words = [word for book in books for word in book["title"].split()]
+        self.borrowings = [borrowing["id"] for borrowing in borrowings]
+        self.payments = [payment["id"] for payment in payments]
+
+    def scenarios(self):
+        """Scenario name -> callable making one round of requests."""
+        rng = self.rng
+
+        def get(name, path, token=None):
+            return lambda: self.request(name, "GET", path(), token=token)
+
+        return {
+            "books-list": get("books-list", lambda: "/api/books/?page_size=20"),
+            "books-detail": get(
+                "books-detail", lambda: f"/api/books/{rng.choice(self.books)}/"
+            ),
+            "books-search": get(
+                "books-search", lambda: f"/api/books/?search={rng.choice(self.words)}"
+            ),
+            "borrowings-list": get(
+                "borrowings-list", lambda: "/api/borrowings/?page_size=20", self.token
+            ),
+            "borrowings-active": get(
+                "borrowings-active",
+                lambda: "/api/borrowings/?is_active=true",
+                self.token,
+            ),
+            "borrowings-detail": get(
+                "borrowings-detail",
+                lambda: f"/api/borrowings/{rng.choice(self.borrowings)}/",
+                self.token,
+            ),
+            "borrowings-export": get(
+                "borrowings-export", lambda: "/api/borrowings/export/", self.admin_token
+            ),
+            "payments-list": get("payments-list", lambda: "/api/payments/", self.token),
+            "payments-detail": get(
+                "payments-detail",
+                lambda: f"/api/payments/{rng.choice(self.payments)}/",
+                self.token,
+            ),
+            "payments-export": get(
+                "payments-export", lambda: "/api/payments/export/", self.admin_token
+            ),
+            "users-me": get("users-me", lambda: "/api/users/me/", self.token),
+            "users-token": lambda: self.request(
+                "users-token", "POST", "/api/users/token/", self.credentials
+            ),
+            "borrowings-create": self.borrow_and_return,
+            "borrowings-checkout": self.checkout_and_bulk_return,
+        }
+
+    def borrow_and_return(self):
+        """borrowings-create, then borrowings-return for the same borrowing."""
+        status, content = self.request(
+            "borrowings-create",
+            "POST",
+            "/api/borrowings/",
+            {
+                "book": self.rng.choice(self.books),
+                "expected_return_date": str(date.today() + timedelta(days=14)),
+            },
+            self.token,
+        )
+        if status == 201:
+            pk = json.loads(content)["id"]
+            self.request(
+                "borrowings-return",
+                "POST",
+                f"/api/borrowings/{pk}/return/",
+                token=self.token,
+            )
+
+    def checkout_and_bulk_return(self):
+        """borrowings-checkout of three books, then borrowings-bulk-return."""
+        expected = str(date.today() + timedelta(days=14))
+        status, content = self.request(
+            "borrowings-checkout",
+            "POST",
+            "/api/borrowings/checkout/",
+            [
+                {"book": book, "expected_return_date": expected}
+                for book in self.rng.sample(self.books, min(3, len(self.books)))
+            ],
+            self.token,
+        )
+        if status == 201:
+            self.request(
+                "borrowings-bulk-return",
+                "POST",
+                "/api/borrowings/return/",
+                {"ids": [borrowing["id"] for borrowing in json.loads(content)]},
+                self.token,
+            )
+
+    def run(self, scenario, requests, concurrency):
+        if concurrency <= 1:
+            for _ in range(requests):
+                scenario()
+            return
+
+        def worker(count):
+            try:
+                for _ in range(count):
+                    scenario()
+            finally:
+                connection.close()
+
+        shares = [requests // concurrency] * concurrency
+        for index in range(requests % concurrency):
+            shares[index] += 1
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(worker, shares))
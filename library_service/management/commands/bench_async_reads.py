@@ -0,0 +1,194 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from io import BytesIO
+from types import ModuleType
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from django.urls import path
+from rest_framework_simplejwt.tokens import AccessToken
+
+from books.models import Book
+from books.views import BookViewSet
+from borrowings.models import Borrowing
+from borrowings.views import BorrowingViewSet
+from payments.views import PaymentListView
+
+EMAIL = "bench-async-reads@example.com"
+
+VIEWS = {
+    "books": (BookViewSet, {"get": "list"}),
+    "borrowings": (BorrowingViewSet, {"get": "list"}),
+    "payments": (PaymentListView, None),
+}
+
+
+def build_urlconf(view_class, actions, async_read):
+    view_class = type(view_class.__name__, (view_class,), {"async_read": async_read})
+    view = view_class.as_view(actions) if actions else view_class.as_view()
+    urlconf = ModuleType("bench_async_reads_urls")
+    urlconf.urlpatterns = [path("bench/", view)]
+    return urlconf
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare list latency at high concurrency for the sync view under "
+        "WSGI, the sync view under ASGI and the native async view under ASGI. "
+        "Requests are driven in-process against Django's WSGI/ASGI handlers; "
+        "the seeded rows are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--view", choices=sorted(VIEWS), default="borrowings")
+        parser.add_argument("--rows", type=int, default=200)
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--concurrency", type=int, default=100)
+        parser.add_argument(
+            "--query", default="page_size=20", help="Query string for each request."
+        )
+
+    def handle(self, *args, **options):
+        view_class, actions = VIEWS[options["view"]]
+        user, books = self.seed(options["rows"])
+        headers = {
+            "authorize": f"Bearer {AccessToken.for_user(user)}",
+            "host": "localhost",
+        }
+        query = options["query"]
+        try:
+            # Keep the catalog response cache out of the comparison.
+            with override_settings(BOOK_CATALOG_CACHE_TIMEOUT=0):
+                runs = [
+                    ("sync WSGI", False, self.run_wsgi),
+                    ("sync under ASGI", False, self.run_asgi),
+                    ("async under ASGI", True, self.run_asgi),
+                ]
+                for name, async_read, run in runs:
+                    urlconf = build_urlconf(view_class, actions, async_read)
+                    with override_settings(ROOT_URLCONF=urlconf):
+                        result = run(
+                            headers, query, options["requests"], options["concurrency"]
+                        )
+                    self.report(name, *result)
+        finally:
+            Book.objects.filter(pk__in=[book.pk for book in books]).delete()
+            user.delete()
+
+    def seed(self, rows):
+        user = get_user_model().objects.create_user(email=EMAIL)
+        books = Book.objects.bulk_create(
+            Book(
+                title=f"Bench Async Book {i}",
+                author=f"Author {i % 50}",
+                cover=Book.CoverChoices.HARD,
+                inventory=5,
+                daily_fee="1.00",
+            )
+            for i in range(rows)
+        )
+        Borrowing.objects.bulk_create(
+            Borrowing(
+                user=user,
+                book=book,
+                expected_return_date=date.today() + timedelta(days=7),
+            )
+            for book in books
+        )
+        return user, books
+
+    def run_wsgi(self, headers, query, requests, concurrency):
+        handler = WSGIHandler()
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": "/bench/",
+            "QUERY_STRING": query,
+            "SERVER_NAME": "localhost",
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "wsgi.url_scheme": "http",
+        }
+        for name, value in headers.items():
+            environ[f"HTTP_{name.upper()}"] = value
+
+        def call(_):
+            started = time.perf_counter()
+            statuses = []
+            response = handler(
+                {**environ, "wsgi.input": BytesIO()},
+                lambda status, headers: statuses.append(int(status.split()[0])),
+            )
+            b"".join(response)
+            response.close()
+            return time.perf_counter() - started, statuses[0]
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(call, range(requests)))
+        return time.perf_counter() - started, results
+
+    def run_asgi(self, headers, query, requests, concurrency):
+        handler = ASGIHandler()
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/bench/",
+            "raw_path": b"/bench/",
+            "root_path": "",
+            "query_string": query.encode(),
+            "headers": [(k.encode(), v.encode()) for k, v in headers.items()],
+            "client": ("127.0.0.1", 50000),
+            "server": ("localhost", 80),
+        }
+
+        async def call():
+            done = asyncio.Event()
+            messages = iter([{"type": "http.request", "body": b""}])
+            sent = []
+
+            async def receive():
+                message = next(messages, None)
+                if message is not None:
+                    return message
+                await done.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                sent.append(message)
+
+            started = time.perf_counter()
+            await handler(dict(scope), receive, send)
+            done.set()
+            return time.perf_counter() - started, sent[0]["status"]
+
+        async def main():
+            slots = asyncio.Semaphore(concurrency)
+
+            async def limited():
+                async with slots:
+                    return await call()
+
+            return await asyncio.gather(*(limited() for _ in range(requests)))
+
+        started = time.perf_counter()
+        results = asyncio.run(main())
+        return time.perf_counter() - started, results
+
+    def report(self, name, duration, results):
+        latencies = sorted(latency for latency, _ in results)
+        failed = sum(1 for _, code in results if code != 200)
+        p99 = latencies[max(int(len(latencies) * 0.99) - 1, 0)]
+        self.stdout.write(
+            f"{name}: {len(results) / duration:,.0f} req/s, "
+            f"p50 {statistics.median(latencies) * 1000:.1f} ms, "
+            f"p99 {p99 * 1000:.1f} ms, {failed} non-200"
+        )
@@ -0,0 +1,93 @@
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from books.models import Book
+from books.serializers import BookSerializer
+from borrowings.models import Borrowing
+from borrowings.serializers import BorrowingReadSerializer
+from library_service.serializers import ValuesSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare rows/sec of the ModelSerializer read path against the "
+        "ValuesSerializer fast path. Seeded rows are rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=20000)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        rows, repeat = options["rows"], options["repeat"]
+
+        with transaction.atomic():
+            self.seed(rows)
+            cases = [
+                (
+                    "books",
+                    Book.objects.all(),
+                    BookSerializer,
+                ),
+                (
+                    "borrowings",
+                    Borrowing.objects.select_related("book"),
+                    BorrowingReadSerializer,
+                ),
+            ]
+            for name, queryset, serializer_class in cases:
+                self.compare(name, queryset, serializer_class, repeat)
+            transaction.set_rollback(True)
+
+    def seed(self, rows):
+        user = get_user_model().objects.create(email="bench-serializers@example.com")
+        books = Book.objects.bulk_create(
+            Book(
+                title=f"Bench Book {i}",
+                author=f"Author {i % 100}",
+                cover=Book.CoverChoices.HARD if i % 2 else Book.CoverChoices.SOFT,
+                inventory=i % 10,
+                daily_fee=f"{i % 20}.{i % 100:02d}",
+            )
+            for i in range(rows)
+        )
+        today = date.today()
+        Borrowing.objects.bulk_create(
+            Borrowing(
+                user=user,
+                book=book,
+                expected_return_date=today + timedelta(days=i % 30),
+                actual_return_date=today if i % 3 else None,
+            )
+            for i, book in enumerate(books)
+        )
+
+    def compare(self, name, queryset, serializer_class, repeat):
+        values_serializer = ValuesSerializer.for_serializer(serializer_class)
+
+        def model_serializer():
+            return serializer_class(queryset.all(), many=True).data
+
+        def fast_serializer():
+            return values_serializer.to_representation(
+                queryset.values(*values_serializer.paths)
+            )
+
+        baseline = self.measure(model_serializer, repeat)
+        fast = self.measure(fast_serializer, repeat)
+        self.stdout.write(
+            f"{name}: {serializer_class.__name__} {baseline:,.0f} rows/s, "
+            f"ValuesSerializer {fast:,.0f} rows/s ({fast / baseline:.1f}x)"
+        )
+
+    def measure(self, render, repeat):
+        best = 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            count = len(render())
+            best = max(best, count / (time.perf_counter() - started))
+        return best
@@ -0,0 +1,138 @@
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+from django.db.models import F
+from django.test import override_settings
+
+from books.models import Book
+from borrowings.models import Borrowing
+from library_service.db import write_atomic
+
+EMAIL = "bench-sqlite@example.com"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure concurrent borrow/return and list throughput on the SQLite "
+        "database with and without the SQLITE_TUNING profile. The seeded rows "
+        "are deleted and the journal mode restored afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writers", type=int, default=8)
+        parser.add_argument("--readers", type=int, default=8)
+        parser.add_argument("--seconds", type=float, default=10)
+        parser.add_argument("--books", type=int, default=50)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("bench_sqlite needs the SQLite database profile.")
+
+        journal_mode = self.pragma("journal_mode")
+        user = get_user_model().objects.create_user(email=EMAIL)
+        books = Book.objects.bulk_create(
+            Book(
+                title=f"Bench SQLite Book {i}",
+                author="Author",
+                cover=Book.CoverChoices.SOFT,
+                inventory=1_000_000,
+                daily_fee="1.00",
+            )
+            for i in range(options["books"])
+        )
+        try:
+            for name, enabled in [("default", False), ("tuned", True)]:
+                if not enabled:
+                    # WAL sticks to the database file, undo an earlier run.
+                    self.pragma("journal_mode = DELETE")
+                tuning = {**settings.SQLITE_TUNING, "ENABLED": enabled}
+                with override_settings(SQLITE_TUNING=tuning):
+                    self.report(name, options, self.run(user, books, options))
+        finally:
+            Borrowing.objects.filter(user=user).delete()
+            Book.objects.filter(pk__in=[book.pk for book in books]).delete()
+            user.delete()
+            self.pragma(f"journal_mode = {journal_mode}")
+
+    def pragma(self, statement):
+        connection.close()
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {statement}")
+            return cursor.fetchone()[0]
+
+    def run(self, user, books, options):
+        deadline = time.perf_counter() + options["seconds"]
+        counts = Counter()
+        lock = threading.Lock()
+
+        def count(key):
+            with lock:
+                counts[key] += 1
+
+        def writer(index):
+            book = books[index % len(books)]
+            while time.perf_counter() < deadline:
+                try:
+                    with write_atomic():
+                        Book.objects.filter(pk=book.pk, inventory__gt=0).update(
+                            inventory=F("inventory") - 1
+                        )
+                        borrowing = Borrowing.objects.create(
+                            user=user,
+                            book=book,
+                            expected_return_date=date.today() + timedelta(days=7),
+                        )
+                    with write_atomic():
+                        Borrowing.objects.filter(pk=borrowing.pk).update(
+                            actual_return_date=date.today()
+                        )
+                        Book.objects.filter(pk=book.pk).update(
+                            inventory=F("inventory") + 1
+                        )
+                    count("writes")
+                except OperationalError:
+                    count("write errors")
+
+        def reader():
+            while time.perf_counter() < deadline:
+                try:
+                    list(
+                        Borrowing.objects.select_related("book")
+                        .filter(user=user, actual_return_date__isnull=True)
+                        .order_by("-id")[:50]
+                    )
+                    count("reads")
+                except OperationalError:
+                    count("read errors")
+
+        def close_after(target, *args):
+            def run():
+                try:
+                    target(*args)
+                finally:
+                    connection.close()
+
+            return threading.Thread(target=run)
+
+        threads = [close_after(writer, i) for i in range(options["writers"])]
+        threads += [close_after(reader) for _ in range(options["readers"])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return counts
+
+    def report(self, name, options, counts):
+        seconds = options["seconds"]
+        self.stdout.write(
+            f"{name}: {counts['writes'] / seconds:,.0f} borrow+return/s, "
+            f"{counts['reads'] / seconds:,.0f} reads/s, "
+            f"{counts['write errors']} write errors, "
+            f"{counts['read errors']} read errors"
+        )
@@ -0,0 +1,46 @@
+import argparse
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from library_service.exports import EXPORTS, RENDERERS, stream_export
+
+
+def datetime_argument(value):
+    try:
+        parsed = parse_datetime(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise argparse.ArgumentTypeError(f"{value!r} is not a valid datetime.")
+    return parsed
+
+
+class Command(BaseCommand):
+    help = "Stream a table export as NDJSON or CSV, optionally past a watermark."
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", choices=sorted(EXPORTS))
+        parser.add_argument("--output", choices=sorted(RENDERERS), default="ndjson")
+        parser.add_argument("--since-id", type=int)
+        parser.add_argument("--updated-since", type=datetime_argument)
+        parser.add_argument("--file", help="Write to this path instead of stdout.")
+
+    def handle(self, *args, **options):
+        try:
+            chunks = stream_export(
+                options["name"],
+                options["output"],
+                since_id=options["since_id"],
+                updated_since=options["updated_since"],
+            )
+        except ValidationError as exc:
+            raise CommandError(exc.detail)
+
+        if options["file"]:
+            with open(options["file"], "w", newline="", encoding="utf-8") as target:
+                target.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
@@ -0,0 +1,68 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from books.cache import catalog_changed
+from library_service.seeding import (
+    SEED_EMAIL_DOMAIN,
+    SEED_PASSWORD,
+    seed_books,
+    seed_borrowings,
+    seed_payments,
+    seed_users,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the database with synthetic users, books, borrowings and "
+        "payments with skewed, production-like distributions. All seeded "
+        f"accounts use the password {SEED_PASSWORD!r}; the admin is "
+        f"admin@{SEED_EMAIL_DOMAIN}."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--books", type=int, default=10000)
+        parser.add_argument("--borrowings", type=int, default=50000)
+        parser.add_argument(
+            "--days", type=int, default=365, help="History length for borrowings."
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        batch_size = options["batch_size"]
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            users = self.step("users", seed_users, rng, options["users"], batch_size)
+            books = self.step("books", seed_books, rng, options["books"], batch_size)
+            borrowings = self.step(
+                "borrowings",
+                seed_borrowings,
+                rng,
+                users,
+                books,
+                options["borrowings"] if users and books else 0,
+                options["days"],
+                batch_size,
+            )
+            self.step("payments", seed_payments, rng, borrowings, batch_size)
+            catalog_changed()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded the library in {time.perf_counter() - started:.1f}s"
+            )
+        )
+
+    def step(self, name, seed, *args):
+        started = time.perf_counter()
+        result = seed(*args)
+        count = result if isinstance(result, int) else len(result)
+        self.stdout.write(f"{name}: {count} in {time.perf_counter() - started:.1f}s")
+        return result
@@ -0,0 +1,152 @@
+import hmac
+import os
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+from borrowings.models import Borrowing
+from library_service.timing import current_timings
+from payments.models import Payment
+
+# Samples are aggregated in-process. Under several worker processes, point
+# PROMETHEUS_MULTIPROC_DIR at an empty shared directory before the workers
+# start: each process then writes its samples to its own mmap file there and
+# whichever worker answers /metrics merges them.
+
+METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+REQUESTS = Counter(
+    "http_requests",
+    "HTTP requests by route, method and status.",
+    ["route", "method", "status"],
+)
+LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route.",
+    ["route", "method"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL queries per request by route.",
+    ["route", "method"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+BORROWINGS_CREATED = Counter("library_borrowings_created", "Borrowings created.")
+BORROWINGS_RETURNED = Counter("library_borrowings_returned", "Borrowings returned.")
+
+
+def borrowings_created(count=1):
+    transaction.on_commit(lambda: BORROWINGS_CREATED.inc(count))
+
+
+def borrowings_returned(count=1):
+    transaction.on_commit(lambda: BORROWINGS_RETURNED.inc(count))
+
+
+class LibraryCollector:
+    """Gauges that describe current state, read from the database per scrape."""
+
+    def collect(self):
+        active = GaugeMetricFamily(
+            "library_active_borrowings", "Borrowings not returned yet."
+        )
+        active.add_metric(
+            [], Borrowing.objects.filter(actual_return_date__isnull=True).count()
+        )
+        yield active
+
+        payments = GaugeMetricFamily(
+            "library_payments", "Payments by status.", labels=["status"]
+        )
+        counts = dict(
+            Payment.objects.order_by().values_list("status").annotate(count=Count("id"))
+        )
+        for status in Payment.Status.values:
+            payments.add_metric([status], counts.get(status, 0))
+        yield payments
+
+
+STATE_REGISTRY = CollectorRegistry(auto_describe=False)
+STATE_REGISTRY.register(LibraryCollector())
+
+
+def can_scrape(request):
+    if request.user.is_staff:
+        return True
+    token = settings.METRICS["TOKEN"]
+    scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+    return bool(
+        token
+        and scheme.lower() == "bearer"
+        and hmac.compare_digest(credentials.encode(), token.encode())
+    )
+
+
+def metrics_view(request):
+    if not can_scrape(request):
+        return HttpResponseForbidden()
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    output = generate_latest(registry) + generate_latest(STATE_REGISTRY)
+    return HttpResponse(output, content_type=CONTENT_TYPE_LATEST)
+
+
+class MetricsMiddleware:
+    """
+    Count requests and observe latency and SQL queries per resolved route
+    (the URL name, e.g. ``book:book-list``). Place it after
+    ServerTimingMiddleware, whose counters provide the query count.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        self.observe(request, response, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self.observe(request, response, time.perf_counter() - started)
+        return response
+
+    def observe(self, request, response, duration):
+        match = request.resolver_match
+        route = match.view_name if match is not None else "unmatched"
+        if route == "metrics":
+            return
+        method = request.method if request.method in METHODS else "other"
+
+        REQUESTS.labels(route, method, str(response.status_code)).inc()
+        LATENCY.labels(route, method).observe(duration)
+        timings = current_timings.get()
+        if timings is not None:
+            DB_QUERIES.labels(route, method).observe(timings.queries)
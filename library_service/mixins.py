@@ -0,0 +1,231 @@
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import Http404, HttpResponse
+from rest_framework import exceptions
+from rest_framework.mixins import ListModelMixin
+from rest_framework.response import Response
+
+from library_service.serializers import QueryPlan, ValuesSerializer
+from library_service.timing import span
+
+READ_ITERATOR_CHUNK_SIZE = 500
+
+
+class QueryPlanMixin:
+    """
+    Apply the QueryPlan of the view's serializer class to ``get_queryset()``,
+    so nested serializers never load their relations row by row.
+    """
+
+    def get_queryset(self):
+        plan = QueryPlan.for_serializer(self.get_serializer_class())
+        return plan.apply(super().get_queryset())
+
+
+class ValuesListMixin:
+    """
+    Optional high-throughput list(): when ``settings.FAST_READ_SERIALIZERS``
+    is on, rows are fetched with ``.values()`` and rendered by a
+    ValuesSerializer compiled from the view's serializer class.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if not settings.FAST_READ_SERIALIZERS:
+            return super().list(request, *args, **kwargs)
+
+        serializer = ValuesSerializer.for_serializer(self.get_serializer_class())
+        queryset = self.filter_queryset(self.get_queryset()).values(*serializer.paths)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.to_representation(page))
+
+        return Response(serializer.to_representation(queryset))
+
+
+class AsyncReadMixin:
+    """
+    Serve GET list/retrieve from a native coroutine instead of the sync view.
+
+    Enabled per view with ``async_read = True`` or by listing the view's
+    dotted path in ``settings.ASYNC_READ_VIEWS`` (read once, when the URLconf
+    is loaded). Other methods and actions still run the regular DRF view
+    through ``sync_to_async``.
+
+    The async path authenticates with an authenticator's ``aauthenticate()``
+    when it has one, checks permissions with ``ahas_permission()`` /
+    ``ahas_object_permission()`` when defined and inline otherwise (the
+    built-in permissions only read ``request.user``), and fetches rows with
+    ``.values()`` through the async ORM, rendered by a ValuesSerializer.
+    Object permissions therefore receive the ``.values()`` row, not a model.
+    """
+
+    async_read = False
+
+    @classmethod
+    def async_read_enabled(cls):
+        path = f"{cls.__module__}.{cls.__qualname__}"
+        return cls.async_read or path in settings.ASYNC_READ_VIEWS
+
+    @classmethod
+    def as_view(cls, *args, **initkwargs):
+        view = super().as_view(*args, **initkwargs)
+        if cls.async_read_enabled():
+            markcoroutinefunction(view)
+        return view
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.async_read_enabled():
+            return super().dispatch(request, *args, **kwargs)
+        return self.adispatch(request, *args, **kwargs)
+
+    def get_read_action(self, request):
+        if request.method != "GET":
+            return None
+        if hasattr(self, "action_map"):
+            return self.action_map.get("get")
+        return "list" if isinstance(self, ListModelMixin) else "retrieve"
+
+    async def adispatch(self, request, *args, **kwargs):
+        action = self.get_read_action(request)
+        if action not in ("list", "retrieve"):
+            dispatch = super(AsyncReadMixin, self).dispatch
+            return await sync_to_async(dispatch)(request, *args, **kwargs)
+
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            handler = getattr(self, f"a{action}")
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.render_response(self.response)
+
+    def render_response(self, response):
+        """
+        Render here, in the event loop, and hand Django a plain HttpResponse.
+        An unrendered Response would be rendered through ``sync_to_async``,
+        queueing every request behind the single thread-sensitive worker.
+        """
+        if not hasattr(response, "render"):
+            return response
+        with span("render"):
+            response.render()
+        rendered = HttpResponse(response.content, status=response.status_code)
+        for header, value in response.items():
+            rendered[header] = value
+        return rendered
+
+    async def ainitial(self, request, *args, **kwargs):
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+
+        neg = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+
+        version, scheme = self.determine_version(request, *args, **kwargs)
+        request.version, request.versioning_scheme = version, scheme
+
+        await self.aperform_authentication(request)
+        await self.acheck_permissions(request)
+        if self.get_throttles():
+            await sync_to_async(self.check_throttles)(request)
+
+    async def aperform_authentication(self, request):
+        """Request._authenticate() for async authenticators."""
+        for authenticator in request.authenticators:
+            try:
+                if hasattr(authenticator, "aauthenticate"):
+                    user_auth = await authenticator.aauthenticate(request)
+                else:
+                    user_auth = await sync_to_async(authenticator.authenticate)(request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+
+            if user_auth is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth
+                return
+
+        request._not_authenticated()
+
+    async def acheck_permissions(self, request):
+        for permission in self.get_permissions():
+            if hasattr(permission, "ahas_permission"):
+                allowed = await permission.ahas_permission(request, self)
+            else:
+                allowed = permission.has_permission(request, self)
+            if not allowed:
+                self.permission_denied(
+                    request,
+                    message=getattr(permission, "message", None),
+                    code=getattr(permission, "code", None),
+                )
+
+    async def acheck_object_permissions(self, request, obj):
+        for permission in self.get_permissions():
+            if hasattr(permission, "ahas_object_permission"):
+                allowed = await permission.ahas_object_permission(request, self, obj)
+            else:
+                allowed = permission.has_object_permission(request, self, obj)
+            if not allowed:
+                self.permission_denied(
+                    request,
+                    message=getattr(permission, "message", None),
+                    code=getattr(permission, "code", None),
+                )
+
+    async def afilter_queryset(self, queryset):
+        for backend in list(self.filter_backends):
+            backend = backend()
+            if hasattr(backend, "afilter_queryset"):
+                queryset = await backend.afilter_queryset(self.request, queryset, self)
+            else:
+                queryset = await sync_to_async(backend.filter_queryset)(
+                    self.request, queryset, self
+                )
+        return queryset
+
+    def get_values_serializer(self):
+        return ValuesSerializer.for_serializer(self.get_serializer_class())
+
+    async def alist(self, request, *args, **kwargs):
+        serializer = self.get_values_serializer()
+        queryset = await self.afilter_queryset(self.get_queryset())
+        queryset = queryset.values(*serializer.paths)
+
+        paginator = self.paginator
+        if paginator is not None:
+            if hasattr(paginator, "apaginate_queryset"):
+                page = await paginator.apaginate_queryset(queryset, request, view=self)
+            else:
+                page = await sync_to_async(self.paginate_queryset)(queryset)
+            if page is not None:
+                return self.get_paginated_response(serializer.to_representation(page))
+
+        rows = [
+            row async for row in queryset.aiterator(chunk_size=READ_ITERATOR_CHUNK_SIZE)
+        ]
+        return Response(serializer.to_representation(rows))
+
+    async def aretrieve(self, request, *args, **kwargs):
+        serializer = self.get_values_serializer()
+        queryset = await self.afilter_queryset(self.get_queryset())
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        filter_kwargs = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        try:
+            row = await queryset.values(*serializer.paths).aget(**filter_kwargs)
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+
+        await self.acheck_object_permissions(request, row)
+        return Response(serializer.to_representation([row])[0])
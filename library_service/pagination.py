@@ -0,0 +1,179 @@
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opt-in keyset pagination over a stable, unique ordering.
+
+    Pagination kicks in only when the client sends ``page_size`` or
+    ``cursor``, so plain list calls keep returning a bare list. Pages are
+    fetched with ``WHERE (a, b) > (last_a, last_b) ORDER BY a, b LIMIT n``:
+    no OFFSET and no COUNT(*), so deep pages cost the same as the first one.
+
+    ``ordering`` fields may be descending (``"-a"``). A filter backend of the
+    view with ``get_keyset_ordering()`` can replace it per request, as DRF's
+    CursorPagination does with OrderingFilter.
+    """
+
+    ordering = ("id",)
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Invalid cursor"
+
+    @property
+    def page_size(self):
+        return settings.KEYSET_PAGINATION["PAGE_SIZE"]
+
+    @property
+    def max_page_size(self):
+        return settings.KEYSET_PAGINATION["MAX_PAGE_SIZE"]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset() for async views, fetching with the async ORM."""
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page([row async for row in queryset])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if (
+            self.cursor_query_param not in params
+            and self.page_size_query_param not in params
+        ):
+            return None
+
+        self.request = request
+        self.ordering = self.get_ordering(request, view)
+        self.limit = self.get_page_size(request)
+        position = self.decode_cursor(request, queryset.model)
+
+        queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(position))
+        return queryset[: self.limit + 1]
+
+    def set_page(self, results):
+        self.has_next = len(results) > self.limit
+        self.page = results[: self.limit]
+        return self.page
+
+    def get_ordering(self, request, view):
+        for backend in getattr(view, "filter_backends", ()):
+            if hasattr(backend, "get_keyset_ordering"):
+                ordering = backend().get_keyset_ordering(request, view)
+                if ordering:
+                    return ordering
+        return self.ordering
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_position_filter(self, position):
+        """
+        Expand ``(f1, f2, ...) > (v1, v2, ...)`` into
+        ``f1 > v1 OR (f1 = v1 AND f2 > v2) OR ...``, which every backend
+        can serve from a composite index on the ordering fields. Descending
+        fields compare with ``<``.
+        """
+        fields = self.get_fields()
+        condition = Q()
+        for index, field in enumerate(fields):
+            lookup = "lt" if self.ordering[index].startswith("-") else "gt"
+            step = Q(**{f"{field}__{lookup}": position[index]})
+            for previous, value in zip(fields[:index], position):
+                step &= Q(**{previous: value})
+            condition |= step
+        return condition
+
+    def get_fields(self):
+        return [field.removeprefix("-") for field in self.ordering]
+
+    def get_position(self, item):
+        if isinstance(item, dict):
+            return [item[field] for field in self.get_fields()]
+        return [getattr(item, field) for field in self.get_fields()]
+
+    def decode_cursor(self, request, model):
+        """
+        The position stored in the cursor, each value cleaned by its model
+        field. A cursor that does not decode, was made for another ordering
+        or holds values the fields reject is a 404, never a failing query.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            payload = json.loads(b64decode(encoded.encode("ascii")).decode("utf-8"))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(payload, dict) or payload.get("ordering") != list(
+            self.ordering
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        position = payload.get("position")
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            return [
+                self.clean_position_value(model, field, value)
+                for field, value in zip(self.get_fields(), position)
+            ]
+        except (ValidationError, TypeError, ValueError, ArithmeticError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def clean_position_value(self, model, field, value):
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            raise ValueError(value)
+        return model._meta.get_field(field).to_python(value)
+
+    def encode_cursor(self, position):
+        payload = {"ordering": list(self.ordering), "position": position}
+        payload = json.dumps(payload, cls=DjangoJSONEncoder).encode("utf-8")
+        return b64encode(payload).decode("ascii")
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.page_size_query_param, self.limit)
+        cursor = self.encode_cursor(self.get_position(self.page[-1]))
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict([("next", self.get_next_link()), ("results", data)])
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
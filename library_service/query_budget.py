@@ -0,0 +1,96 @@
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from library_service.timing import RequestTimings, current_timings
+
+logger = logging.getLogger("library_service.query_budget")
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def get_query_budget(view, method):
+    """
+    The maximum number of SQL queries declared for ``method`` requests to
+    the view function ``view`` (as resolved from the URLconf), or None.
+
+    Views declare ``query_budget`` either as one number or as a dict keyed
+    by viewset action, or by lowercase HTTP method for plain API views.
+    Budgets count every query of the request, including the user lookup on
+    an authentication cache miss.
+    """
+    budget = getattr(getattr(view, "cls", None), "query_budget", None)
+    if not isinstance(budget, dict):
+        return budget
+    method = method.lower()
+    actions = getattr(view, "actions", None)
+    return budget.get(actions.get(method) if actions else method)
+
+
+class QueryBudgetMiddleware:
+    """
+    Debug check of each view's declared ``query_budget``: requests that run
+    more queries are logged on ``library_service.query_budget``, or fail
+    with QueryBudgetExceeded when ``settings.QUERY_BUDGET["RAISE"]`` is on.
+
+    Queries are counted by the same execute wrapper as Server-Timing, so
+    those made while a streaming response is consumed are not included.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.QUERY_BUDGET["ENABLED"]:
+            return self.get_response(request)
+        timings, token = self.start()
+        queries = timings.queries
+        try:
+            response = self.get_response(request)
+        finally:
+            if token is not None:
+                current_timings.reset(token)
+        return self.check(request, response, timings.queries - queries)
+
+    async def __acall__(self, request):
+        if not settings.QUERY_BUDGET["ENABLED"]:
+            return await self.get_response(request)
+        timings, token = self.start()
+        queries = timings.queries
+        try:
+            response = await self.get_response(request)
+        finally:
+            if token is not None:
+                current_timings.reset(token)
+        return self.check(request, response, timings.queries - queries)
+
+    def start(self):
+        timings = current_timings.get()
+        if timings is not None:
+            return timings, None  # Shared with ServerTimingMiddleware.
+        timings = RequestTimings()
+        return timings, current_timings.set(timings)
+
+    def check(self, request, response, queries):
+        match = request.resolver_match
+        budget = match and get_query_budget(match.func, request.method)
+        if budget is None or queries <= budget:
+            return response
+        message = (
+            f"{request.method} {request.path} ({match.view_name}) ran "
+            f"{queries} queries, over its budget of {budget}."
+        )
+        if settings.QUERY_BUDGET["RAISE"]:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+        return response
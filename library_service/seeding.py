@@ -0,0 +1,243 @@
+"""Synthetic catalog data for benchmarks and load tests."""
+
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+
+from books.models import Book
+from borrowings.models import Borrowing
+from library_service.db import write_atomic
+from payments.balances import add_delta, apply_deltas, new_deltas
+from payments.models import Payment
+
+TITLE_WORDS = (
+    "ancient autumn beyond bitter blue broken burning city clockwork cold "
+    "crimson dark dawn desert distant dream echo empire endless evening fallen "
+    "field fire forest forgotten garden ghost glass golden green harbor hidden "
+    "hollow house hunger iron island journey king kingdom last light lost "
+    "machine memory midnight mirror moon mountain night north ocean orchard "
+    "other paper quiet rain red river road salt sea secret shadow silent "
+    "silver sky small snow song spring star stone storm summer sun tale "
+    "thousand tide time tower town valley voice war water whisper white wild "
+    "wind winter wolf world year"
+).split()
+
+SYLLABLES = (
+    "ka lo mi ren sa tor vel an bri cor da el fen gar hal ith jor kel lun "
+    "mar nor ol pel quin ros sil tam ul var wen yor zel"
+).split()
+
+# Invented words widen the vocabulary so term selectivity looks like a real
+# catalog instead of every title sharing the same hundred words.
+VOCABULARY = TITLE_WORDS + [a + b for a in SYLLABLES for b in SYLLABLES if a != b]
+
+FIRST_NAMES = (
+    "Ada Alan Alice Anna Boris Carla Chen David Elena Emma Farah Grace Hana "
+    "Ivan Jonas Julia Kenji Lara Leo Maria Mateo Nadia Noah Olga Omar Paula "
+    "Priya Rosa Sam Sofia Tomas Uma Victor Wei Yara Zoe"
+).split()
+
+LAST_NAMES = (
+    "Adams Baker Brown Castillo Dubois Ekström Fischer Garcia Haddad Ivanova "
+    "Jensen Kim Kowalski Larsen Lopez Mendes Moreau Nakamura Novak Okafor "
+    "Petrov Quinn Rossi Schmidt Silva Tanaka Varga Walker Weber Yilmaz Zhang"
+).split()
+
+
+def fake_title(rng):
+    words = rng.sample(VOCABULARY, rng.randint(2, 5))
+    return " ".join(words).capitalize()
+
+
+def fake_author(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+SEED_EMAIL_DOMAIN = "library.test"
+SEED_PASSWORD = "seed-password"
+
+
+def seed_email(index):
+    return f"reader{index}@{SEED_EMAIL_DOMAIN}"
+
+
+def zipf_choices(rng, population, count, exponent=1.0):
+    """Draw ``count`` items, the n-th item weighted 1 / n ** exponent."""
+    cum_weights, total = [], 0.0
+    for rank in range(1, len(population) + 1):
+        total += 1 / rank**exponent
+        cum_weights.append(total)
+    return rng.choices(population, cum_weights=cum_weights, k=count)
+
+
+def seed_users(rng, count, batch_size):
+    """
+    Create ``count`` readers plus one admin, all sharing SEED_PASSWORD. The
+    password is hashed once: hashing per user would dominate the run time.
+    Existing seed accounts are kept, so re-seeding adds to the same users.
+    """
+    User = get_user_model()
+    password = make_password(SEED_PASSWORD)
+    users = [
+        User(
+            email=f"admin@{SEED_EMAIL_DOMAIN}",
+            password=password,
+            is_staff=True,
+            first_name="Seed",
+            last_name="Admin",
+        )
+    ]
+    users += [
+        User(
+            email=seed_email(index),
+            password=password,
+            first_name=rng.choice(FIRST_NAMES),
+            last_name=rng.choice(LAST_NAMES),
+        )
+        for index in range(count)
+    ]
+    User.objects.bulk_create(users, batch_size=batch_size, ignore_conflicts=True)
+    return list(
+        User.objects.filter(
+            email__in=[seed_email(index) for index in range(count)]
+        ).values_list("id", flat=True)
+    )
+
+
+def seed_books(rng, count, batch_size):
+    """Books by a few hundred authors, prolific ones writing most titles."""
+    authors = [fake_author(rng) for _ in range(max(count // 20, 1))]
+    books = Book.objects.bulk_create(
+        (
+            Book(
+                title=fake_title(rng),
+                author=author,
+                cover=rng.choice(Book.CoverChoices.values),
+                inventory=min(int(rng.expovariate(1 / 4)), 50),
+                daily_fee=Decimal(rng.randint(25, 500)) / 100,
+            )
+            for author in zipf_choices(rng, authors, count, exponent=0.8)
+        ),
+        batch_size=batch_size,
+    )
+    return [(book.pk, book.daily_fee) for book in books]
+
+
+def seed_borrowings(rng, users, books, count, days, batch_size, today=None):
+    """
+    Spread ``count`` borrowings over the last ``days`` days. A few books and
+    readers account for most loans; loans run one to four weeks, most are
+    returned on time, about one in five late, and recent ones are active.
+
+    ``borrow_date`` is ``auto_now_add``, so rows are inserted per date and
+    the date is then set with one UPDATE per date.
+    """
+    today = today or date.today()
+    picks = zip(
+        zipf_choices(rng, users, count, exponent=0.7),
+        zipf_choices(rng, books, count, exponent=1.0),
+    )
+    by_date = defaultdict(list)
+    for user_id, (book_id, daily_fee) in picks:
+        by_date[today - timedelta(days=rng.randrange(days))].append(
+            (user_id, book_id, daily_fee)
+        )
+
+    seeded = []
+    for borrow_date, loans in sorted(by_date.items()):
+        rows = []
+        for user_id, book_id, daily_fee in loans:
+            expected = borrow_date + timedelta(days=rng.choice((7, 14, 21, 28)))
+            late = rng.random() < 0.2
+            actual = expected + timedelta(
+                days=rng.randint(1, 14) if late else -rng.randint(0, 5)
+            )
+            actual = max(actual, borrow_date)
+            if actual > today or rng.random() < 0.03:
+                actual = None
+            rows.append(
+                (
+                    Borrowing(
+                        user_id=user_id,
+                        book_id=book_id,
+                        expected_return_date=expected,
+                        actual_return_date=actual,
+                    ),
+                    daily_fee,
+                )
+            )
+        created = Borrowing.objects.bulk_create(
+            [borrowing for borrowing, _ in rows], batch_size=batch_size
+        )
+        Borrowing.objects.filter(pk__in=[b.pk for b in created]).update(
+            borrow_date=borrow_date
+        )
+        for borrowing, daily_fee in rows:
+            borrowing.borrow_date = borrow_date
+            seeded.append((borrowing, daily_fee))
+    return seeded
+
+
+def seed_payments(rng, borrowings, batch_size):
+    """
+    A rental payment per borrowing (paid once returned, mostly pending while
+    active) and a fine for every late return, mostly paid. The owners'
+    balances are moved by the seeded totals in the same transaction.
+    """
+    payments = []
+    for borrowing, daily_fee in borrowings:
+        end = borrowing.actual_return_date or borrowing.expected_return_date
+        days = max(
+            (min(end, borrowing.expected_return_date) - borrowing.borrow_date).days, 1
+        )
+        returned = borrowing.actual_return_date is not None
+        payments.append(
+            Payment(
+                status=(
+                    Payment.Status.PAID
+                    if returned or rng.random() < 0.3
+                    else Payment.Status.PENDING
+                ),
+                type=Payment.Type.PAYMENT,
+                borrowing_id=borrowing.pk,
+                session_url=f"https://checkout.{SEED_EMAIL_DOMAIN}/{borrowing.pk}",
+                session_id=f"seed_cs_{borrowing.pk}",
+                money_to_pay=daily_fee * days,
+            )
+        )
+        if returned and borrowing.actual_return_date > borrowing.expected_return_date:
+            overdue = (
+                borrowing.actual_return_date - borrowing.expected_return_date
+            ).days
+            payments.append(
+                Payment(
+                    status=(
+                        Payment.Status.PAID
+                        if rng.random() < 0.8
+                        else Payment.Status.PENDING
+                    ),
+                    type=Payment.Type.FINE,
+                    borrowing_id=borrowing.pk,
+                    session_url=f"https://checkout.{SEED_EMAIL_DOMAIN}/{borrowing.pk}/fine",
+                    session_id=f"seed_cs_{borrowing.pk}_fine",
+                    money_to_pay=daily_fee * overdue * settings.FINE_MULTIPLIER,
+                )
+            )
+    owners = {borrowing.pk: borrowing.user_id for borrowing, _ in borrowings}
+    deltas = new_deltas()
+    for payment in payments:
+        add_delta(
+            deltas,
+            owners[payment.borrowing_id],
+            payment.status,
+            payment.type,
+            payment.money_to_pay,
+        )
+    with write_atomic():
+        Payment.objects.bulk_create(payments, batch_size=batch_size)
+        apply_deltas(deltas)
+    return len(payments)
@@ -0,0 +1,148 @@
+from functools import lru_cache
+
+from rest_framework import serializers
+
+from library_service.timing import span
+
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+class ValuesSerializer:
+    """
+    Render ``.values()`` rows exactly like ``serializer_class`` renders model
+    instances, without instantiating serializers or fields per row.
+
+    Field converters are taken from the serializer once: values the database
+    already returns in their final form are copied as is, everything else
+    (decimals, dates) goes through the field's own ``to_representation``.
+    Nested serializers are flattened into ``related__field`` lookups.
+    """
+
+    def __init__(self, serializer_class):
+        self.paths = []
+        self.fields = self.compile(serializer_class(), prefix="")
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def for_serializer(cls, serializer_class):
+        return cls(serializer_class)
+
+    def compile(self, serializer, prefix):
+        compiled = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            path = prefix + field.source.replace(".", "__")
+            if isinstance(field, serializers.ListSerializer):
+                raise TypeError(f"Nested many=True field {name!r} is not supported.")
+            if isinstance(field, serializers.BaseSerializer):
+                self.paths.append(path)
+                compiled.append((name, path, self.compile(field, path + "__")))
+                continue
+            self.paths.append(path)
+            if isinstance(field, PASSTHROUGH_FIELDS):
+                compiled.append((name, path, None))
+            else:
+                compiled.append((name, path, field.to_representation))
+        return compiled
+
+    def to_representation(self, rows):
+        fields = self.fields
+        with span("serialize"):
+            return [self.render(fields, row) for row in rows]
+
+    def render(self, fields, row):
+        data = {}
+        for name, path, converter in fields:
+            value = row[path]
+            if value is None:
+                data[name] = None
+            elif converter is None:
+                data[name] = value
+            elif isinstance(converter, list):
+                data[name] = self.render(converter, row)
+            else:
+                data[name] = converter(value)
+        return data
+
+
+class QueryPlan:
+    """
+    The ``select_related()`` / ``prefetch_related()`` lookups needed to
+    render ``serializer_class`` from a queryset without a query per row.
+
+    Derived from the serializer's field tree once per class: relations that
+    are rendered (nested serializers, non-pk related fields) or traversed by
+    a dotted ``source`` are joined with ``select_related`` while they are
+    forward foreign keys, and prefetched from the first to-many relation on.
+    """
+
+    def __init__(self, serializer_class):
+        self.select_related = []
+        self.prefetch_related = []
+        serializer = serializer_class()
+        model = getattr(getattr(serializer, "Meta", None), "model", None)
+        if model is not None:
+            self.compile(serializer, model, prefix="", many=False)
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def for_serializer(cls, serializer_class):
+        return cls(serializer_class)
+
+    def apply(self, queryset):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset
+
+    def compile(self, serializer, model, prefix, many):
+        for field in serializer.fields.values():
+            if field.write_only or field.source == "*":
+                continue
+            if isinstance(field, serializers.ListSerializer):
+                field = field.child
+
+            path, related_model, to_many = prefix, model, many
+            parts = field.source.split(".")
+            for index, attname in enumerate(parts):
+                model_field = self.get_field(related_model, attname)
+                if model_field is None or not model_field.is_relation:
+                    break  # A column, property or method: nothing to load.
+                if index == len(parts) - 1 and not self.renders(field):
+                    break
+                to_many = to_many or model_field.many_to_many or model_field.one_to_many
+                path += attname
+                lookups = self.prefetch_related if to_many else self.select_related
+                if path not in lookups:
+                    lookups.append(path)
+                related_model = model_field.related_model
+                path += "__"
+            else:
+                if isinstance(field, serializers.BaseSerializer):
+                    self.compile(field, related_model, path, to_many)
+
+    def get_field(self, model, attname):
+        """The model field behind attribute ``attname``, reverse ones included."""
+        for model_field in model._meta.get_fields():
+            if model_field.auto_created and not model_field.concrete:
+                if model_field.get_accessor_name() == attname:
+                    return model_field
+            elif model_field.name == attname:
+                return model_field
+        return None
+
+    def renders(self, field):
+        """Whether ``field`` reads the related object, not just its key."""
+        if isinstance(field, serializers.ManyRelatedField):
+            return True
+        if isinstance(field, serializers.RelatedField):
+            return not field.use_pk_only_optimization()
+        return True
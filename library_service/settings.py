@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -41,6 +42,7 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "rest_framework",
     "rest_framework_simplejwt",
+    "library_service",
     "books",
     "users",
     "borrowings",
@@ -48,6 +50,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "library_service.timing.ServerTimingMiddleware",
+    "library_service.metrics.MetricsMiddleware",
+    "library_service.query_budget.QueryBudgetMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -80,10 +85,78 @@ WSGI_APPLICATION = "library_service.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
+# DATABASE_ENGINE picks the profile: "sqlite" (default, local development)
+# or "postgres". The PostgreSQL profile either keeps a psycopg connection
+# pool per process (POSTGRES_POOL=1, the default) or persistent connections
+# with health checks (POSTGRES_POOL=0). Django does not allow both at once.
+# A pool holds up to POSTGRES_POOL_MAX_SIZE connections per worker process,
+# so size it against max_connections / number of workers.
+
+DATABASE_ENGINE = os.environ.get("DATABASE_ENGINE", "sqlite")
+
+if DATABASE_ENGINE == "postgres":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("POSTGRES_DB", "library"),
+            "USER": os.environ.get("POSTGRES_USER", "library"),
+            "PASSWORD": os.environ.get("POSTGRES_PASSWORD", "library"),
+            "HOST": os.environ.get("POSTGRES_HOST", "localhost"),
+            "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+        }
+    }
+    if os.environ.get("POSTGRES_POOL", "1").lower() in ("1", "true", "yes"):
+        from psycopg_pool import ConnectionPool
+
+        DATABASES["default"]["OPTIONS"] = {
+            "pool": {
+                "min_size": int(os.environ.get("POSTGRES_POOL_MIN_SIZE", 2)),
+                "max_size": int(os.environ.get("POSTGRES_POOL_MAX_SIZE", 10)),
+                "timeout": int(os.environ.get("POSTGRES_POOL_TIMEOUT", 10)),
+                # Ping connections on checkout so restarts of the server or
+                # a proxy in between don't surface as request errors.
+                "check": ConnectionPool.check_connection,
+            },
+        }
+    else:
+        DATABASES["default"]["CONN_MAX_AGE"] = int(
+            os.environ.get("POSTGRES_CONN_MAX_AGE", 600)
+        )
+        DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / "db.sqlite3",
+        }
+    }
+
+# Opt-in SQLite profile for small single-node deployments (SQLITE_TUNED=1):
+# the pragmas are applied to every new connection, and write paths that use
+# library_service.db.write_atomic() start with BEGIN IMMEDIATE. WAL lets
+# readers run alongside the single writer; synchronous=NORMAL is durable
+# against application crashes but may lose the last commits on power loss.
+SQLITE_TUNING = {
+    "ENABLED": os.environ.get("SQLITE_TUNED", "0").lower() in ("1", "true", "yes"),
+    "PRAGMAS": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "cache_size": -64000,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+    },
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Use a shared backend (Redis, Memcached) when running several workers,
+# otherwise catalog invalidations only reach the current process.
+
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
     }
 }
 
@@ -107,6 +180,31 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# https://docs.djangoproject.com/en/5.2/topics/auth/passwords/
+
+PASSWORD_HASHERS = [
+    "users.hashers.ConfigurablePBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
+# PBKDF2 cost. Lower it for local development and tests, never in production.
+PASSWORD_HASH_ITERATIONS = int(os.environ.get("PASSWORD_HASH_ITERATIONS", 1_000_000))
+
+# Hashing and verification run on a shared thread pool: MAX_WORKERS hashes
+# at once, MAX_PENDING more queued, and callers waiting longer than
+# QUEUE_TIMEOUT seconds get a 503. MAX_WORKERS = 0 hashes on the request
+# thread.
+PASSWORD_HASHING = {
+    "MAX_WORKERS": int(os.environ.get("PASSWORD_HASHING_WORKERS", os.cpu_count() or 1)),
+    "MAX_PENDING": int(os.environ.get("PASSWORD_HASHING_PENDING", 64)),
+    "QUEUE_TIMEOUT": 5,
+}
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -130,9 +228,87 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    )
+    "DEFAULT_AUTHENTICATION_CLASSES": ("users.authentication.CachedJWTAuthentication",)
+}
+
+KEYSET_PAGINATION = {
+    "PAGE_SIZE": 20,
+    "MAX_PAGE_SIZE": 100,
+}
+
+FAST_READ_SERIALIZERS = False
+
+FINE_MULTIPLIER = 2
+
+BOOK_CATALOG_CACHE_TIMEOUT = 300
+
+BOOK_SEARCH_MAX_RESULTS = 100
+
+# Views (dotted paths) whose GET list/retrieve run as native coroutines, see
+# library_service.mixins.AsyncReadMixin. Only worth it under ASGI: under WSGI
+# every request would spin up an event loop.
+ASYNC_READ_VIEWS = []
+
+# Per-request Server-Timing header (db, auth, serialize, render, total).
+# With LOG on, the same numbers go to the library_service.timing logger as
+# one JSON line per request.
+SERVER_TIMING = {
+    "ENABLED": True,
+    "LOG": os.environ.get("SERVER_TIMING_LOG", "0").lower() in ("1", "true", "yes"),
+}
+
+# Checkout provider for PAYMENT and FINE sessions (see payments.gateway).
+# Run `python manage.py payment_gateway_stub` for a local stand-in.
+PAYMENT_GATEWAY = {
+    "URL": os.environ.get("PAYMENT_GATEWAY_URL", "http://127.0.0.1:8010"),
+    "API_KEY": os.environ.get("PAYMENT_GATEWAY_API_KEY", "sk_test_local"),
+    "WEBHOOK_SECRET": os.environ.get("PAYMENT_WEBHOOK_SECRET", "whsec_local"),
+    "WEBHOOK_TOLERANCE": 300,
+    "CURRENCY": "usd",
+    "CONNECT_TIMEOUT": 2,
+    "TIMEOUT": 10,
+    "MAX_CONNECTIONS": 20,
+    "MAX_KEEPALIVE_CONNECTIONS": 20,
+    "RETRIES": 3,
+    "BACKOFF": 0.2,
+    "BACKOFF_MAX": 5,
+    "BREAKER_THRESHOLD": 5,
+    "BREAKER_RESET_TIMEOUT": 30,
+    "CONCURRENCY": 20,
+}
+
+# /metrics answers staff users logged in to the admin, and scrapers sending
+# "Authorization: Bearer <TOKEN>" when TOKEN is set. Anyone else gets a 403.
+METRICS = {
+    "TOKEN": os.environ.get("METRICS_TOKEN", ""),
+}
+
+# Check each view's declared query_budget (see library_service.query_budget).
+QUERY_BUDGET = {
+    "ENABLED": DEBUG,
+    "RAISE": os.environ.get("QUERY_BUDGET_RAISE", "0").lower() in ("1", "true", "yes"),
+}
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "library_service.timing": {"handlers": ["console"], "level": "INFO"},
+        "library_service.query_budget": {"handlers": ["console"], "level": "INFO"},
+    },
+}
+
+# Users resolved from JWTs are cached in the shared cache for TIMEOUT seconds
+# and in a per-process LRU for LOCAL_TIMEOUT seconds. Saves and deletes
+# invalidate the shared cache and the saving process' LRU: other workers may
+# authenticate a deactivated user or a changed password for up to
+# LOCAL_TIMEOUT seconds, so keep it short when running several workers. With
+# the default LocMemCache, which is per process, only the LRU is used.
+AUTH_USER_CACHE = {
+    "TIMEOUT": 300,
+    "LOCAL_TIMEOUT": 30,
+    "LOCAL_MAX_SIZE": 1024,
 }
 
 SIMPLE_JWT = {
@@ -0,0 +1,92 @@
+import re
+from urllib.parse import urlsplit
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+
+from library_service.query_budget import get_query_budget
+from users.authentication import local_users
+
+
+class QueryPlanAssertionsMixin:
+    """
+    Run EXPLAIN on generated SQL and fail when a table is read with a full
+    scan instead of an index lookup.
+    """
+
+    full_scan_patterns = {
+        "sqlite": r"\bSCAN (TABLE )?{table}\b",
+        "postgresql": r"\bSeq Scan on {table}\b",
+    }
+
+    def explain(self, sql, params=None):
+        if connection.vendor == "sqlite":
+            sql = f"EXPLAIN QUERY PLAN {sql}"
+        else:
+            sql = f"EXPLAIN {sql}"
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                # Test tables are tiny, so the planner would rightly prefer
+                # a sequential scan. Ask whether an index path exists at all.
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(sql, params)
+            return "\n".join(
+                " ".join(str(column) for column in row) for row in cursor.fetchall()
+            )
+
+    def assertNoFullScan(self, sql, table, params=None):
+        plan = self.explain(sql, params)
+        pattern = self.full_scan_patterns[connection.vendor].format(
+            table=re.escape(table)
+        )
+        if re.search(pattern, plan):
+            self.fail(f"Full scan of {table}:\n{sql}\n\n{plan}")
+
+    def assertQuerysetUsesIndex(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        self.assertNoFullScan(sql, queryset.model._meta.db_table, params)
+
+    def assertRequestUsesIndexes(self, url, model):
+        table = model._meta.db_table
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        statements = [
+            query["sql"] for query in queries if f'FROM "{table}"' in query["sql"]
+        ]
+        self.assertTrue(statements, f"No query against {table} for {url}")
+        for sql in statements:
+            self.assertNoFullScan(sql, table)
+        return response
+
+
+class QueryBudgetAssertionsMixin:
+    """
+    Request a URL and fail when it runs more queries than its view's
+    declared ``query_budget``. The user cache is cleared first, so the
+    count includes the authentication lookup like a cold worker would.
+    """
+
+    def assertWithinQueryBudget(self, method, url, data=None):
+        match = resolve(urlsplit(url).path)
+        budget = get_query_budget(match.func, method)
+        self.assertIsNotNone(
+            budget, f"{match.view_name} declares no query budget for {method}"
+        )
+
+        local_users.clear()
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method.lower())(url, data, format="json")
+        self.assertLess(response.status_code, 400, response.content)
+
+        if len(queries) > budget:
+            statements = "\n".join(query["sql"] for query in queries)
+            self.fail(
+                f"{method} {url} ran {len(queries)} queries, over the "
+                f"{match.view_name} budget of {budget}:\n{statements}"
+            )
+        return response
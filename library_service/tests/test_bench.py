@@ -0,0 +1,56 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from books.models import Book
+from borrowings.models import Borrowing
+from payments.models import Payment
+
+
+@override_settings(PASSWORD_HASH_ITERATIONS=1000)
+class SeedAndBenchTests(TestCase):
+    def seed(self):
+        call_command(
+            "seed_library",
+            users=5,
+            books=30,
+            borrowings=200,
+            days=30,
+            stdout=StringIO(),
+        )
+
+    def test_seed_library_creates_related_rows(self):
+        self.seed()
+
+        self.assertEqual(Book.objects.count(), 30)
+        self.assertEqual(Borrowing.objects.count(), 200)
+        self.assertEqual(Payment.objects.filter(type=Payment.Type.PAYMENT).count(), 200)
+        self.assertTrue(
+            Borrowing.objects.filter(actual_return_date__isnull=True).exists()
+        )
+        for book in Book.objects.all():
+            self.assertGreaterEqual(book.inventory, 0)
+
+    def test_bench_reports_every_endpoint(self):
+        self.seed()
+        active = Borrowing.objects.filter(actual_return_date__isnull=True).count()
+        out = StringIO()
+
+        call_command("bench", concurrency=1, requests=2, stdout=out)
+
+        report = json.loads(out.getvalue())
+        endpoints = report["endpoints"]
+        self.assertEqual(report["transport"], "client")
+        self.assertIn("borrowings-return", endpoints)
+        self.assertIn("payments-detail", endpoints)
+        for name, result in endpoints.items():
+            self.assertEqual(result["errors"], 0, name)
+            self.assertEqual(result["requests"], 2, name)
+            self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+        self.assertGreater(endpoints["books-search"]["queries_per_request"], 0)
+        # Whatever the bench borrows it returns.
+        self.assertEqual(
+            Borrowing.objects.filter(actual_return_date__isnull=True).count(), active
+        )
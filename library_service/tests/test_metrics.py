@@ -0,0 +1,117 @@
+from datetime import date, timedelta
+
+from django.test import override_settings
+from django.urls import reverse
+from prometheus_client import REGISTRY
+
+from books.models import Book
+from books.tests.base import AuthenticatedAPITestCase
+from borrowings.models import Borrowing
+from payments.models import Payment
+
+METRICS_URL = reverse("metrics")
+BOOKS_URL = reverse("book:book-list")
+BORROWINGS_URL = reverse("borrowings:borrowing-list")
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class MetricsTests(AuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.book = Book.objects.create(
+            title="Metered Book",
+            author="Author",
+            cover="HARD",
+            inventory=5,
+            daily_fee="1.00",
+        )
+
+    def test_requests_are_counted_per_route(self):
+        labels = {"route": "book:book-list", "method": "GET"}
+        before = sample("http_requests_total", status="200", **labels)
+        observed = sample("http_request_duration_seconds_count", **labels)
+
+        self.client.get(BOOKS_URL)
+
+        self.assertEqual(
+            sample("http_requests_total", status="200", **labels), before + 1
+        )
+        self.assertEqual(
+            sample("http_request_duration_seconds_count", **labels), observed + 1
+        )
+        self.assertGreater(sample("http_request_db_queries_count", **labels), 0)
+
+    def test_borrowing_counters(self):
+        self.authenticate_normal_user()
+        created = sample("library_borrowings_created_total")
+        returned = sample("library_borrowings_returned_total")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                BORROWINGS_URL,
+                {
+                    "book": self.book.pk,
+                    "expected_return_date": date.today() + timedelta(days=3),
+                },
+                format="json",
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse(
+                    "borrowings:borrowing-return-borrowing", args=[response.data["id"]]
+                )
+            )
+
+        self.assertEqual(sample("library_borrowings_created_total"), created + 1)
+        self.assertEqual(sample("library_borrowings_returned_total"), returned + 1)
+
+    @override_settings(METRICS={"TOKEN": "scrape-token"})
+    def test_endpoint_exposes_state_gauges(self):
+        user = self.get_normal_user()
+        borrowing = Borrowing.objects.create(
+            user=user, book=self.book, expected_return_date=date.today()
+        )
+        Payment.objects.create(
+            status=Payment.Status.PAID,
+            type=Payment.Type.PAYMENT,
+            borrowing=borrowing,
+            session_url="https://example.com/session",
+            session_id="session",
+            money_to_pay="1.00",
+        )
+        self.client.get(BOOKS_URL)
+
+        response = self.client.get(
+            METRICS_URL, HTTP_AUTHORIZATION="Bearer scrape-token"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn("library_active_borrowings 1.0", body)
+        self.assertIn('library_payments{status="PAID"} 1.0', body)
+        self.assertIn('library_payments{status="PENDING"} 0.0', body)
+        self.assertIn('http_requests_total{method="GET",route="book:book-list"', body)
+        self.assertNotIn('route="metrics"', body)
+
+    @override_settings(METRICS={"TOKEN": "scrape-token"})
+    def test_endpoint_requires_token_or_staff(self):
+        for authorization in ("", "Bearer wrong-token", "Basic scrape-token"):
+            with self.subTest(authorization=authorization):
+                response = self.client.get(
+                    METRICS_URL, HTTP_AUTHORIZATION=authorization
+                )
+                self.assertEqual(response.status_code, 403)
+
+        self.client.force_login(self.get_staff_user())
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 200)
+
+    def test_endpoint_is_closed_without_token(self):
+        for authorization in ("", "Bearer "):
+            with self.subTest(authorization=authorization):
+                response = self.client.get(
+                    METRICS_URL, HTTP_AUTHORIZATION=authorization
+                )
+                self.assertEqual(response.status_code, 403)
@@ -0,0 +1,158 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import resolve, reverse
+from rest_framework import serializers
+
+from books.models import Book
+from books.tests.base import AuthenticatedAPITestCase
+from borrowings.models import Borrowing
+from borrowings.serializers import BorrowingReadSerializer
+from library_service.query_budget import QueryBudgetExceeded, get_query_budget
+from library_service.serializers import QueryPlan
+from library_service.tests.base import QueryBudgetAssertionsMixin
+from payments.models import Payment
+from payments.serializers import PaymentDetailSerializer, PaymentSerializer
+from payments.views import PaymentDetailView
+from users.models import User
+
+
+class PaymentSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Payment
+        fields = ["id", "status"]
+
+
+class BorrowingPaymentsSerializer(serializers.ModelSerializer):
+    payments = PaymentSummarySerializer(many=True, read_only=True)
+    payment_ids = serializers.PrimaryKeyRelatedField(
+        source="payments", many=True, read_only=True
+    )
+    title = serializers.CharField(source="book.title")
+    email = serializers.SlugRelatedField(
+        source="user", slug_field="email", read_only=True
+    )
+
+    class Meta:
+        model = Borrowing
+        fields = ["id", "payments", "payment_ids", "title", "email"]
+
+
+class UserBorrowingsSerializer(serializers.ModelSerializer):
+    borrowings = BorrowingPaymentsSerializer(
+        source="borrowing_set", many=True, read_only=True
+    )
+
+    class Meta:
+        model = User
+        fields = ["id", "borrowings"]
+
+
+class QueryPlanTests(SimpleTestCase):
+    def test_nested_serializers_are_joined(self):
+        plan = QueryPlan(PaymentDetailSerializer)
+
+        self.assertEqual(plan.select_related, ["borrowing", "borrowing__book"])
+        self.assertEqual(plan.prefetch_related, [])
+
+    def test_primary_key_fields_need_no_join(self):
+        self.assertEqual(QueryPlan(PaymentSerializer).select_related, [])
+        self.assertEqual(QueryPlan(BorrowingReadSerializer).select_related, ["book"])
+
+    def test_dotted_sources_and_related_fields_are_joined(self):
+        plan = QueryPlan(BorrowingPaymentsSerializer)
+
+        self.assertEqual(plan.select_related, ["book", "user"])
+        self.assertEqual(plan.prefetch_related, ["payments"])
+
+    def test_relations_below_a_to_many_relation_are_prefetched(self):
+        plan = QueryPlan(UserBorrowingsSerializer)
+
+        self.assertEqual(plan.select_related, [])
+        self.assertEqual(
+            plan.prefetch_related,
+            [
+                "borrowing_set",
+                "borrowing_set__payments",
+                "borrowing_set__book",
+                "borrowing_set__user",
+            ],
+        )
+
+
+class GetQueryBudgetTests(SimpleTestCase):
+    def test_viewset_budgets_are_per_action(self):
+        view = resolve(reverse("borrowings:borrowing-list")).func
+
+        self.assertEqual(get_query_budget(view, "GET"), 2)
+        self.assertEqual(get_query_budget(view, "POST"), 8)
+        self.assertIsNone(get_query_budget(view, "OPTIONS"))
+
+    def test_plain_views(self):
+        detail = resolve(reverse("payments:payment-detail", args=[1])).func
+        me = resolve(reverse("user:user_me")).func
+
+        self.assertEqual(get_query_budget(detail, "GET"), 2)
+        self.assertEqual(get_query_budget(me, "GET"), 2)
+        self.assertIsNone(get_query_budget(me, "PATCH"))
+
+
+class QueryBudgetMiddlewareTests(QueryBudgetAssertionsMixin, AuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.authenticate_normal_user()
+        book = Book.objects.create(
+            title="Budget Book",
+            author="Author",
+            cover="HARD",
+            inventory=1,
+            daily_fee="1.00",
+        )
+        borrowing = Borrowing.objects.create(
+            user=self.get_normal_user(),
+            book=book,
+            expected_return_date=date.today() + timedelta(days=7),
+        )
+        self.payment = Payment.objects.create(
+            status=Payment.Status.PENDING,
+            type=Payment.Type.PAYMENT,
+            borrowing=borrowing,
+            session_url="https://example.com/session",
+            session_id="sess_budget",
+            money_to_pay=7,
+        )
+        self.url = reverse("payments:payment-detail", args=[self.payment.id])
+
+    def test_detail_renders_nested_borrowing_within_budget(self):
+        res = self.assertWithinQueryBudget("GET", self.url)
+
+        self.assertEqual(res.data["borrowing"]["book"]["title"], "Budget Book")
+
+    @override_settings(QUERY_BUDGET={"ENABLED": False, "RAISE": False})
+    def test_lazy_nested_relation_exceeds_budget(self):
+        # What PaymentDetailView ran before its queryset followed the plan.
+        def unplanned(view):
+            return Payment.objects.select_related("borrowing__user")
+
+        with mock.patch.object(PaymentDetailView, "get_queryset", unplanned):
+            with self.assertRaisesMessage(AssertionError, "over the"):
+                self.assertWithinQueryBudget("GET", self.url)
+
+    @override_settings(QUERY_BUDGET={"ENABLED": True, "RAISE": False})
+    def test_middleware_logs_requests_over_budget(self):
+        with mock.patch.object(PaymentDetailView, "query_budget", 0):
+            with self.assertLogs("library_service.query_budget", "WARNING") as logs:
+                res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("payments:payment-detail", logs.output[0])
+
+    @override_settings(QUERY_BUDGET={"ENABLED": True, "RAISE": True})
+    def test_middleware_raises_when_configured(self):
+        with mock.patch.object(PaymentDetailView, "query_budget", 0):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get(self.url)
+
+        with self.assertNoLogs("library_service.query_budget"):
+            self.client.get(self.url)
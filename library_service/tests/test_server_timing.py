@@ -0,0 +1,82 @@
+import json
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from books.models import Book
+from books.tests.base import AuthenticatedAPITestCase
+
+BOOKS_URL = reverse("book:book-list")
+BORROWINGS_URL = reverse("borrowings:borrowing-list")
+ME_URL = reverse("user:user_me")
+
+
+def parse_server_timing(header):
+    entries = {}
+    for entry in header.split(", "):
+        name, *params = entry.split(";")
+        entries[name] = dict(param.split("=", 1) for param in params)
+    return entries
+
+
+@override_settings(BOOK_CATALOG_CACHE_TIMEOUT=0)
+class ServerTimingTests(AuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(3):
+            Book.objects.create(
+                title=f"Timed Book {i}",
+                author="Author",
+                cover="HARD",
+                inventory=1,
+                daily_fee="1.00",
+            )
+
+    def test_header_reports_each_phase(self):
+        response = self.client.get(BOOKS_URL)
+
+        timings = parse_server_timing(response["Server-Timing"])
+        self.assertEqual(set(timings), {"db", "auth", "serialize", "render", "total"})
+        for entry in timings.values():
+            self.assertGreaterEqual(float(entry["dur"]), 0)
+
+    def test_query_count_matches_executed_queries(self):
+        self.authenticate_normal_user()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(BORROWINGS_URL)
+
+        timings = parse_server_timing(response["Server-Timing"])
+        self.assertEqual(timings["db"]["desc"], f'"{len(queries)} queries"')
+
+    @override_settings(FAST_READ_SERIALIZERS=True)
+    def test_fast_serializer_path_is_timed(self):
+        response = self.client.get(BOOKS_URL)
+
+        self.assertIn("serialize;dur=", response["Server-Timing"])
+
+    def test_user_views_are_instrumented(self):
+        self.authenticate_normal_user()
+
+        response = self.client.get(ME_URL)
+
+        self.assertRegex(response["Server-Timing"], r"\bauth;dur=[\d.]+")
+
+    @override_settings(SERVER_TIMING={"ENABLED": True, "LOG": True})
+    def test_log_line_is_json(self):
+        with self.assertLogs("library_service.timing", "INFO") as logs:
+            self.client.get(BOOKS_URL)
+
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(record["path"], BOOKS_URL)
+        self.assertEqual(record["status"], 200)
+        self.assertEqual(record["queries"], 1)
+        self.assertIn("serialize_ms", record)
+
+    @override_settings(SERVER_TIMING={"ENABLED": False, "LOG": False})
+    def test_disabled(self):
+        response = self.client.get(BOOKS_URL)
+
+        self.assertNotIn("Server-Timing", response)
@@ -0,0 +1,180 @@
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger("library_service.timing")
+
+current_timings = ContextVar("current_timings", default=None)
+
+
+class RequestTimings:
+    """
+    Per-request counters. SQL is measured by a database execute wrapper;
+    named spans (auth, serialize, render) exclude the SQL time spent inside
+    them, so each entry shows where time went besides the database.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql = 0.0
+        self.spans = {}
+
+    def add(self, name, duration):
+        self.spans[name] = self.spans.get(name, 0.0) + duration
+
+    def total(self):
+        return time.perf_counter() - self.started
+
+    def as_dict(self):
+        return {
+            "total_ms": round(self.total() * 1000, 2),
+            "sql_ms": round(self.sql * 1000, 2),
+            "queries": self.queries,
+            **{
+                f"{name}_ms": round(value * 1000, 2)
+                for name, value in self.spans.items()
+            },
+        }
+
+    def header(self):
+        entries = [f'db;dur={self.sql * 1000:.2f};desc="{self.queries} queries"']
+        entries += [
+            f"{name};dur={value * 1000:.2f}" for name, value in self.spans.items()
+        ]
+        entries.append(f"total;dur={self.total() * 1000:.2f}")
+        return ", ".join(entries)
+
+
+@contextmanager
+def span(name):
+    """Add the non-SQL time spent in the block to the current request."""
+    timings = current_timings.get()
+    if timings is None:
+        yield
+        return
+    sql, started = timings.sql, time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started - (timings.sql - sql))
+
+
+def time_queries(execute, sql, params, many, context):
+    timings = current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.sql += time.perf_counter() - started
+        timings.queries += 1
+
+
+@receiver(connection_created)
+def install_query_timer(sender, connection, **kwargs):
+    # Insert at the front: connection.execute_wrapper() blocks pop() the
+    # last wrapper on exit, and a connection may be opened inside one.
+    if time_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, time_queries)
+
+
+class ServerTimingMiddleware:
+    """
+    Report SQL count and time, auth, serialize and render time and the total
+    for each request in a ``Server-Timing`` header, and optionally as a JSON
+    log line on the ``library_service.timing`` logger.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.SERVER_TIMING["ENABLED"]:
+            return self.get_response(request)
+        token = current_timings.set(RequestTimings())
+        try:
+            return self.finish(request, self.get_response(request))
+        finally:
+            current_timings.reset(token)
+
+    async def __acall__(self, request):
+        if not settings.SERVER_TIMING["ENABLED"]:
+            return await self.get_response(request)
+        token = current_timings.set(RequestTimings())
+        try:
+            return self.finish(request, await self.get_response(request))
+        finally:
+            current_timings.reset(token)
+
+    def process_template_response(self, request, response):
+        # Django renders template responses (DRF's Response) right after
+        # this hook, so the render time is from here to the callback.
+        timings = current_timings.get()
+        if timings is not None:
+            started, sql = time.perf_counter(), timings.sql
+
+            def rendered(response):
+                duration = time.perf_counter() - started - (timings.sql - sql)
+                timings.add("render", duration)
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    def finish(self, request, response):
+        timings = current_timings.get()
+        response["Server-Timing"] = timings.header()
+        if settings.SERVER_TIMING["LOG"]:
+            logger.info(
+                json.dumps(
+                    {
+                        "method": request.method,
+                        "path": request.path,
+                        "status": response.status_code,
+                        **timings.as_dict(),
+                    }
+                )
+            )
+        return response
+
+
+class ServerTimingMixin:
+    """
+    DRF view hooks for ServerTimingMiddleware: time ``initial()`` (content
+    negotiation, authentication, permissions, throttling) as ``auth`` and the
+    root serializer's ``to_representation()`` as ``serialize``.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        with span("auth"):
+            super().initial(request, *args, **kwargs)
+
+    async def ainitial(self, request, *args, **kwargs):
+        with span("auth"):
+            await super().ainitial(request, *args, **kwargs)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        to_representation = serializer.to_representation
+
+        def timed(*args, **kwargs):
+            with span("serialize"):
+                return to_representation(*args, **kwargs)
+
+        serializer.to_representation = timed
+        return serializer
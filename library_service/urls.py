@@ -18,8 +18,11 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from library_service.metrics import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("metrics", metrics_view, name="metrics"),
     path("api/books/", include("books.urls", namespace="book")),
     path("api/users/", include("users.urls", namespace="user")),
     path("api/borrowings/", include("borrowings.urls", namespace="borrowings")),
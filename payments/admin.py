@@ -1,5 +1,7 @@
 from django.contrib import admin
 
-from payments.models import Payment
+from payments.models import Balance, Payment, WebhookEvent
 
 admin.site.register(Payment)
+admin.site.register(Balance)
+admin.site.register(WebhookEvent)
@@ -0,0 +1,225 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import (
+    Case,
+    Count,
+    DecimalField,
+    F,
+    IntegerField,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from borrowings.models import Borrowing
+from library_service.db import write_atomic
+from payments.models import Balance, Payment
+
+ZERO = Decimal("0.00")
+FIELDS = ("pending_total", "paid_total", "open_fines")
+# Users per UPDATE: each adds a WHEN to three CASEs, two parameters apiece.
+DELTA_BATCH_SIZE = 500
+
+
+def contribution(status, type, amount):
+    """What one payment adds to its owner's (pending, paid, open fines)."""
+    if status == Payment.Status.PENDING:
+        return amount, ZERO, int(type == Payment.Type.FINE)
+    if status == Payment.Status.PAID:
+        return ZERO, amount, 0
+    return ZERO, ZERO, 0
+
+
+def new_deltas():
+    return defaultdict(lambda: [ZERO, ZERO, 0])
+
+
+def add_delta(deltas, user_id, status, type, amount, sign=1):
+    """Add (or with ``sign=-1`` take away) one payment's contribution."""
+    delta = deltas[user_id]
+    for index, value in enumerate(contribution(status, type, amount)):
+        delta[index] += sign * value
+
+
+def apply_deltas(deltas):
+    """
+    Add ``{user_id: [pending, paid, open fines]}`` to the stored balances:
+    one INSERT of the missing rows and one UPDATE per ``DELTA_BATCH_SIZE``
+    users. Call it inside the transaction that changed the payments.
+    """
+    deltas = [(user, delta) for user, delta in deltas.items() if any(delta)]
+    for start in range(0, len(deltas), DELTA_BATCH_SIZE):
+        batch = dict(deltas[start : start + DELTA_BATCH_SIZE])
+        Balance.objects.bulk_create(
+            [Balance(user_id=user) for user in batch], ignore_conflicts=True
+        )
+        Balance.objects.filter(user_id__in=batch).update(
+            updated_at=timezone.now(),
+            **{
+                field: F(field) + _per_user(batch, index, output_field)
+                for index, (field, output_field) in enumerate(
+                    zip(FIELDS, _output_fields())
+                )
+            },
+        )
+
+
+def _output_fields():
+    return (
+        DecimalField(max_digits=12, decimal_places=2),
+        DecimalField(max_digits=12, decimal_places=2),
+        IntegerField(),
+    )
+
+
+def _per_user(batch, index, output_field):
+    return Case(
+        *[
+            When(user_id=user, then=Value(delta[index], output_field=output_field))
+            for user, delta in batch.items()
+        ],
+        default=Value(0, output_field=output_field),
+        output_field=output_field,
+    )
+
+
+def _owed(pk):
+    """``(user_id, status, type, amount)`` of a stored payment, or None."""
+    if pk is None:
+        return None
+    return (
+        Payment.objects.select_for_update()
+        .filter(pk=pk)
+        .values_list("borrowing__user_id", "status", "type", "money_to_pay")
+        .first()
+    )
+
+
+@contextmanager
+def tracking(payment):
+    """
+    Wrap a write to ``payment``: its owner's balance moves by the difference
+    in the same transaction.
+    """
+    with write_atomic():
+        before = _owed(payment.pk)
+        yield
+        deltas = new_deltas()
+        if before:
+            add_delta(deltas, *before, sign=-1)
+        after = _owed(payment.pk)
+        if after:
+            add_delta(deltas, *after)
+        apply_deltas(deltas)
+
+
+def expected_balances():
+    """Every user's balance recomputed from their payments, by user id."""
+    rows = (
+        Payment.objects.order_by()
+        .values_list("borrowing__user_id")
+        .annotate(
+            pending=Coalesce(
+                Sum("money_to_pay", filter=Q(status=Payment.Status.PENDING)),
+                ZERO,
+                output_field=_output_fields()[0],
+            ),
+            paid=Coalesce(
+                Sum("money_to_pay", filter=Q(status=Payment.Status.PAID)),
+                ZERO,
+                output_field=_output_fields()[1],
+            ),
+            fines=Count(
+                "pk",
+                filter=Q(status=Payment.Status.PENDING, type=Payment.Type.FINE),
+            ),
+        )
+    )
+    return {user: (pending, paid, fines) for user, pending, paid, fines in rows}
+
+
+def find_drift():
+    """``{user_id: (stored, expected)}`` for balances that do not add up."""
+    expected = expected_balances()
+    stored = {
+        user: tuple(values)
+        for user, *values in Balance.objects.values_list("user_id", *FIELDS)
+    }
+    empty = (ZERO, ZERO, 0)
+    return {
+        user: (stored.get(user, empty), expected.get(user, empty))
+        for user in stored.keys() | expected.keys()
+        if stored.get(user, empty) != expected.get(user, empty)
+    }
+
+
+def lock_balances():
+    """
+    Block writes to the balance table until the transaction ends. SQLite
+    has one writer at a time already: write_atomic() on the tuned profile,
+    a failed lock upgrade otherwise, never a silently lost update.
+    """
+    connection = transaction.get_connection()
+    if connection.vendor == "postgresql":
+        table = connection.ops.quote_name(Balance._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(f"LOCK TABLE {table} IN EXCLUSIVE MODE")
+
+
+def rebuild_balances(batch_size=1000):
+    """
+    Overwrite every balance with the totals recomputed from the payments:
+    one aggregate query, one UPDATE zeroing the table and batched upserts.
+    Returns how many users have payments.
+
+    The balance table is locked against writes before the aggregate: a
+    concurrent payment write either committed before it, and is counted,
+    or waits to apply its delta on top of the rebuilt totals. That includes
+    a user's first payment, whose balance row does not exist yet.
+    """
+    with write_atomic():
+        lock_balances()
+        expected = expected_balances()
+        now = timezone.now()
+        Balance.objects.update(
+            pending_total=ZERO, paid_total=ZERO, open_fines=0, updated_at=now
+        )
+        Balance.objects.bulk_create(
+            [
+                Balance(
+                    user_id=user,
+                    pending_total=pending,
+                    paid_total=paid,
+                    open_fines=fines,
+                    updated_at=now,
+                )
+                for user, (pending, paid, fines) in expected.items()
+            ],
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=[*FIELDS, "updated_at"],
+        )
+    return len(expected)
+
+
+def payment_deleted(payment):
+    """Take a deleted payment out of its owner's balance."""
+    delta = contribution(payment.status, payment.type, payment.money_to_pay)
+    if not any(delta):
+        return
+    owner = Borrowing.objects.filter(pk=payment.borrowing_id).values("user_id")
+    Balance.objects.filter(user_id=Subquery(owner)).update(
+        updated_at=timezone.now(),
+        **{
+            field: F(field) - Value(value, output_field=output_field)
+            for field, value, output_field in zip(FIELDS, delta, _output_fields())
+        },
+    )
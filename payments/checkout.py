@@ -0,0 +1,37 @@
+import asyncio
+
+from django.utils import timezone
+
+from payments.gateway import AsyncGatewayClient, GatewayError
+from payments.models import Payment
+
+
+def without_session():
+    """PENDING payments and fines nobody can pay yet: they have no session."""
+    return Payment.objects.filter(status=Payment.Status.PENDING, session_id="")
+
+
+def open_sessions(payments, concurrency=None):
+    """
+    Create sessions for ``payments`` concurrently and store them with one
+    bulk update. Returns the payments that got a session and a list of
+    ``(payment, GatewayError)`` for the others.
+    """
+
+    async def create():
+        async with AsyncGatewayClient() as client:
+            return await client.create_sessions(payments, concurrency)
+
+    opened, failed = [], []
+    now = timezone.now()
+    for payment, result in zip(payments, asyncio.run(create())):
+        if isinstance(result, GatewayError):
+            failed.append((payment, result))
+            continue
+        payment.session_id, payment.session_url = result
+        # bulk_update() skips auto_now, and exports page on updated_at.
+        payment.updated_at = now
+        opened.append(payment)
+
+    Payment.objects.bulk_update(opened, ["session_id", "session_url", "updated_at"])
+    return opened, failed
@@ -0,0 +1,134 @@
+from datetime import date
+
+from django.conf import settings
+from django.db.models import (
+    DateField,
+    DecimalField,
+    Exists,
+    ExpressionWrapper,
+    F,
+    Func,
+    IntegerField,
+    OuterRef,
+    Value,
+)
+
+from borrowings.models import Borrowing
+from library_service.db import write_atomic
+from payments.balances import add_delta, apply_deltas, new_deltas
+from payments.models import Payment
+
+
+class DaysBetween(Func):
+    """Whole days from the second expression to the first one."""
+
+    arity = 2
+    output_field = IntegerField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        # PostgreSQL: date - date is already an integer number of days.
+        return super().as_sql(
+            compiler,
+            connection,
+            template="(%(expressions)s)",
+            arg_joiner=" - ",
+            **extra_context,
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler,
+            connection,
+            template="CAST(julianday(%(expressions)s) AS INTEGER)",
+            arg_joiner=") - julianday(",
+            **extra_context,
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler,
+            connection,
+            template="DATEDIFF(%(expressions)s)",
+            arg_joiner=", ",
+            **extra_context,
+        )
+
+
+def overdue_without_fine(today):
+    """
+    Active borrowings past their expected return date that have no FINE yet,
+    annotated with the fine amount computed by the database.
+    """
+    days_overdue = DaysBetween(
+        Value(today, output_field=DateField()), F("expected_return_date")
+    )
+    fines = Payment.objects.filter(borrowing=OuterRef("pk"), type=Payment.Type.FINE)
+
+    return (
+        Borrowing.objects.filter(
+            actual_return_date__isnull=True, expected_return_date__lt=today
+        )
+        .filter(~Exists(fines))
+        .annotate(
+            fine_amount=ExpressionWrapper(
+                F("book__daily_fee") * days_overdue * settings.FINE_MULTIPLIER,
+                output_field=DecimalField(max_digits=8, decimal_places=2),
+            )
+        )
+        .values_list("id", "fine_amount")
+    )
+
+
+def generate_fines(today=None, chunk_size=2000):
+    """
+    Stream overdue borrowings and insert their missing FINE payments in
+    batches of ``chunk_size``. Yields the size of every written batch.
+
+    Safe to re-run: already fined borrowings are filtered out, and each
+    batch locks its borrowings first, so concurrent runs skip the fines the
+    other one wrote.
+    """
+    today = today or date.today()
+    batch = []
+
+    for borrowing_id, amount in overdue_without_fine(today).iterator(
+        chunk_size=chunk_size
+    ):
+        batch.append(
+            Payment(
+                status=Payment.Status.PENDING,
+                type=Payment.Type.FINE,
+                borrowing_id=borrowing_id,
+                money_to_pay=amount,
+            )
+        )
+        if len(batch) >= chunk_size:
+            yield _write_fines(batch)
+            batch = []
+
+    if batch:
+        yield _write_fines(batch)
+
+
+def _write_fines(batch):
+    fines = Payment.objects.filter(borrowing=OuterRef("pk"), type=Payment.Type.FINE)
+    with write_atomic():
+        owners = dict(
+            Borrowing.objects.select_for_update()
+            .filter(pk__in=[fine.borrowing_id for fine in batch])
+            .filter(~Exists(fines))
+            .values_list("pk", "user_id")
+        )
+        batch = [fine for fine in batch if fine.borrowing_id in owners]
+        Payment.objects.bulk_create(batch)
+        deltas = new_deltas()
+        for fine in batch:
+            add_delta(
+                deltas,
+                owners[fine.borrowing_id],
+                fine.status,
+                fine.type,
+                fine.money_to_pay,
+            )
+        apply_deltas(deltas)
+    return len(batch)
@@ -0,0 +1,261 @@
+import asyncio
+import random
+import threading
+import time
+from contextlib import contextmanager
+from decimal import Decimal
+
+import httpx
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+SESSIONS_PATH = "/v1/checkout/sessions"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class GatewayError(APIException):
+    status_code = status.HTTP_502_BAD_GATEWAY
+    default_detail = "The payment provider rejected the request."
+    default_code = "payment_gateway_error"
+
+
+class GatewayUnavailable(GatewayError):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "The payment provider is unavailable, try again later."
+    default_code = "payment_gateway_unavailable"
+
+
+class CircuitBreaker:
+    """
+    Stop calling the provider after ``threshold`` consecutive failures.
+
+    While open, calls fail fast with GatewayUnavailable. After ``reset_timeout``
+    seconds one trial call is let through (half-open): success closes the
+    breaker, failure opens it for another ``reset_timeout``.
+    """
+
+    def __init__(self, threshold, reset_timeout):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half-open"
+
+    def before_call(self):
+        with self.lock:
+            state = self.state
+            if state == "closed":
+                return
+            if state == "open" or self.trial:
+                raise GatewayUnavailable()
+            self.trial = True
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.trial or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self.trial = False
+
+    @contextmanager
+    def call(self):
+        """
+        Wrap one call to the provider. The call records its own success or
+        failure; however it ends, even by cancellation or an unexpected
+        error, a half-open trial is over and the next call may try again.
+        """
+        self.before_call()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.trial = False
+
+
+class BaseGatewayClient:
+    """
+    Create checkout sessions with the payment provider.
+
+    Transport errors, timeouts and 429/5xx answers are retried up to
+    ``RETRIES`` times with full-jitter exponential backoff. Every attempt
+    for a payment sends the same ``Idempotency-Key``, so a retried request
+    whose first attempt did reach the provider returns the same session.
+    """
+
+    def __init__(self, config=None, breaker=None):
+        self.config = config or settings.PAYMENT_GATEWAY
+        self.breaker = breaker or get_breaker()
+
+    def client_options(self):
+        config = self.config
+        return {
+            "base_url": config["URL"],
+            "headers": {"Authorization": f"Bearer {config['API_KEY']}"},
+            "timeout": httpx.Timeout(
+                config["TIMEOUT"], connect=config["CONNECT_TIMEOUT"]
+            ),
+            "limits": httpx.Limits(
+                max_connections=config["MAX_CONNECTIONS"],
+                max_keepalive_connections=config["MAX_KEEPALIVE_CONNECTIONS"],
+            ),
+        }
+
+    def session_request(self, payment):
+        amount = Decimal(payment.money_to_pay)
+        return {
+            "json": {
+                "reference": str(payment.pk),
+                "amount": int(amount * 100),
+                "currency": self.config["CURRENCY"],
+                "description": (
+                    f"{payment.get_type_display()} for borrowing "
+                    f"#{payment.borrowing_id}"
+                ),
+            },
+            "headers": {"Idempotency-Key": f"payment-{payment.pk}"},
+        }
+
+    def backoff(self, attempt):
+        cap = min(self.config["BACKOFF_MAX"], self.config["BACKOFF"] * 2**attempt)
+        return random.uniform(0, cap)
+
+    def outcome(self, response=None, error=None):
+        """
+        Return the session for a successful response, or None when the
+        attempt may be retried. Raise GatewayError for final failures.
+        """
+        if error is not None:
+            self.breaker.record_failure()
+            return None
+        if response.status_code in RETRY_STATUSES:
+            self.breaker.record_failure()
+            return None
+        # The provider answered: whatever it said, it is up.
+        self.breaker.record_success()
+        if response.is_error:
+            raise GatewayError(f"Payment provider answered {response.status_code}.")
+        try:
+            data = response.json()
+            return data["id"], data["url"]
+        except (ValueError, KeyError, TypeError):
+            raise GatewayError("Payment provider sent an unreadable session.")
+
+
+class GatewayClient(BaseGatewayClient):
+    """Blocking client on a pooled keep-alive connection, one per process."""
+
+    def __init__(self, config=None, breaker=None):
+        super().__init__(config, breaker)
+        self.http = httpx.Client(**self.client_options())
+
+    def close(self):
+        self.http.close()
+
+    def create_session(self, payment):
+        """Return ``(session_id, session_url)`` for ``payment``."""
+        request = self.session_request(payment)
+        for attempt in range(self.config["RETRIES"] + 1):
+            if attempt:
+                time.sleep(self.backoff(attempt - 1))
+            with self.breaker.call():
+                try:
+                    response = self.http.post(SESSIONS_PATH, **request)
+                except httpx.TransportError as exc:
+                    session = self.outcome(error=exc)
+                else:
+                    session = self.outcome(response)
+            if session is not None:
+                return session
+        raise GatewayUnavailable()
+
+
+class AsyncGatewayClient(BaseGatewayClient):
+    """
+    asyncio client for creating many sessions concurrently. Use it as an
+    async context manager: its connection pool belongs to the running loop.
+    """
+
+    async def __aenter__(self):
+        self.http = httpx.AsyncClient(**self.client_options())
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.http.aclose()
+
+    async def create_session(self, payment):
+        request = self.session_request(payment)
+        for attempt in range(self.config["RETRIES"] + 1):
+            if attempt:
+                await asyncio.sleep(self.backoff(attempt - 1))
+            with self.breaker.call():
+                try:
+                    response = await self.http.post(SESSIONS_PATH, **request)
+                except httpx.TransportError as exc:
+                    session = self.outcome(error=exc)
+                else:
+                    session = self.outcome(response)
+            if session is not None:
+                return session
+        raise GatewayUnavailable()
+
+    async def create_sessions(self, payments, concurrency=None):
+        """
+        Create a session for every payment with at most ``concurrency``
+        requests in flight. Returns one ``(session_id, session_url)`` tuple
+        or GatewayError per payment, in order.
+        """
+        slots = asyncio.Semaphore(concurrency or self.config["CONCURRENCY"])
+
+        async def create(payment):
+            async with slots:
+                try:
+                    return await self.create_session(payment)
+                except GatewayError as exc:
+                    return exc
+
+        return await asyncio.gather(*(create(payment) for payment in payments))
+
+
+_breaker = None
+_client = None
+_lock = threading.Lock()
+
+
+def get_breaker():
+    """The process-wide circuit breaker shared by sync and async clients."""
+    global _breaker
+    if _breaker is None:
+        with _lock:
+            if _breaker is None:
+                config = settings.PAYMENT_GATEWAY
+                _breaker = CircuitBreaker(
+                    config["BREAKER_THRESHOLD"], config["BREAKER_RESET_TIMEOUT"]
+                )
+    return _breaker
+
+
+def get_client():
+    """The process-wide blocking client, created on first use."""
+    global _client
+    if _client is None:
+        breaker = get_breaker()
+        with _lock:
+            if _client is None:
+                _client = GatewayClient(breaker=breaker)
+    return _client
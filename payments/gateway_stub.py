@@ -0,0 +1,131 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from uuid import uuid4
+
+from django.conf import settings
+
+from payments.gateway import SESSIONS_PATH
+from payments.webhooks import sign
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections alive, as the real provider does.
+    protocol_version = "HTTP/1.1"
+    # Send headers and body in one segment, flushed after each request;
+    # separate small writes stall keep-alive clients on delayed ACKs.
+    wbufsize = -1
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.path != SESSIONS_PATH:
+            return self.reply(404, {"error": "not_found"})
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            return self.reply(401, {"error": "unauthorized"})
+
+        if server.latency:
+            time.sleep(server.latency)
+        if server.should_fail():
+            return self.reply(503, {"error": "unavailable"})
+
+        try:
+            data = json.loads(body)
+            reference, amount = data["reference"], int(data["amount"])
+        except (KeyError, TypeError, ValueError):
+            return self.reply(400, {"error": "invalid_request"})
+        if amount <= 0:
+            return self.reply(400, {"error": "invalid_amount"})
+
+        key = self.headers.get("Idempotency-Key") or reference
+        self.reply(200, server.session(key))
+
+    def reply(self, status, payload):
+        content = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class StubGateway(ThreadingHTTPServer):
+    """
+    Local stand-in for the checkout provider, for tests and benchmarks.
+
+    Answers ``POST /v1/checkout/sessions`` after ``latency`` seconds and
+    returns the same session for a repeated ``Idempotency-Key``. Requests
+    fail with 503 at ``failure_rate``, and the next ``fail_next`` ones
+    always do. ``event()`` builds the signed webhook deliveries the
+    provider would send.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self, host="127.0.0.1", port=0, latency=0, failure_rate=0, verbose=False
+    ):
+        super().__init__((host, port), StubHandler)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.fail_next = 0
+        self.verbose = verbose
+        self.requests = 0
+        self.events = 0
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def should_fail(self):
+        with self.lock:
+            self.requests += 1
+            if self.fail_next:
+                self.fail_next -= 1
+                return True
+        return random.random() < self.failure_rate
+
+    def session(self, key):
+        with self.lock:
+            if key not in self.sessions:
+                # Unique across restarts: payment_unique_session_id holds
+                # sessions from earlier runs.
+                session_id = f"cs_stub_{uuid4().hex}"
+                self.sessions[key] = {
+                    "id": session_id,
+                    "url": f"{self.url}/pay/{session_id}",
+                }
+            return self.sessions[key]
+
+    def event(self, session_id, type="checkout.session.completed", event_id=None):
+        """A webhook delivery for ``session_id``: ``(body, signature header)``."""
+        with self.lock:
+            self.events += 1
+        body = json.dumps(
+            {
+                # The inbox drops known event ids, including earlier runs'.
+                "id": event_id or f"evt_stub_{uuid4().hex}",
+                "type": type,
+                "created": int(time.time()),
+                "data": {"session_id": session_id},
+            }
+        ).encode()
+        return body, sign(body, settings.PAYMENT_GATEWAY["WEBHOOK_SECRET"])
+
+    def start(self):
+        """Serve from a daemon thread; returns self."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from payments.webhooks import apply_events
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply unprocessed payment webhook events from the inbox in batches. "
+        "With --follow, keep polling for new events."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--follow", action="store_true")
+        parser.add_argument(
+            "--interval", type=float, default=1, help="Seconds between polls."
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.perf_counter()
+            events, payments = apply_events(batch_size=options["batch_size"])
+            elapsed = time.perf_counter() - started
+            if events or not options["follow"]:
+                self.stdout.write(
+                    f"Applied {events} events, {payments} payments paid, "
+                    f"in {elapsed:.2f}s"
+                )
+            if not options["follow"]:
+                return
+            time.sleep(options["interval"])
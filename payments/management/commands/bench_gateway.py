@@ -0,0 +1,107 @@
+import asyncio
+import time
+from decimal import Decimal
+
+import httpx
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from payments.gateway import (
+    SESSIONS_PATH,
+    AsyncGatewayClient,
+    CircuitBreaker,
+    GatewayClient,
+)
+from payments.gateway_stub import StubGateway
+from payments.models import Payment
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure checkout session creation against the local provider stub: "
+        "a new client per request, the pooled keep-alive client, and the "
+        "asyncio client at --concurrency. Nothing is written to the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sessions", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=20)
+        parser.add_argument(
+            "--latency", type=float, default=0.02, help="Stub seconds per request."
+        )
+        parser.add_argument("--failure-rate", type=float, default=0)
+
+    def handle(self, *args, **options):
+        stub = StubGateway(
+            latency=options["latency"], failure_rate=options["failure_rate"]
+        ).start()
+        config = {**settings.PAYMENT_GATEWAY, "URL": stub.url}
+        payments = [
+            Payment(
+                pk=pk,
+                type=Payment.Type.PAYMENT,
+                borrowing_id=pk,
+                money_to_pay=Decimal("3.50"),
+            )
+            for pk in range(1, options["sessions"] + 1)
+        ]
+        try:
+            self.report("client per request", *self.unpooled(config, payments))
+            self.report("pooled", *self.pooled(config, payments))
+            self.report(
+                f"async x{options['concurrency']}",
+                *self.concurrent(config, payments, options["concurrency"]),
+            )
+        finally:
+            stub.stop()
+
+    def breaker(self, config):
+        return CircuitBreaker(
+            config["BREAKER_THRESHOLD"], config["BREAKER_RESET_TIMEOUT"]
+        )
+
+    def unpooled(self, config, payments):
+        client = GatewayClient(config, self.breaker(config))
+        client.close()
+        started, failed = time.perf_counter(), 0
+        for payment in payments:
+            request = client.session_request(payment)
+            response = httpx.post(
+                config["URL"] + SESSIONS_PATH,
+                headers={
+                    **request["headers"],
+                    "Authorization": f"Bearer {config['API_KEY']}",
+                },
+                json=request["json"],
+            )
+            failed += response.is_error
+        return len(payments), failed, time.perf_counter() - started
+
+    def pooled(self, config, payments):
+        client = GatewayClient(config, self.breaker(config))
+        started, failed = time.perf_counter(), 0
+        try:
+            for payment in payments:
+                try:
+                    client.create_session(payment)
+                except Exception:
+                    failed += 1
+        finally:
+            client.close()
+        return len(payments), failed, time.perf_counter() - started
+
+    def concurrent(self, config, payments, concurrency):
+        async def run():
+            async with AsyncGatewayClient(config, self.breaker(config)) as client:
+                return await client.create_sessions(payments, concurrency)
+
+        started = time.perf_counter()
+        results = asyncio.run(run())
+        failed = sum(isinstance(result, Exception) for result in results)
+        return len(payments), failed, time.perf_counter() - started
+
+    def report(self, name, sessions, failed, elapsed):
+        self.stdout.write(
+            f"{name}: {sessions / elapsed:,.0f} sessions/s "
+            f"({elapsed:.2f}s, {failed} failed)"
+        )
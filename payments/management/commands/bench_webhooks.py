@@ -0,0 +1,70 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from library_service.management.commands.bench import PERCENTILES, percentile
+from payments.gateway_stub import StubGateway
+from payments.models import Payment
+from payments.webhooks import SIGNATURE_HEADER, apply_events
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay signed checkout.session.completed events for PENDING payments "
+        "that have a session through the webhook endpoint, each delivered "
+        "--replays times, then apply the inbox. Reports ingest latency and "
+        "apply throughput. Writes to the database: run it on a seeded copy."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--events", type=int, default=2000)
+        parser.add_argument("--replays", type=int, default=3)
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        sessions = list(
+            Payment.objects.filter(status=Payment.Status.PENDING)
+            .exclude(session_id="")
+            .values_list("session_id", flat=True)[: options["events"]]
+        )
+        # Unknown sessions still exercise ingest; apply just skips them.
+        sessions += [f"cs_bench_{i}" for i in range(options["events"] - len(sessions))]
+        provider = StubGateway()
+        provider.server_close()
+        deliveries = [provider.event(session) for session in sessions]
+
+        url = reverse("payments:payment-webhook")
+        client = Client(raise_request_exception=False)
+        latencies, errors = [], 0
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            for _ in range(options["replays"]):
+                for body, signature in deliveries:
+                    started = time.perf_counter()
+                    response = client.generic(
+                        "POST",
+                        url,
+                        body,
+                        content_type="application/json",
+                        headers={SIGNATURE_HEADER: signature},
+                    )
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    errors += response.status_code != 204
+
+        latencies.sort()
+        summary = ", ".join(
+            f"p{p} {percentile(latencies, p):.2f}ms" for p in PERCENTILES
+        )
+        self.stdout.write(
+            f"ingest: {len(latencies)} deliveries, {summary}, {errors} errors"
+        )
+
+        started = time.perf_counter()
+        events, paid = apply_events(batch_size=options["batch_size"])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"apply: {events} events, {paid} payments paid, "
+            f"{events / elapsed:,.0f} events/s ({elapsed:.2f}s)"
+        )
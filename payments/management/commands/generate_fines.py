@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from payments.fines import generate_fines
+
+
+class Command(BaseCommand):
+    help = "Create FINE payments for active borrowings past their return date."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Rows fetched and inserted per batch.",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        total = 0
+
+        for written in generate_fines(chunk_size=options["chunk_size"]):
+            total += written
+            if options["verbosity"] > 1:
+                self.stdout.write(f"  {total} fines written")
+
+        elapsed = time.perf_counter() - started
+        rate = total / elapsed if elapsed else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {total} fines in {elapsed:.2f}s ({rate:.0f} rows/s)"
+            )
+        )
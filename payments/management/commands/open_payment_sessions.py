@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from payments.checkout import open_sessions, without_session
+
+
+class Command(BaseCommand):
+    help = (
+        "Create checkout sessions for PENDING payments and fines that have "
+        "none, in batches sent to the provider concurrently."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--concurrency", type=int, help="Requests in flight per batch."
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        opened = failed = 0
+        last_id = 0
+
+        while True:
+            batch = list(
+                without_session()
+                .filter(pk__gt=last_id)
+                .order_by("pk")[: options["batch_size"]]
+            )
+            if not batch:
+                break
+            last_id = batch[-1].pk
+            done, errors = open_sessions(batch, options["concurrency"])
+            opened += len(done)
+            failed += len(errors)
+            for payment, error in errors[:10]:
+                self.stderr.write(f"Payment {payment.pk}: {error.detail}")
+
+        elapsed = time.perf_counter() - started
+        rate = opened / elapsed if elapsed else 0
+        style = self.style.SUCCESS if not failed else self.style.WARNING
+        self.stdout.write(
+            style(
+                f"Opened {opened} sessions, {failed} failed, in {elapsed:.2f}s "
+                f"({rate:.0f} sessions/s)"
+            )
+        )
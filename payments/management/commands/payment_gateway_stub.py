@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from payments.gateway_stub import StubGateway
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a local stand-in for the checkout provider. Point "
+        "PAYMENT_GATEWAY_URL at it (the default settings already do)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8010)
+        parser.add_argument(
+            "--latency", type=float, default=0.05, help="Seconds per request."
+        )
+        parser.add_argument(
+            "--failure-rate",
+            type=float,
+            default=0,
+            help="Share of requests answered with 503.",
+        )
+
+    def handle(self, *args, **options):
+        server = StubGateway(
+            options["host"],
+            options["port"],
+            latency=options["latency"],
+            failure_rate=options["failure_rate"],
+            verbose=options["verbosity"] > 1,
+        )
+        self.stdout.write(f"Payment gateway stub listening on {server.url}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
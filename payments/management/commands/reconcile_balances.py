@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from payments.balances import find_drift, rebuild_balances
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare every stored balance with the totals recomputed from the "
+        "payments, then rebuild them all in bulk. With --check, only report "
+        "the drift and fail if there is any."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        drift = find_drift()
+        for user, (stored, expected) in sorted(drift.items())[:10]:
+            self.stderr.write(f"User {user}: stored {stored}, expected {expected}")
+
+        if options["check"]:
+            if drift:
+                raise CommandError(f"{len(drift)} balances drifted.")
+            self.stdout.write(self.style.SUCCESS("No balance drift."))
+            return
+
+        users = rebuild_balances(batch_size=options["batch_size"])
+        elapsed = time.perf_counter() - started
+        style = self.style.SUCCESS if not drift else self.style.WARNING
+        self.stdout.write(
+            style(
+                f"Rebuilt {users} balances, {len(drift)} had drifted, "
+                f"in {elapsed:.2f}s"
+            )
+        )
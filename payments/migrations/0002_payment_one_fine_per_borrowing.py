@@ -0,0 +1,21 @@
+# Generated by Django 5.2.3 on 2026-10-18 17:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payments", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="payment",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("type", "FINE")),
+                fields=("borrowing",),
+                name="payment_one_fine_per_borrowing",
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payments", "0002_payment_one_fine_per_borrowing"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="payment",
+            index=models.Index(fields=["updated_at", "id"], name="payment_updated_idx"),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_balances(apps, schema_editor):
+    Balance = apps.get_model("payments", "Balance")
+    Payment = apps.get_model("payments", "Payment")
+    rows = (
+        Payment.objects.order_by()
+        .values_list("borrowing__user_id")
+        .annotate(
+            pending=Sum("money_to_pay", filter=Q(status="PENDING")),
+            paid=Sum("money_to_pay", filter=Q(status="PAID")),
+            fines=Count("pk", filter=Q(status="PENDING", type="FINE")),
+        )
+    )
+    Balance.objects.bulk_create(
+        [
+            Balance(
+                user_id=user,
+                pending_total=pending or 0,
+                paid_total=paid or 0,
+                open_fines=fines,
+            )
+            for user, pending, paid, fines in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payments", "0004_webhook_inbox"),
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Balance",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="balance",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "pending_total",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                (
+                    "paid_total",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                ("open_fines", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_balances, migrations.RunPython.noop),
+    ]
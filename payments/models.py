@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.db import models
 
 from borrowings.models import Borrowing
@@ -23,5 +24,79 @@ class Payment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="payment_updated_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["borrowing"],
+                condition=models.Q(type="FINE"),
+                name="payment_one_fine_per_borrowing",
+            ),
+            # Fines and payments without a checkout session yet have "".
+            models.UniqueConstraint(
+                fields=["session_id"],
+                condition=~models.Q(session_id=""),
+                name="payment_unique_session_id",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.type} | {self.status} | ${self.money_to_pay}"
+
+    def save(self, *args, **kwargs):
+        from payments.balances import tracking
+
+        with tracking(self):
+            super().save(*args, **kwargs)
+
+
+class Balance(models.Model):
+    """
+    What a user owes and has paid, kept in step with their payments so
+    reading it is a primary key lookup. ``payments.balances`` maintains it;
+    ``reconcile_balances`` rebuilds it from the payments.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="balance",
+    )
+    pending_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    paid_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    open_fines = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user_id} | ${self.pending_total} pending"
+
+
+class WebhookEvent(models.Model):
+    """
+    Append-only inbox of verified provider events, written by the webhook
+    receiver and applied to payments in batches. ``event_id`` is unique, so
+    redelivered events are dropped on insert.
+    """
+
+    event_id = models.CharField(max_length=255, unique=True)
+    type = models.CharField(max_length=100)
+    session_id = models.CharField(max_length=255, blank=True)
+    occurred_at = models.DateTimeField()
+    payload = models.JSONField()
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(processed_at__isnull=True),
+                name="webhook_event_pending_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.type} | {self.event_id}"
@@ -1,7 +1,7 @@
 from rest_framework import serializers
 
 from borrowings.serializers import BorrowingReadSerializer
-from payments.models import Payment
+from payments.models import Balance, Payment
 
 
 class PaymentSerializer(serializers.ModelSerializer):
@@ -20,3 +20,9 @@ class PaymentSerializer(serializers.ModelSerializer):
 
 class PaymentDetailSerializer(PaymentSerializer):
     borrowing = BorrowingReadSerializer(read_only=True)
+
+
+class BalanceSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Balance
+        fields = ["user", "pending_total", "paid_total", "open_fines", "updated_at"]
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from payments.balances import payment_deleted
+from payments.models import Payment
+
+
+@receiver(post_delete, sender=Payment)
+def remove_from_balance(sender, instance, **kwargs):
+    # Deletes, cascades included, run inside the collector's transaction.
+    payment_deleted(instance)
@@ -0,0 +1,187 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from books.models import Book
+from books.tests.base import AuthenticatedAPITestCase
+from borrowings.models import Borrowing
+from library_service.tests.base import QueryBudgetAssertionsMixin
+from payments.balances import find_drift, rebuild_balances
+from payments.fines import generate_fines
+from payments.gateway_stub import StubGateway
+from payments.models import Balance, Payment
+from payments.webhooks import apply_events, ingest
+
+User = get_user_model()
+
+BALANCES_URL = reverse("payments:balance-list")
+ME_URL = reverse("user:user_me")
+
+
+def balance_url(user_id):
+    return reverse("payments:balance-detail", args=[user_id])
+
+
+class BalanceTests(QueryBudgetAssertionsMixin, AuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.get_normal_user()
+        self.book = Book.objects.create(
+            title="Ledger Book",
+            author="Author",
+            cover="HARD",
+            inventory=5,
+            daily_fee="1.00",
+        )
+        self.borrowing = self.borrow(self.user)
+
+    def borrow(self, user, days=7):
+        # bulk_create() skips the model validation, so it can backdate.
+        return Borrowing.objects.bulk_create(
+            [
+                Borrowing(
+                    user=user,
+                    book=self.book,
+                    expected_return_date=date.today() + timedelta(days=days),
+                )
+            ]
+        )[0]
+
+    def payment(self, amount, borrowing=None, type=Payment.Type.PAYMENT, **kwargs):
+        return Payment.objects.create(
+            status=kwargs.pop("status", Payment.Status.PENDING),
+            type=type,
+            borrowing=borrowing or self.borrowing,
+            session_url="",
+            session_id=kwargs.pop("session_id", ""),
+            money_to_pay=Decimal(amount),
+        )
+
+    def balance(self, user=None):
+        balance = Balance.objects.get(user=user or self.user)
+        return balance.pending_total, balance.paid_total, balance.open_fines
+
+    def test_payments_move_the_balance(self):
+        payment = self.payment("3.50")
+        fine = self.payment("2.00", type=Payment.Type.FINE)
+        self.assertEqual(self.balance(), (Decimal("5.50"), Decimal("0.00"), 1))
+
+        payment.status = Payment.Status.PAID
+        payment.save()
+        fine.money_to_pay = Decimal("2.25")
+        fine.save()
+        self.assertEqual(self.balance(), (Decimal("2.25"), Decimal("3.50"), 1))
+
+        fine.delete()
+        self.assertEqual(self.balance(), (Decimal("0.00"), Decimal("3.50"), 0))
+
+        self.borrowing.delete()
+        self.assertEqual(self.balance(), (Decimal("0.00"), Decimal("0.00"), 0))
+        self.assertEqual(find_drift(), {})
+
+    def test_generated_fines_are_counted_once(self):
+        overdue = self.borrow(self.user, days=-3)
+        other = User.objects.create_user(email="other@example.com", password="x")
+        self.borrow(other, days=-1)
+
+        self.assertEqual(sum(generate_fines(chunk_size=1)), 2)
+        self.assertEqual(sum(generate_fines()), 0)
+
+        fine = Payment.objects.get(borrowing=overdue)
+        self.assertEqual(self.balance(), (fine.money_to_pay, Decimal("0.00"), 1))
+        self.assertEqual(self.balance(other)[2], 1)
+        self.assertEqual(find_drift(), {})
+
+    def test_webhook_payments_move_to_paid(self):
+        self.payment("4.00", session_id="cs_1")
+        self.payment("1.00", session_id="cs_2")
+        provider = StubGateway()
+        self.addCleanup(provider.server_close)
+        for session in ("cs_1", "cs_1", "cs_2"):
+            ingest(*provider.event(session))
+
+        apply_events()
+
+        self.assertEqual(self.balance(), (Decimal("0.00"), Decimal("5.00"), 0))
+        self.assertEqual(find_drift(), {})
+
+    def test_reconcile_repairs_drift(self):
+        self.payment("3.00")
+        self.payment("1.50", type=Payment.Type.FINE, status=Payment.Status.PAID)
+        Balance.objects.update(pending_total=0, open_fines=4)
+        stray = User.objects.create_user(email="stray@example.com", password="x")
+        Balance.objects.create(user=stray, paid_total=7)
+
+        with self.assertRaises(CommandError):
+            call_command("reconcile_balances", check=True, stderr=StringIO())
+
+        out = StringIO()
+        call_command("reconcile_balances", stdout=out, stderr=StringIO())
+
+        self.assertIn("Rebuilt 1 balances, 2 had drifted", out.getvalue())
+        self.assertEqual(self.balance(), (Decimal("3.00"), Decimal("1.50"), 0))
+        self.assertEqual(self.balance(stray), (Decimal("0.00"), Decimal("0.00"), 0))
+        self.assertEqual(find_drift(), {})
+
+    @skipUnless(connection.vendor == "postgresql", "table locks")
+    def test_rebuild_locks_balances_before_aggregating(self):
+        self.payment("3.00")
+
+        with CaptureQueriesContext(connection) as queries:
+            rebuild_balances()
+
+        statements = [
+            query["sql"]
+            for query in queries
+            if not query["sql"].startswith("SAVEPOINT")
+        ]
+        self.assertTrue(statements[0].startswith('LOCK TABLE "payments_balance"'))
+        self.assertEqual(find_drift(), {})
+
+    def test_me_includes_the_balance(self):
+        self.authenticate_normal_user()
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.data["balance"]["pending_total"], "0.00")
+
+        self.payment("6.00")
+        self.payment("2.00", type=Payment.Type.FINE)
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["balance"]["pending_total"], "8.00")
+        self.assertEqual(res.data["balance"]["open_fines"], 1)
+        self.assertWithinQueryBudget("get", ME_URL)
+
+    def test_staff_balances(self):
+        other = User.objects.create_user(email="paid@example.com", password="x")
+        self.payment("6.00")
+        self.payment("2.00", borrowing=self.borrow(other), status=Payment.Status.PAID)
+
+        self.authenticate_normal_user()
+        self.assertEqual(
+            self.client.get(BALANCES_URL).status_code, status.HTTP_403_FORBIDDEN
+        )
+
+        self.authenticate_staff_user()
+        res = self.client.get(BALANCES_URL)
+        self.assertEqual([row["user"] for row in res.data], [self.user.pk, other.pk])
+        res = self.client.get(BALANCES_URL, {"owing": "true"})
+        self.assertEqual([row["user"] for row in res.data], [self.user.pk])
+
+        res = self.client.get(balance_url(other.pk))
+        self.assertEqual(res.data["paid_total"], "2.00")
+        res = self.client.get(balance_url(self.get_staff_user().pk))
+        self.assertEqual(res.data["pending_total"], "0.00")
+        res = self.client.get(balance_url(10_000))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+        self.assertWithinQueryBudget("get", BALANCES_URL)
+        self.assertWithinQueryBudget("get", balance_url(other.pk))
@@ -1,14 +1,17 @@
 from datetime import date, timedelta
 
+from django.contrib.auth import get_user_model
 from django.urls import reverse
 from rest_framework import status
 
 from books.models import Book
 from borrowings.models import Borrowing
+from library_service.tests.base import QueryBudgetAssertionsMixin
 from payments.models import Payment
-from payments.serializers import PaymentSerializer
+from payments.serializers import PaymentSerializer, PaymentDetailSerializer
 from books.tests.base import AuthenticatedAPITestCase
 
+User = get_user_model()
 
 PAYMENTS_URL = reverse("payments:payment-list")
 
@@ -17,7 +20,7 @@ def detail_url(payment_id):
     return reverse("payments:payment-detail", args=[payment_id])
 
 
-class PaymentEndpointsTests(AuthenticatedAPITestCase):
+class PaymentEndpointsTests(QueryBudgetAssertionsMixin, AuthenticatedAPITestCase):
     def setUp(self):
         super().setUp()
 
@@ -53,7 +56,7 @@ class PaymentEndpointsTests(AuthenticatedAPITestCase):
             money_to_pay=5.0,
         )
 
-        self.other_user = self.User.objects.create_user(
+        self.other_user = User.objects.create_user(
             email="other@example.com", password="otherpass"
         )
         self.other_borrowing = Borrowing.objects.create(
@@ -82,7 +85,7 @@ class PaymentEndpointsTests(AuthenticatedAPITestCase):
         url = detail_url(self.payment1.id)
         res = self.client.get(url)
 
-        serializer = PaymentSerializer(self.payment1)
+        serializer = PaymentDetailSerializer(self.payment1)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, serializer.data)
 
@@ -107,6 +110,14 @@ class PaymentEndpointsTests(AuthenticatedAPITestCase):
         url = detail_url(self.other_payment.id)
         res = self.client.get(url)
 
-        serializer = PaymentSerializer(self.other_payment)
+        serializer = PaymentDetailSerializer(self.other_payment)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, serializer.data)
+
+    def test_endpoints_stay_within_query_budget(self):
+        self.authenticate_staff_user()
+
+        self.assertWithinQueryBudget("GET", PAYMENTS_URL)
+        for payment in [self.payment1, self.other_payment]:
+            res = self.assertWithinQueryBudget("GET", detail_url(payment.id))
+            self.assertEqual(res.data["borrowing"]["book"]["title"], self.book.title)
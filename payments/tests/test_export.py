@@ -0,0 +1,74 @@
+import json
+from datetime import date, timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from books.models import Book
+from books.tests.base import AuthenticatedAPITestCase
+from borrowings.models import Borrowing
+from payments.models import Payment
+
+EXPORT_URL = reverse("payments:payment-export")
+
+
+class PaymentExportTests(AuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        book = Book.objects.create(
+            title="Export Book",
+            author="Author",
+            cover="HARD",
+            inventory=1,
+            daily_fee="1.00",
+        )
+        borrowing = Borrowing.objects.create(
+            user=self.get_normal_user(),
+            book=book,
+            expected_return_date=date.today() + timedelta(days=3),
+        )
+        self.old, self.new = [
+            Payment.objects.create(
+                status=Payment.Status.PENDING,
+                type=Payment.Type.PAYMENT,
+                borrowing=borrowing,
+                session_url=f"https://example.com/{i}",
+                session_id=f"sess_{i}",
+                money_to_pay="3.00",
+            )
+            for i in range(2)
+        ]
+        Payment.objects.filter(pk=self.old.pk).update(
+            updated_at=timezone.now() - timedelta(days=2)
+        )
+
+    def test_updated_since_watermark(self):
+        self.authenticate_staff_user()
+        watermark = (timezone.now() - timedelta(days=1)).isoformat()
+
+        res = self.client.get(EXPORT_URL, {"updated_since": watermark})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        lines = b"".join(res.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)["id"] for line in lines], [self.new.id])
+
+    def test_updated_since_and_since_id_form_one_watermark(self):
+        self.authenticate_staff_user()
+        updated_at = timezone.now() - timedelta(days=1)
+        Payment.objects.update(updated_at=updated_at)
+
+        res = self.client.get(
+            EXPORT_URL,
+            {"updated_since": updated_at.isoformat(), "since_id": self.old.id},
+        )
+
+        lines = b"".join(res.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)["id"] for line in lines], [self.new.id])
+
+    def test_non_staff_cannot_export(self):
+        self.authenticate_normal_user()
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
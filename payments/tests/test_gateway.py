@@ -0,0 +1,240 @@
+import asyncio
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+import httpx
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from books.models import Book
+from borrowings.models import Borrowing
+from payments import gateway
+from payments.checkout import open_sessions, without_session
+from payments.gateway import CircuitBreaker, GatewayError, GatewayUnavailable
+from payments.gateway_stub import StubGateway
+from payments.models import Payment
+
+User = get_user_model()
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch("payments.gateway.time.monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker(threshold=2, reset_timeout=30)
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "closed")
+
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, "open")
+        with self.assertRaises(GatewayUnavailable):
+            self.breaker.before_call()
+
+    def test_half_open_lets_one_trial_through(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.now += 30
+
+        self.breaker.before_call()
+        with self.assertRaises(GatewayUnavailable):
+            self.breaker.before_call()
+
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "open")
+
+        self.now += 30
+        self.breaker.before_call()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, "closed")
+
+    def test_trial_ended_by_an_unexpected_error_allows_another(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.now += 30
+
+        with self.assertRaises(asyncio.CancelledError):
+            with self.breaker.call():
+                raise asyncio.CancelledError()
+
+        self.assertEqual(self.breaker.state, "half-open")
+        with self.breaker.call():
+            self.breaker.record_success()
+        self.assertEqual(self.breaker.state, "closed")
+
+
+class GatewayTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.stub = StubGateway().start()
+        cls.addClassCleanup(cls.stub.stop)
+
+    def setUp(self):
+        self.stub.fail_next = 0
+        self.stub.latency = 0
+        config = {
+            **settings.PAYMENT_GATEWAY,
+            "URL": self.stub.url,
+            "TIMEOUT": 1,
+            "RETRIES": 2,
+            "BACKOFF": 0,
+            "BREAKER_THRESHOLD": 3,
+        }
+        self.enterContext(override_settings(PAYMENT_GATEWAY=config))
+        self.reset_clients()
+        self.addCleanup(self.reset_clients)
+
+        user = User.objects.create_user(email="payer@example.com", password="payer")
+        book = Book.objects.create(
+            title="Paid Book",
+            author="Author",
+            cover="HARD",
+            inventory=5,
+            daily_fee="1.00",
+        )
+        self.borrowing = Borrowing.objects.create(
+            user=user, book=book, expected_return_date=date.today() + timedelta(1)
+        )
+
+    def reset_clients(self):
+        if gateway._client is not None:
+            gateway._client.close()
+        gateway._client = gateway._breaker = None
+
+    def payment(self, amount="4.50", type=Payment.Type.PAYMENT):
+        return Payment.objects.create(
+            status=Payment.Status.PENDING,
+            type=type,
+            borrowing=self.borrowing,
+            session_url="",
+            session_id="",
+            money_to_pay=Decimal(amount),
+        )
+
+    def test_open_sessions_stores_the_session(self):
+        payment = self.payment()
+        updated_at = payment.updated_at
+
+        open_sessions([payment])
+
+        payment.refresh_from_db()
+        self.assertTrue(payment.session_id.startswith("cs_stub_"))
+        self.assertEqual(
+            payment.session_url, f"{self.stub.url}/pay/{payment.session_id}"
+        )
+        self.assertGreater(payment.updated_at, updated_at)
+        self.assertFalse(without_session().filter(pk=payment.pk).exists())
+
+    def test_stub_sessions_are_unique_across_restarts(self):
+        restarted = StubGateway()
+        self.addCleanup(restarted.server_close)
+
+        self.assertNotEqual(
+            restarted.session("payment-1")["id"], self.stub.session("payment-1")["id"]
+        )
+        self.assertNotEqual(
+            json.loads(restarted.event("cs_1")[0])["id"],
+            json.loads(self.stub.event("cs_1")[0])["id"],
+        )
+
+    def test_transient_failures_are_retried_with_the_same_idempotency_key(self):
+        payment = self.payment()
+        first = gateway.get_client().create_session(payment)
+        self.stub.fail_next = 2
+
+        self.assertEqual(gateway.get_client().create_session(payment), first)
+        self.assertEqual(self.stub.fail_next, 0)
+
+    def test_gives_up_after_bounded_retries(self):
+        self.stub.fail_next = 3
+        requests = self.stub.requests
+
+        with self.assertRaises(GatewayUnavailable):
+            gateway.get_client().create_session(self.payment())
+        self.assertEqual(self.stub.requests - requests, 3)
+
+    def test_client_errors_are_not_retried(self):
+        requests = self.stub.requests
+
+        with self.assertRaises(GatewayError) as ctx:
+            gateway.get_client().create_session(self.payment(amount="0"))
+
+        self.assertNotIsInstance(ctx.exception, GatewayUnavailable)
+        self.assertEqual(self.stub.requests - requests, 1)
+        self.assertEqual(gateway.get_breaker().state, "closed")
+
+    def test_malformed_sessions_are_gateway_errors(self):
+        client = gateway.get_client()
+        for response in (
+            httpx.Response(200, text="<html>"),
+            httpx.Response(201, json={"id": "cs_1"}),
+            httpx.Response(200, json=["cs_1"]),
+        ):
+            with self.subTest(body=response.text):
+                with self.assertRaises(GatewayError):
+                    client.outcome(response)
+
+    def test_open_breaker_fails_fast(self):
+        self.stub.fail_next = 100
+        with self.assertRaises(GatewayUnavailable):
+            gateway.get_client().create_session(self.payment())
+        requests = self.stub.requests
+
+        with self.assertRaises(GatewayUnavailable):
+            gateway.get_client().create_session(self.payment())
+        self.assertEqual(self.stub.requests, requests)
+
+    def test_timeouts_are_retried(self):
+        self.stub.latency = 0.3
+        gateway_config = {**settings.PAYMENT_GATEWAY, "TIMEOUT": 0.05, "RETRIES": 1}
+
+        with override_settings(PAYMENT_GATEWAY=gateway_config):
+            with self.assertRaises(GatewayUnavailable):
+                gateway.get_client().create_session(self.payment())
+
+        self.assertEqual(gateway.get_breaker().failures, 2)
+
+    def test_open_sessions_concurrently(self):
+        payments = [self.payment() for _ in range(10)]
+        fine = self.payment(type=Payment.Type.FINE)
+        invalid = self.payment(amount="0")
+
+        opened, failed = open_sessions([*payments, fine, invalid], concurrency=4)
+
+        self.assertEqual(len(opened), 11)
+        self.assertEqual([payment for payment, _ in failed], [invalid])
+        sessions = set(
+            Payment.objects.exclude(session_id="").values_list("session_id", flat=True)
+        )
+        self.assertEqual(len(sessions), 11)
+        self.assertEqual(list(without_session()), [invalid])
+
+    def test_open_payment_sessions_command(self):
+        for _ in range(5):
+            self.payment()
+        Payment.objects.create(
+            status=Payment.Status.PAID,
+            type=Payment.Type.PAYMENT,
+            borrowing=self.borrowing,
+            session_url="https://example.com/paid",
+            session_id="",
+            money_to_pay=Decimal("1.00"),
+        )
+        out = StringIO()
+
+        call_command("open_payment_sessions", batch_size=2, stdout=out)
+
+        self.assertIn("Opened 5 sessions, 0 failed", out.getvalue())
+        self.assertFalse(without_session().exists())
@@ -0,0 +1,86 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from books.models import Book
+from borrowings.models import Borrowing
+from payments.models import Payment
+
+User = get_user_model()
+
+
+@override_settings(FINE_MULTIPLIER=2)
+class GenerateFinesTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="late@example.com", password="latepass"
+        )
+        self.book = Book.objects.create(
+            title="Late Book",
+            author="Author",
+            cover="HARD",
+            inventory=5,
+            daily_fee="1.25",
+        )
+
+    def borrow(self, days_overdue, returned=False):
+        today = date.today()
+        return Borrowing.objects.bulk_create(
+            [
+                Borrowing(
+                    user=self.user,
+                    book=self.book,
+                    expected_return_date=today - timedelta(days=days_overdue),
+                    actual_return_date=today if returned else None,
+                )
+            ]
+        )[0]
+
+    def run_command(self, **options):
+        out = StringIO()
+        call_command("generate_fines", stdout=out, **options)
+        return out.getvalue()
+
+    def test_fines_are_created_for_overdue_active_borrowings(self):
+        overdue = self.borrow(days_overdue=3)
+        self.borrow(days_overdue=3, returned=True)
+        self.borrow(days_overdue=-2)
+
+        output = self.run_command()
+
+        fine = Payment.objects.get()
+        self.assertEqual(fine.borrowing, overdue)
+        self.assertEqual(fine.type, Payment.Type.FINE)
+        self.assertEqual(fine.status, Payment.Status.PENDING)
+        self.assertEqual(fine.money_to_pay, Decimal("7.50"))
+        self.assertIn("Created 1 fines", output)
+
+    def test_generation_is_idempotent(self):
+        for days in range(1, 6):
+            self.borrow(days_overdue=days)
+
+        self.run_command(chunk_size=2)
+        output = self.run_command(chunk_size=2)
+
+        self.assertEqual(Payment.objects.filter(type=Payment.Type.FINE).count(), 5)
+        self.assertIn("Created 0 fines", output)
+
+    def test_existing_payment_does_not_block_fine(self):
+        borrowing = self.borrow(days_overdue=1)
+        Payment.objects.create(
+            status=Payment.Status.PAID,
+            type=Payment.Type.PAYMENT,
+            borrowing=borrowing,
+            session_url="https://example.com/session",
+            session_id="sess_paid",
+            money_to_pay="3.00",
+        )
+
+        self.run_command()
+
+        fine = Payment.objects.get(type=Payment.Type.FINE)
+        self.assertEqual(fine.money_to_pay, Decimal("2.50"))
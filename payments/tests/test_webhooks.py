@@ -0,0 +1,176 @@
+import json
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.models import Borrowing
+from payments.gateway_stub import StubGateway
+from payments.models import Payment, WebhookEvent
+from payments.webhooks import SIGNATURE_HEADER, apply_events, sign
+
+User = get_user_model()
+
+WEBHOOK_URL = reverse("payments:payment-webhook")
+
+
+class WebhookTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Only used to build signed deliveries, never started.
+        cls.provider = StubGateway()
+        cls.addClassCleanup(cls.provider.server_close)
+
+    def setUp(self):
+        self.client = APIClient()
+        user = User.objects.create_user(email="payer@example.com", password="payer")
+        book = Book.objects.create(
+            title="Webhook Book",
+            author="Author",
+            cover="HARD",
+            inventory=5,
+            daily_fee="1.00",
+        )
+        self.borrowing = Borrowing.objects.create(
+            user=user, book=book, expected_return_date=date.today() + timedelta(1)
+        )
+        self.payments = [self.payment(f"cs_{i}") for i in range(3)]
+
+    def payment(self, session_id, type=Payment.Type.PAYMENT):
+        return Payment.objects.create(
+            status=Payment.Status.PENDING,
+            type=type,
+            borrowing=self.borrowing,
+            session_url=f"https://example.com/{session_id}",
+            session_id=session_id,
+            money_to_pay=Decimal("2.00"),
+        )
+
+    def deliver(self, body, signature):
+        return self.client.generic(
+            "POST",
+            WEBHOOK_URL,
+            body,
+            content_type="application/json",
+            headers={SIGNATURE_HEADER: signature},
+        )
+
+    def send(self, session_id, **kwargs):
+        return self.deliver(*self.provider.event(session_id, **kwargs))
+
+    def statuses(self):
+        return [Payment.objects.get(pk=payment.pk).status for payment in self.payments]
+
+    def test_ingest_stores_the_event_with_one_query(self):
+        body, signature = self.provider.event("cs_0", event_id="evt_1")
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.deliver(body, signature)
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(len(queries), 1)
+        event = WebhookEvent.objects.get()
+        self.assertEqual(event.event_id, "evt_1")
+        self.assertEqual(event.session_id, "cs_0")
+        self.assertEqual(event.payload, json.loads(body))
+        self.assertIsNone(event.processed_at)
+        # Ingest does not touch payments.
+        self.assertEqual(self.statuses(), ["PENDING"] * 3)
+
+    def test_redelivered_event_is_stored_once(self):
+        for _ in range(3):
+            res = self.send("cs_0", event_id="evt_1")
+            self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+        self.assertEqual(WebhookEvent.objects.count(), 1)
+
+    def test_unverified_deliveries_are_rejected(self):
+        body, _ = self.provider.event("cs_0")
+        secret = settings.PAYMENT_GATEWAY["WEBHOOK_SECRET"]
+        stale = time.time() - settings.PAYMENT_GATEWAY["WEBHOOK_TOLERANCE"] - 1
+        cases = [
+            (body, ""),
+            (body, sign(body, "wrong-secret")),
+            (body, sign(body, secret, timestamp=stale)),
+            (body + b" ", sign(body, secret)),
+            (b"{}", sign(b"{}", secret)),
+            (b"not json", sign(b"not json", secret)),
+        ]
+
+        for payload, signature in cases:
+            res = self.deliver(payload, signature)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST, signature)
+
+        self.assertFalse(WebhookEvent.objects.exists())
+
+    def test_apply_marks_completed_sessions_paid(self):
+        self.send("cs_0")
+        self.send("cs_1")
+        self.send("cs_1")  # A replay with a new event id.
+        self.send("cs_unknown")
+        self.send("cs_2", type="checkout.session.expired")
+        before = Payment.objects.get(pk=self.payments[0].pk).updated_at
+
+        self.assertEqual(apply_events(), (5, 2))
+
+        self.assertEqual(self.statuses(), ["PAID", "PAID", "PENDING"])
+        self.assertGreater(
+            Payment.objects.get(pk=self.payments[0].pk).updated_at, before
+        )
+        self.assertFalse(
+            WebhookEvent.objects.filter(processed_at__isnull=True).exists()
+        )
+        self.assertEqual(apply_events(), (0, 0))
+
+    def test_late_events_do_not_undo_paid(self):
+        self.send("cs_0")
+        apply_events()
+        self.send("cs_0", type="checkout.session.expired")
+        self.send("cs_0")
+
+        self.assertEqual(apply_events(), (2, 0))
+        self.assertEqual(self.statuses(), ["PAID", "PENDING", "PENDING"])
+
+    def test_each_batch_is_one_payment_update(self):
+        for i in range(3):
+            self.send(f"cs_{i}")
+            self.send(f"cs_{i}")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(apply_events(batch_size=2), (6, 3))
+
+        updates = [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith('UPDATE "payments_payment"')
+        ]
+        self.assertEqual(len(updates), 3)
+        self.assertEqual(self.statuses(), ["PAID"] * 3)
+
+    def test_session_ids_are_unique_unless_empty(self):
+        self.payment("")
+        self.payment("", type=Payment.Type.FINE)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self.payment("cs_0")
+
+    def test_apply_webhook_events_command(self):
+        self.send("cs_0")
+        self.send("cs_1")
+        out = StringIO()
+
+        call_command("apply_webhook_events", batch_size=1, stdout=out)
+
+        self.assertIn("Applied 2 events, 2 payments paid", out.getvalue())
@@ -1,10 +1,21 @@
 from django.urls import path
 
-from payments.views import PaymentListView, PaymentDetailView
+from payments.views import (
+    BalanceDetailView,
+    BalanceListView,
+    PaymentListView,
+    PaymentDetailView,
+    PaymentExportView,
+    PaymentWebhookView,
+)
 
 app_name = "payments"
 
 urlpatterns = [
     path("", PaymentListView.as_view(), name="payment-list"),
     path("<int:pk>/", PaymentDetailView.as_view(), name="payment-detail"),
+    path("export/", PaymentExportView.as_view(), name="payment-export"),
+    path("webhook/", PaymentWebhookView.as_view(), name="payment-webhook"),
+    path("balances/", BalanceListView.as_view(), name="balance-list"),
+    path("balances/<int:pk>/", BalanceDetailView.as_view(), name="balance-detail"),
 ]
@@ -1,31 +1,114 @@
-from django.shortcuts import render
-from rest_framework import generics
-from rest_framework.permissions import IsAuthenticated
+from django.contrib.auth import get_user_model
+from django.shortcuts import get_object_or_404, render
+from rest_framework import generics, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from payments.models import Payment
-from payments.serializers import PaymentSerializer, PaymentDetailSerializer
+from library_service.exports import export_response
+from library_service.mixins import AsyncReadMixin, QueryPlanMixin
+from library_service.pagination import KeysetPagination
+from library_service.timing import ServerTimingMixin
+from payments.models import Balance, Payment
+from payments.serializers import (
+    BalanceSerializer,
+    PaymentSerializer,
+    PaymentDetailSerializer,
+)
+from payments.webhooks import SIGNATURE_HEADER, InvalidWebhook, ingest
 
 
-class PaymentListView(generics.ListAPIView):
+class PaymentListView(
+    ServerTimingMixin, AsyncReadMixin, QueryPlanMixin, generics.ListAPIView
+):
+    queryset = Payment.objects.all()
     serializer_class = PaymentSerializer
     permission_classes = [IsAuthenticated]
+    query_budget = 2
 
     def get_queryset(self):
         user = self.request.user
-        queryset = Payment.objects.select_related("borrowing__user")
+        queryset = super().get_queryset()
         if user.is_staff:
-            return queryset.all()
+            return queryset
 
         return queryset.filter(borrowing__user=user)
 
 
-class PaymentDetailView(generics.RetrieveAPIView):
+class PaymentDetailView(
+    ServerTimingMixin, AsyncReadMixin, QueryPlanMixin, generics.RetrieveAPIView
+):
+    queryset = Payment.objects.all()
     serializer_class = PaymentDetailSerializer
     permission_classes = [IsAuthenticated]
+    query_budget = 2
 
     def get_queryset(self):
         user = self.request.user
-        queryset = Payment.objects.select_related("borrowing__user")
+        queryset = super().get_queryset()
         if user.is_staff:
-            return queryset.all()
+            return queryset
         return queryset.filter(borrowing__user=user)
+
+
+class PaymentExportView(ServerTimingMixin, generics.GenericAPIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return export_response(request, "payments")
+
+
+class BalancePagination(KeysetPagination):
+    ordering = ("user_id",)
+
+
+class BalanceListView(ServerTimingMixin, generics.ListAPIView):
+    """Every stored balance; ``?owing=true`` keeps users with pending payments."""
+
+    queryset = Balance.objects.all()
+    serializer_class = BalanceSerializer
+    permission_classes = [IsAdminUser]
+    pagination_class = BalancePagination
+    query_budget = 2
+
+    def get_queryset(self):
+        queryset = super().get_queryset().order_by("user_id")
+        if self.request.query_params.get("owing") == "true":
+            return queryset.filter(pending_total__gt=0)
+        return queryset
+
+
+class BalanceDetailView(ServerTimingMixin, generics.RetrieveAPIView):
+    """One user's balance, zero for users who never had a payment."""
+
+    serializer_class = BalanceSerializer
+    permission_classes = [IsAdminUser]
+    # The staff user, the balance and, when there is none, the user.
+    query_budget = 3
+
+    def get_object(self):
+        user_id = self.kwargs["pk"]
+        balance = Balance.objects.filter(user_id=user_id).first()
+        if balance is None:
+            balance = Balance(user=get_object_or_404(get_user_model(), pk=user_id))
+        return balance
+
+
+class PaymentWebhookView(ServerTimingMixin, APIView):
+    """
+    Receive provider events: verify the signature and append the raw event
+    to the inbox, nothing more. ``apply_webhook_events`` applies them.
+    """
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    # One INSERT, plus the BEGIN that bulk_create() issues on SQLite.
+    query_budget = 2
+
+    def post(self, request):
+        try:
+            ingest(request.body, request.headers.get(SIGNATURE_HEADER, ""))
+        except InvalidWebhook as exc:
+            raise ValidationError({"detail": str(exc)})
+        return Response(status=status.HTTP_204_NO_CONTENT)
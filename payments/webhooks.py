@@ -0,0 +1,129 @@
+import hashlib
+import hmac
+import json
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from library_service.db import write_atomic
+from payments.balances import add_delta, apply_deltas, new_deltas
+from payments.models import Payment, WebhookEvent
+
+SIGNATURE_HEADER = "Payment-Signature"
+PAID_EVENTS = {"checkout.session.completed"}
+
+
+class InvalidWebhook(ValueError):
+    pass
+
+
+def sign(payload, secret, timestamp=None):
+    """The signature header value for ``payload`` (bytes), as the provider sends it."""
+    timestamp = int(time.time() if timestamp is None else timestamp)
+    digest = hmac.new(
+        secret.encode(), f"{timestamp}.".encode() + payload, hashlib.sha256
+    ).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def verify(payload, header, secret, tolerance):
+    """
+    Check the ``t=<unix time>,v1=<hex HMAC-SHA256 of "t.payload">`` header.
+    Signatures older than ``tolerance`` seconds are rejected, so captured
+    deliveries cannot be replayed later.
+    """
+    try:
+        parts = dict(item.split("=", 1) for item in header.split(","))
+        timestamp = int(parts["t"])
+        signature = parts["v1"]
+    except (KeyError, ValueError):
+        raise InvalidWebhook("Malformed signature header.")
+    if abs(time.time() - timestamp) > tolerance:
+        raise InvalidWebhook("Signature timestamp outside the tolerance.")
+    expected = sign(payload, secret, timestamp).rsplit("v1=", 1)[1]
+    if not hmac.compare_digest(expected, signature):
+        raise InvalidWebhook("Signature mismatch.")
+
+
+def parse(payload):
+    """Build an unsaved WebhookEvent from a verified request body."""
+    try:
+        event = json.loads(payload)
+        return WebhookEvent(
+            event_id=str(event["id"]),
+            type=str(event["type"]),
+            session_id=str(event.get("data", {}).get("session_id") or ""),
+            occurred_at=datetime.fromtimestamp(int(event["created"]), dt_timezone.utc),
+            payload=event,
+        )
+    except (KeyError, TypeError, ValueError, AttributeError, OverflowError):
+        raise InvalidWebhook("Malformed event.")
+
+
+def ingest(payload, signature):
+    """
+    Verify and store one delivery with a single INSERT. Redeliveries of an
+    event id already in the inbox are ignored by the unique index.
+    """
+    config = settings.PAYMENT_GATEWAY
+    verify(payload, signature, config["WEBHOOK_SECRET"], config["WEBHOOK_TOLERANCE"])
+    WebhookEvent.objects.bulk_create([parse(payload)], ignore_conflicts=True)
+
+
+def apply_events(batch_size=1000):
+    """
+    Apply unprocessed inbox events in id order, ``batch_size`` at a time.
+    Returns ``(events, payments)``: how many events were processed and how
+    many payments they marked PAID.
+
+    Each batch is one transaction: the PENDING payments whose sessions
+    completed are locked and read, then marked PAID with one set-based
+    UPDATE, their owners' balances move with one more, and one UPDATE marks
+    the events processed. PAID is final, so duplicates and events arriving
+    out of order change nothing: only PENDING payments are picked up.
+    """
+    events = payments = 0
+    while True:
+        with write_atomic():
+            batch = list(
+                WebhookEvent.objects.filter(processed_at__isnull=True)
+                .select_for_update(skip_locked=True)
+                .order_by("id")
+                .values_list("id", "type", "session_id")[:batch_size]
+            )
+            if not batch:
+                return events, payments
+
+            now = timezone.now()
+            sessions = {session for _, type, session in batch if type in PAID_EVENTS}
+            sessions.discard("")
+            if sessions:
+                # ~Q(session_id="") repeats the unique index's condition so
+                # the partial index can serve the lookup.
+                paid = list(
+                    Payment.objects.select_for_update()
+                    .filter(
+                        ~Q(session_id=""),
+                        session_id__in=sessions,
+                        status=Payment.Status.PENDING,
+                    )
+                    .values_list("pk", "borrowing__user_id", "type", "money_to_pay")
+                )
+                if paid:
+                    payments += Payment.objects.filter(
+                        pk__in=[pk for pk, *_ in paid]
+                    ).update(status=Payment.Status.PAID, updated_at=now)
+                    deltas = new_deltas()
+                    for _, user, type, amount in paid:
+                        add_delta(
+                            deltas, user, Payment.Status.PENDING, type, amount, -1
+                        )
+                        add_delta(deltas, user, Payment.Status.PAID, type, amount)
+                    apply_deltas(deltas)
+            WebhookEvent.objects.filter(pk__in=[pk for pk, _, _ in batch]).update(
+                processed_at=now
+            )
+            events += len(batch)
@@ -0,0 +1,200 @@
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+class LocalUserCache:
+    """Bounded, thread-safe LRU of auth entries with a per-entry TTL."""
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, user_id):
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None:
+                return None
+            expires, user = entry
+            if expires < time.monotonic():
+                del self.entries[user_id]
+                return None
+            self.entries.move_to_end(user_id)
+            return user
+
+    def set(self, user_id, user):
+        config = settings.AUTH_USER_CACHE
+        expires = time.monotonic() + config["LOCAL_TIMEOUT"]
+        with self.lock:
+            self.entries[user_id] = (expires, user)
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > config["LOCAL_MAX_SIZE"]:
+                self.entries.popitem(last=False)
+
+    def delete(self, user_id):
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+local_users = LocalUserCache()
+
+
+def user_cache_key(user_id):
+    return f"users:auth:{user_id}"
+
+
+def use_shared_cache():
+    """
+    Whether the default cache is shared between processes. LocMemCache is
+    per process: entries there would outlive an invalidation made by
+    another worker for the full ``TIMEOUT``, so only the LRU is used.
+    """
+    return not isinstance(caches["default"], LocMemCache)
+
+
+def auth_entry(user):
+    """
+    What authentication needs from a user, and all that is cached: no
+    profile fields and no password hash, only a digest of it to check the
+    token against.
+    """
+    return {
+        "id": user.pk,
+        "is_active": user.is_active,
+        "is_staff": user.is_staff,
+        "password_digest": get_md5_hash_password(user.password),
+    }
+
+
+def user_from_entry(entry):
+    """
+    An unsaved User holding just the cached fields, enough for permission
+    checks and filtering by user. Load the row before reading or saving
+    anything else.
+    """
+    return get_user_model()(
+        id=entry["id"], is_active=entry["is_active"], is_staff=entry["is_staff"]
+    )
+
+
+def get_cached_auth(user_id):
+    entry = local_users.get(user_id)
+    if entry is None and use_shared_cache():
+        entry = cache.get(user_cache_key(user_id))
+        if entry is not None:
+            local_users.set(user_id, entry)
+    return entry
+
+
+async def aget_cached_auth(user_id):
+    entry = local_users.get(user_id)
+    if entry is None and use_shared_cache():
+        entry = await cache.aget(user_cache_key(user_id))
+        if entry is not None:
+            local_users.set(user_id, entry)
+    return entry
+
+
+def cache_user(user_id, user):
+    entry = auth_entry(user)
+    if use_shared_cache():
+        cache.set(user_cache_key(user_id), entry, settings.AUTH_USER_CACHE["TIMEOUT"])
+    local_users.set(user_id, entry)
+
+
+async def acache_user(user_id, user):
+    entry = auth_entry(user)
+    if use_shared_cache():
+        await cache.aset(
+            user_cache_key(user_id), entry, settings.AUTH_USER_CACHE["TIMEOUT"]
+        )
+    local_users.set(user_id, entry)
+
+
+def invalidate_user(user_id):
+    """
+    Drop a user from the shared cache and this process' LRU. LRUs of other
+    processes catch up within ``LOCAL_TIMEOUT`` seconds.
+    """
+    if use_shared_cache():
+        cache.delete(user_cache_key(user_id))
+    local_users.delete(user_id)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the token's user from an in-process LRU,
+    then the shared cache, and only then the database. A cached user is
+    rebuilt by user_from_entry() and holds only the authentication fields.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        entry = get_cached_auth(user_id)
+        if entry is None:
+            user = super().get_user(validated_token)
+            cache_user(user_id, user)
+            return user
+
+        self.check_entry(entry, validated_token)
+        return user_from_entry(entry)
+
+    async def aauthenticate(self, request):
+        """authenticate() for async views."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return await sync_to_async(super().get_user)(validated_token)
+
+        entry = await aget_cached_auth(user_id)
+        if entry is None:
+            user = await sync_to_async(super().get_user)(validated_token)
+            await acache_user(user_id, user)
+            return user
+
+        self.check_entry(entry, validated_token)
+        return user_from_entry(entry)
+
+    def check_entry(self, entry, validated_token):
+        """The checks JWTAuthentication.get_user runs on a freshly loaded user."""
+        if api_settings.CHECK_USER_IS_ACTIVE and not entry["is_active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if (
+                validated_token.get(api_settings.REVOKE_TOKEN_CLAIM)
+                != entry["password_digest"]
+            ):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
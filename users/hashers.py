@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with the iteration count taken from
+    ``PASSWORD_HASH_ITERATIONS``. It keeps the ``pbkdf2_sha256`` algorithm
+    name, so existing hashes verify unchanged and are re-encoded at the
+    configured cost on the next successful login.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_ITERATIONS
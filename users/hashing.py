@@ -0,0 +1,90 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class PasswordHashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many concurrent logins, try again shortly."
+    default_code = "password_hashing_busy"
+
+
+class HashingPool:
+    """
+    Thread pool that runs password hashing with bounded concurrency.
+
+    At most ``MAX_WORKERS`` hashes run at once and at most ``MAX_PENDING``
+    more wait for a worker. Callers that cannot get a slot within
+    ``QUEUE_TIMEOUT`` seconds get ``PasswordHashingBusy`` (HTTP 503) instead
+    of piling up behind the CPU. PBKDF2 releases the GIL, so threads hash
+    in parallel without pickling hashers into a process pool.
+    """
+
+    def __init__(self, max_workers, max_pending, queue_timeout):
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hashing"
+        )
+        self.slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self.queue_timeout = queue_timeout
+
+    def submit(self, fn, *args):
+        if not self.slots.acquire(timeout=self.queue_timeout):
+            raise PasswordHashingBusy()
+        try:
+            future = self.executor.submit(fn, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        return future
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide pool, or None when hashing runs inline."""
+    global _pool
+    config = settings.PASSWORD_HASHING
+    if not config["MAX_WORKERS"]:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = HashingPool(
+                    config["MAX_WORKERS"],
+                    config["MAX_PENDING"],
+                    config["QUEUE_TIMEOUT"],
+                )
+    return _pool
+
+
+def hash_password(raw_password):
+    pool = get_pool()
+    if pool is None:
+        return make_password(raw_password)
+    return pool.submit(make_password, raw_password).result()
+
+
+def check_password(raw_password, encoded):
+    """Return ``(is_correct, must_update)`` like Django's verify_password."""
+    pool = get_pool()
+    if pool is None:
+        return verify_password(raw_password, encoded)
+    return pool.submit(verify_password, raw_password, encoded).result()
+
+
+async def acheck_password(raw_password, encoded):
+    pool = get_pool()
+    if pool is None:
+        return verify_password(raw_password, encoded)
+    future = await asyncio.to_thread(
+        pool.submit, verify_password, raw_password, encoded
+    )
+    return await asyncio.wrap_future(future)
@@ -0,0 +1,82 @@
+import statistics
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.views import TokenObtainPairView
+
+from users import hashing
+
+EMAIL = "bench-login@example.com"
+PASSWORD = "bench-login-password"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure login throughput under concurrent load with password "
+        "hashing on the request thread and on the hashing pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=32)
+        parser.add_argument("--requests", type=int, default=256)
+
+    def handle(self, *args, **options):
+        threads, requests = options["threads"], options["requests"]
+        user = get_user_model().objects.create_user(email=EMAIL, password=PASSWORD)
+        try:
+            inline = {"MAX_WORKERS": 0, "MAX_PENDING": 0, "QUEUE_TIMEOUT": 0}
+            with override_settings(PASSWORD_HASHING=inline):
+                self.report("inline", self.run(threads, requests))
+            hashing._pool = None
+            self.report("pool", self.run(threads, requests))
+        finally:
+            user.delete()
+
+    def run(self, threads, requests):
+        view = TokenObtainPairView.as_view()
+        factory = APIRequestFactory()
+        latencies, statuses = [], []
+        lock = threading.Lock()
+        counter = iter(range(requests))
+
+        def worker():
+            try:
+                while True:
+                    with lock:
+                        if next(counter, None) is None:
+                            return
+                    request = factory.post(
+                        "/", {"email": EMAIL, "password": PASSWORD}, format="json"
+                    )
+                    started = time.perf_counter()
+                    response = view(request)
+                    elapsed = time.perf_counter() - started
+                    with lock:
+                        latencies.append(elapsed)
+                        statuses.append(response.status_code)
+            finally:
+                connection.close()
+
+        started = time.perf_counter()
+        pool = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        return time.perf_counter() - started, latencies, statuses
+
+    def report(self, name, result):
+        duration, latencies, statuses = result
+        latencies.sort()
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        self.stdout.write(
+            f"{name}: {len(latencies) / duration:,.1f} logins/s, "
+            f"p50 {statistics.median(latencies) * 1000:.0f} ms, "
+            f"p99 {p99 * 1000:.0f} ms, "
+            f"{statuses.count(200)} ok, {statuses.count(503)} rejected"
+        )
@@ -0,0 +1,49 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from users.provisioning import provision_users, read_csv
+
+
+class Command(BaseCommand):
+    help = (
+        "Create users from a CSV file ('-' for stdin) with columns email, "
+        "password and optionally first_name, last_name, is_staff. Passwords "
+        "are hashed across a process pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--workers", type=int, help="Hashing processes, defaults to one per core."
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if path == "-":
+            result = self.run(sys.stdin, options)
+        else:
+            with open(path, newline="", encoding="utf-8") as lines:
+                result = self.run(lines, options)
+
+        for duplicate in result.duplicates:
+            self.stderr.write(
+                f"row {duplicate['row']}: {duplicate['email']} already exists, skipped"
+            )
+        for error in result.errors:
+            self.stderr.write(f"row {error['row']}: {error['errors']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {result.created} users, {result.skipped} duplicates "
+                f"skipped, {result.failed} failed, in {result.elapsed:.2f}s "
+                f"({result.rows_per_second} rows/s)"
+            )
+        )
+
+    def run(self, lines, options):
+        return provision_users(
+            read_csv(lines),
+            batch_size=options["batch_size"],
+            workers=options["workers"],
+        )
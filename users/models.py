@@ -4,6 +4,8 @@ from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from users import hashing
+
 
 class UserManager(BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
@@ -44,3 +46,31 @@ class User(AbstractUser):
 
     def __str__(self):
         return self.email
+
+    def set_password(self, raw_password):
+        self.password = hashing.hash_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        """
+        Verify raw_password on the hashing pool, upgrading the stored hash
+        when the configured hasher or its cost has changed.
+        """
+        is_correct, must_update = hashing.check_password(raw_password, self.password)
+        if is_correct and must_update:
+            self.set_password(raw_password)
+            # Password hash upgrades shouldn't be considered password changes.
+            self._password = None
+            self.save(update_fields=["password"])
+        return is_correct
+
+    async def acheck_password(self, raw_password):
+        """See check_password()."""
+        is_correct, must_update = await hashing.acheck_password(
+            raw_password, self.password
+        )
+        if is_correct and must_update:
+            self.set_password(raw_password)
+            self._password = None
+            await self.asave(update_fields=["password"])
+        return is_correct
@@ -0,0 +1,176 @@
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import DatabaseError, transaction
+
+MAX_REPORTED_ERRORS = 100
+MIN_PASSWORD_LENGTH = 8
+TRUE_VALUES = {"1", "true", "yes", "y"}
+
+
+def read_csv(lines):
+    yield from csv.DictReader(lines)
+
+
+class ProvisionResult:
+    def __init__(self):
+        self.created = 0
+        self.skipped = 0
+        self.failed = 0
+        self.duplicates = []
+        self.errors = []
+        self.started = time.perf_counter()
+        self.elapsed = 0
+
+    def fail(self, row, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "errors": errors})
+
+    def skip(self, row, email):
+        self.skipped += 1
+        if len(self.duplicates) < MAX_REPORTED_ERRORS:
+            self.duplicates.append({"row": row, "email": email})
+
+    @property
+    def rows_per_second(self):
+        total = self.created + self.skipped + self.failed
+        return round(total / self.elapsed) if self.elapsed else 0
+
+
+def init_worker():
+    # Spawned (non-forked) workers start without an app registry.
+    django.setup()
+
+
+def clean_row(row):
+    """Return the User fields for a CSV row, or raise ValidationError."""
+    User = get_user_model()
+    errors = {}
+    email = User.objects.normalize_email((row.get("email") or "").strip())
+    try:
+        validate_email(email)
+    except ValidationError as exc:
+        errors["email"] = exc.messages
+    password = row.get("password") or ""
+    if len(password) < MIN_PASSWORD_LENGTH:
+        errors["password"] = [
+            f"Ensure this field has at least {MIN_PASSWORD_LENGTH} characters."
+        ]
+    if errors:
+        raise ValidationError(errors)
+
+    return {
+        "email": email,
+        "password": password,
+        "first_name": (row.get("first_name") or "").strip(),
+        "last_name": (row.get("last_name") or "").strip(),
+        "is_staff": (row.get("is_staff") or "").strip().lower() in TRUE_VALUES,
+    }
+
+
+def provision_users(rows, batch_size=500, workers=None):
+    """
+    Create users from ``rows`` (dicts with email, password and optionally
+    first_name, last_name, is_staff) in batches of ``batch_size``.
+
+    Emails already in the database or earlier in the input are skipped and
+    reported, before any hashing is spent on them. Each batch's passwords
+    are hashed across ``workers`` processes (default: one per core) and the
+    batch is written with a single bulk_create.
+    """
+    workers = workers or os.cpu_count() or 1
+    result = ProvisionResult()
+    seen = set()
+    batch = []
+
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker)
+    try:
+        for number, row in enumerate(rows, start=1):
+            try:
+                fields = clean_row(row)
+            except ValidationError as exc:
+                result.fail(number, exc.message_dict)
+                continue
+            if fields["email"] in seen:
+                result.skip(number, fields["email"])
+                continue
+            seen.add(fields["email"])
+            batch.append((number, fields))
+
+            if len(batch) >= batch_size:
+                write_batch(batch, executor, workers, result)
+                batch = []
+
+        if batch:
+            write_batch(batch, executor, workers, result)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    result.elapsed = time.perf_counter() - result.started
+    return result
+
+
+def hash_passwords(passwords, executor, workers):
+    if executor is None:
+        return [make_password(password) for password in passwords]
+    chunksize = max(1, len(passwords) // (workers * 4))
+    return list(executor.map(make_password, passwords, chunksize=chunksize))
+
+
+def write_batch(batch, executor, workers, result):
+    User = get_user_model()
+    existing = set(
+        User.objects.filter(
+            email__in=[fields["email"] for _, fields in batch]
+        ).values_list("email", flat=True)
+    )
+    fresh = []
+    for number, fields in batch:
+        if fields["email"] in existing:
+            result.skip(number, fields["email"])
+        else:
+            fresh.append((number, fields))
+    batch = fresh
+    if not batch:
+        return
+
+    hashes = hash_passwords(
+        [fields["password"] for _, fields in batch], executor, workers
+    )
+    users = [
+        User(**{**fields, "password": password})
+        for (_, fields), password in zip(batch, hashes)
+    ]
+
+    try:
+        with transaction.atomic():
+            # Another writer may take an email after the check above; that
+            # row is skipped instead of failing the batch.
+            User.objects.bulk_create(users, ignore_conflicts=True)
+            stored = dict(
+                User.objects.filter(
+                    email__in=[user.email for user in users]
+                ).values_list("email", "password")
+            )
+    except DatabaseError as exc:
+        for number, _ in batch:
+            result.fail(number, {"non_field_errors": [str(exc)]})
+        return
+
+    # Salted hashes tell this batch's rows apart from the other writer's.
+    for (number, fields), user in zip(batch, users):
+        if stored.get(user.email) == user.password:
+            result.created += 1
+        else:
+            result.skip(number, fields["email"])
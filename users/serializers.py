@@ -1,6 +1,9 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
+from payments.models import Balance
+from payments.serializers import BalanceSerializer
+
 
 class UserSerializer(serializers.ModelSerializer):
     password = serializers.CharField(
@@ -26,3 +29,17 @@ class UserSerializer(serializers.ModelSerializer):
             user.save()
 
         return user
+
+
+class MeSerializer(UserSerializer):
+    balance = serializers.SerializerMethodField()
+
+    class Meta(UserSerializer.Meta):
+        fields = (*UserSerializer.Meta.fields, "balance")
+
+    def get_balance(self, user):
+        try:
+            balance = user.balance
+        except Balance.DoesNotExist:
+            balance = Balance(user_id=user.pk)
+        return BalanceSerializer(balance).data
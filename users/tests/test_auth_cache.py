@@ -0,0 +1,135 @@
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.authentication import (
+    cache_user,
+    get_cached_auth,
+    local_users,
+    user_cache_key,
+)
+
+ME_URL = reverse("user:user_me")
+
+
+class CachedJWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        local_users.clear()
+        self.user = get_user_model().objects.create_user(
+            email="cached@example.com",
+            password="password123",
+            first_name="Cached",
+            last_name="User",
+        )
+        token = AccessToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZE=f"Bearer {token}")
+
+    def assertOnlyProfileQueried(self, queries):
+        # /me/ reads the profile with its balance; authentication must come
+        # from the cache.
+        self.assertEqual(len(queries), 1)
+        self.assertIn('"payments_balance"', queries[0]["sql"])
+
+    def test_repeated_requests_do_not_load_user(self):
+        self.assertEqual(self.client.get(ME_URL).status_code, status.HTTP_200_OK)
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(ME_URL)
+
+        self.assertOnlyProfileQueried(queries)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["email"], self.user.email)
+
+    def test_shared_cache_hit_without_local_entry(self):
+        with tempfile.TemporaryDirectory() as location:
+            shared = {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": location,
+            }
+            with override_settings(CACHES={"default": shared}):
+                self.client.get(ME_URL)
+                local_users.clear()
+
+                with CaptureQueriesContext(connection) as queries:
+                    res = self.client.get(ME_URL)
+
+        self.assertOnlyProfileQueried(queries)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_per_process_cache_is_not_used_as_shared_tier(self):
+        self.client.get(ME_URL)
+
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+        self.assertIsNotNone(get_cached_auth(self.user.pk))
+
+    def test_cache_holds_only_authentication_fields(self):
+        self.client.get(ME_URL)
+
+        entry = get_cached_auth(self.user.pk)
+
+        self.assertEqual(set(entry), {"id", "is_active", "is_staff", "password_digest"})
+        self.assertNotIn(self.user.password, entry.values())
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get(ME_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_profile_update_is_visible_on_next_request(self):
+        self.client.get(ME_URL)
+
+        res = self.client.patch(ME_URL, {"first_name": "Renamed"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.data["first_name"], "Renamed")
+
+    def test_deleted_user_is_rejected(self):
+        self.client.get(ME_URL)
+        self.user.delete()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_update_does_not_write_back_a_stale_cached_user(self):
+        self.client.get(ME_URL)
+        # Another worker changes the password; this worker's LRU keeps the
+        # old copy until LOCAL_TIMEOUT.
+        get_user_model().objects.filter(pk=self.user.pk).update(
+            password=make_password("changed123"), is_staff=True
+        )
+
+        res = self.client.patch(ME_URL, {"first_name": "Renamed"}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        user = get_user_model().objects.get(pk=self.user.pk)
+        self.assertEqual(user.first_name, "Renamed")
+        self.assertTrue(user.check_password("changed123"))
+        self.assertTrue(user.is_staff)
+
+    def test_user_is_invalidated_again_on_commit(self):
+        self.client.get(ME_URL)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.user.first_name = "Committed"
+            self.user.save()
+            # A concurrent request caches the row before the commit.
+            cache_user(self.user.pk, get_user_model()(pk=self.user.pk))
+
+        self.assertTrue(callbacks)
+        self.assertIsNone(get_cached_auth(self.user.pk))
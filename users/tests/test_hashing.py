@@ -0,0 +1,80 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from users import hashing
+from users.hashing import HashingPool, PasswordHashingBusy
+
+REGISTER_URL = reverse("user:user_register")
+TOKEN_URL = reverse("user:token_obtain_pair")
+
+
+class HashingPoolTests(TestCase):
+    def test_hashing_runs_on_pool_threads(self):
+        pool = hashing.get_pool()
+
+        name = pool.submit(lambda: threading.current_thread().name).result()
+
+        self.assertTrue(name.startswith("password-hashing"))
+
+    def test_full_pool_rejects_new_work(self):
+        pool = HashingPool(max_workers=1, max_pending=0, queue_timeout=0)
+        release = threading.Event()
+        running = pool.submit(release.wait)
+        try:
+            with self.assertRaises(PasswordHashingBusy):
+                pool.submit(lambda: None)
+        finally:
+            release.set()
+            running.result()
+
+        self.assertIsNone(pool.submit(lambda: None).result())
+
+    @override_settings(
+        PASSWORD_HASHING={"MAX_WORKERS": 0, "MAX_PENDING": 0, "QUEUE_TIMEOUT": 0}
+    )
+    def test_zero_workers_hashes_inline(self):
+        self.assertIsNone(hashing.get_pool())
+        self.assertTrue(hashing.hash_password("password123").startswith("pbkdf2"))
+
+
+class PasswordHashingEndpointTests(APITestCase):
+    payload = {"email": "hash@example.com", "password": "password123"}
+
+    @override_settings(PASSWORD_HASH_ITERATIONS=1000)
+    def test_configured_iterations_are_used(self):
+        user = get_user_model().objects.create_user(**self.payload)
+
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$1000$"))
+
+    def test_login_upgrades_hash_to_configured_cost(self):
+        with override_settings(PASSWORD_HASH_ITERATIONS=1000):
+            user = get_user_model().objects.create_user(**self.payload)
+
+        with override_settings(PASSWORD_HASH_ITERATIONS=2000):
+            res = self.client.post(TOKEN_URL, self.payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$2000$"))
+
+    def test_register_returns_503_when_pool_is_saturated(self):
+        busy = HashingPool(max_workers=1, max_pending=0, queue_timeout=0)
+        release = threading.Event()
+        running = busy.submit(release.wait)
+        try:
+            with mock.patch.object(hashing, "_pool", busy):
+                res = self.client.post(REGISTER_URL, self.payload, format="json")
+        finally:
+            release.set()
+            running.result()
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertFalse(
+            get_user_model().objects.filter(email=self.payload["email"]).exists()
+        )
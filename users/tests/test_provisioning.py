@@ -0,0 +1,82 @@
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from users.provisioning import hash_passwords, provision_users
+
+CSV = """email,password,first_name,last_name,is_staff
+ann@example.com,password-ann,Ann,Lee,
+bob@example.com,password-bob,Bob,Ray,true
+existing@example.com,password-old,Old,User,
+ann@example.com,password-dup,Ann,Again,
+not-an-email,password-bad,Bad,Row,
+short@example.com,short,Short,Password,
+"""
+
+
+@override_settings(PASSWORD_HASH_ITERATIONS=1000)
+class ProvisionUsersTests(TestCase):
+    def setUp(self):
+        get_user_model().objects.create_user(
+            email="existing@example.com", password="password123"
+        )
+
+    def rows(self):
+        header, *lines = CSV.strip().splitlines()
+        keys = header.split(",")
+        return [dict(zip(keys, line.split(","))) for line in lines]
+
+    def test_creates_users_and_reports_duplicates_and_errors(self):
+        result = provision_users(self.rows(), batch_size=2, workers=2)
+
+        self.assertEqual(result.created, 2)
+        self.assertEqual(result.skipped, 2)
+        self.assertEqual(result.failed, 2)
+        self.assertEqual(sorted(d["row"] for d in result.duplicates), [3, 4])
+        self.assertEqual(
+            {row: sorted(error["errors"]) for row, error in enumerate(result.errors)},
+            {0: ["email"], 1: ["password"]},
+        )
+        bob = get_user_model().objects.get(email="bob@example.com")
+        self.assertTrue(bob.is_staff)
+        self.assertTrue(bob.check_password("password-bob"))
+
+    def test_email_taken_during_the_batch_is_skipped(self):
+        def hash_and_race(passwords, executor, workers):
+            get_user_model().objects.create_user(
+                email="bob@example.com", password="password-race"
+            )
+            return hash_passwords(passwords, executor, workers)
+
+        with mock.patch("users.provisioning.hash_passwords", hash_and_race):
+            result = provision_users(self.rows()[:2], workers=1)
+
+        self.assertEqual(result.created, 1)
+        self.assertEqual(result.failed, 0)
+        self.assertEqual(result.duplicates, [{"row": 2, "email": "bob@example.com"}])
+        bob = get_user_model().objects.get(email="bob@example.com")
+        self.assertTrue(bob.check_password("password-race"))
+        self.assertTrue(get_user_model().objects.filter(email="ann@example.com"))
+
+    def test_existing_user_is_left_untouched(self):
+        provision_users(self.rows(), workers=1)
+
+        existing = get_user_model().objects.get(email="existing@example.com")
+        self.assertTrue(existing.check_password("password123"))
+
+    def test_command_reads_csv_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as csv_file:
+            csv_file.write(CSV)
+            csv_file.flush()
+            out, err = StringIO(), StringIO()
+            call_command(
+                "provision_users", csv_file.name, "--workers=1", stdout=out, stderr=err
+            )
+
+        self.assertIn("Created 2 users, 2 duplicates skipped, 2 failed", out.getvalue())
+        self.assertIn("ann@example.com already exists", err.getvalue())
+        self.assertEqual(get_user_model().objects.count(), 3)
@@ -1,17 +1,28 @@
+from django.contrib.auth import get_user_model
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
 
-from users.serializers import UserSerializer
+from library_service.timing import ServerTimingMixin
+from users.serializers import MeSerializer, UserSerializer
 
 
 # Create your views here.
-class RegisterUserView(generics.CreateAPIView):
+class RegisterUserView(ServerTimingMixin, generics.CreateAPIView):
     serializer_class = UserSerializer
 
 
-class MeView(generics.RetrieveUpdateAPIView):
-    serializer_class = UserSerializer
+class MeView(ServerTimingMixin, generics.RetrieveUpdateAPIView):
+    serializer_class = MeSerializer
     permission_classes = [IsAuthenticated]
+    # The user behind the token unless cached, then the profile joined with
+    # the balance.
+    query_budget = {"get": 2}
 
     def get_object(self):
-        return self.request.user
+        # request.user may be rebuilt from the auth cache, which keeps only
+        # the authentication fields.
+        return (
+            get_user_model()
+            .objects.select_related("balance")
+            .get(pk=self.request.user.pk)
+        )